@@ -170,6 +170,9 @@ export default function App() {
   const [activeShiftId, setActiveShiftId] = useState<string | null>(null);
   const [overdueShift, setOverdueShift] = useState<Shift | null>(null);
   const notifiedOverdueRef = useRef<Set<string>>(new Set());
+  // Live updates from /api/stream/; interval polling only runs while it is down
+  const [streamConnected, setStreamConnected] = useState(false);
+  const [shiftsVersion, setShiftsVersion] = useState(0);
 
   const [loads, setLoads] = useState<Load[]>([]);
   const [groups, setGroups] = useState<LoadGroup[]>([]);
@@ -248,36 +251,35 @@ export default function App() {
     };
 
     fetchOverdueShifts();
+    if (streamConnected) return;
     const interval = setInterval(fetchOverdueShifts, 60000);
     return () => clearInterval(interval);
-  }, [overdueShift]);
+  }, [overdueShift, streamConnected, shiftsVersion]);
 
   // --- API ---
   const fetchLoads = async () => {
     try {
       const shiftQuery = activeShiftId ? `?shift_id=${activeShiftId}` : '';
-      const [loadsRes, groupsRes] = await Promise.all([
-        fetch(`/api/loads/${shiftQuery}`),
-        fetch(`/api/groups/${shiftQuery}`)
-      ]);
+      // One snapshot: loads, groups with member ids, active shift and config
+      const res = await fetch(`/api/board/${shiftQuery}`);
+      if (!res.ok) throw new Error('Failed to fetch');
+      const board = await res.json();
 
-      if (!loadsRes.ok || !groupsRes.ok) throw new Error('Failed to fetch');
-
-      const loadsData = await loadsRes.json();
-      const groupsData = await groupsRes.json();
-
-      const allLoads = loadsData.map(toFrontend);
+      const loadsById = new Map<string, any>(board.loads.map((l: any) => [l.id, l]));
+      const allLoads = board.loads.map(toFrontend);
       setLoads(allLoads.filter((l: Load) => !l.groupId));
-      setGroups(groupsData.map(toFrontendGroup));
+      const allGroups: LoadGroup[] = board.groups.map((g: any) =>
+        toFrontendGroup({
+          ...g,
+          loads: g.load_ids.map((id: string) => loadsById.get(id)).filter(Boolean),
+        })
+      );
+      setGroups(allGroups);
 
       // Sync selected items if they are currently being viewed
       if (selectedGroup) {
-        // Re-fetch detail for selected group since list view doesn't have loads
-        const detailRes = await fetch(`/api/groups/${selectedGroup.id}/`);
-        if (detailRes.ok) {
-          const detailData = await detailRes.json();
-          setSelectedGroup(toFrontendGroup(detailData));
-        }
+        const updated = allGroups.find((g) => g.id === selectedGroup.id);
+        if (updated) setSelectedGroup(updated);
       }
       if (selectedLoad) {
         const updated = allLoads.find((l: Load) => l.id === selectedLoad.id);
@@ -289,12 +291,37 @@ export default function App() {
     }
   };
 
+  const fetchLoadsRef = useRef(fetchLoads);
+  fetchLoadsRef.current = fetchLoads;
+
   useEffect(() => {
     if (isCalendarView) return;
     fetchLoads();
+    if (streamConnected) return;
     const interval = setInterval(fetchLoads, 5000);
     return () => clearInterval(interval);
-  }, [selectedGroup?.id, selectedLoad?.id, isCalendarView, activeShiftId]);
+  }, [selectedGroup?.id, selectedLoad?.id, isCalendarView, activeShiftId, streamConnected]);
+
+  useEffect(() => {
+    if (isCalendarView || typeof EventSource === 'undefined') return;
+    const shiftQuery = activeShiftId ? `?shift_id=${activeShiftId}` : '';
+    const source = new EventSource(`/api/stream/${shiftQuery}`);
+    const refresh = () => fetchLoadsRef.current();
+
+    source.addEventListener('ready', () => {
+      setStreamConnected(true);
+      refresh();
+    });
+    ['loads', 'groups', 'refresh'].forEach((name) => source.addEventListener(name, refresh));
+    source.addEventListener('shifts', () => setShiftsVersion((v) => v + 1));
+    // Back to polling until the browser reconnects (never, on a WSGI server's 501)
+    source.onerror = () => setStreamConnected(false);
+
+    return () => {
+      source.close();
+      setStreamConnected(false);
+    };
+  }, [isCalendarView, activeShiftId]);
 
   // Derived State
   const filteredLoads = useMemo(() => {
@@ -0,0 +1,33 @@
+"""
+Gunicorn settings shared by the WSGI and ASGI start commands
+(``gunicorn -c config/gunicorn.conf.py ...``).
+
+Prometheus multiprocess mode: PROMETHEUS_MULTIPROC_DIR is set here, in the
+master, so every worker inherits it before importing prometheus_client
+and /metrics can sum the samples of all workers.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+PROMETHEUS_DIR = Path(
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        str(Path(__file__).resolve().parents[1] / "data" / "prometheus"),
+    )
+)
+
+
+def on_starting(server):
+    # Files left by a previous master would be summed into this one.
+    shutil.rmtree(PROMETHEUS_DIR, ignore_errors=True)
+    PROMETHEUS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -21,6 +21,8 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
     "CORS_ALLOWED_ORIGINS", "http://localhost:5173"
 ).split(",")
 CORS_ALLOW_CREDENTIALS = True
+# Let the browser read the pagination and delta-sync cursors.
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "X-Change-Cursor"]
 
 # Application definition
 INSTALLED_APPS = [
@@ -35,15 +37,21 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "src.warehouse_ui.middleware.MetricsMiddleware",
+    "src.warehouse_ui.instrumentation.RequestTimingMiddleware",
+    "src.warehouse_ui.profiling.ProfilingMiddleware",
+    "src.warehouse_ui.traffic.TrafficRecorderMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "src.warehouse_ui.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "src.warehouse_ui.middleware.BoardChangeMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -110,3 +118,88 @@ if not DEBUG:
     }
 
 REPOSITORY_BACKEND = os.environ.get("REPOSITORY_BACKEND", "auto")
+
+# REPOSITORY_BACKEND=sqlite: embedded sqlite3 store, independent of DATABASES
+SQLITE_REPOSITORY_PATH = os.environ.get(
+    "SQLITE_REPOSITORY_PATH", str(BASE_DIR / "data" / "loads.sqlite3")
+)
+
+# JSON backend: "single" (data/loads.json) or "sharded" (data/shifts/<shift_id>.json)
+JSON_REPOSITORY_LAYOUT = os.environ.get("JSON_REPOSITORY_LAYOUT", "single")
+
+# JSON backend: append mutations to a journal instead of rewriting loads.json
+JSON_REPOSITORY_JOURNAL = os.environ.get("JSON_REPOSITORY_JOURNAL", "False") == "True"
+JSON_JOURNAL_COMPACT_BYTES = int(
+    os.environ.get("JSON_JOURNAL_COMPACT_BYTES", str(4 * 1024 * 1024))
+)
+# JSON backend: coalesce concurrent writes into one fsync'd batch per window
+JSON_REPOSITORY_GROUP_COMMIT = (
+    os.environ.get("JSON_REPOSITORY_GROUP_COMMIT", "False") == "True"
+)
+JSON_GROUP_COMMIT_WINDOW_MS = float(os.environ.get("JSON_GROUP_COMMIT_WINDOW_MS", "2"))
+
+# Share of requests (0-1) reported with a Server-Timing header and a JSON
+# log line: wall, DB, repository and serialization time
+REQUEST_TIMING_SAMPLE_RATE = float(os.environ.get("REQUEST_TIMING_SAMPLE_RATE", "0"))
+
+# cProfile capture: requests sending X-Profile-Token equal to PROFILING_TOKEN
+# (unset disables the header) or a PROFILING_SAMPLE_RATE share of requests
+# are profiled into PROFILES_DIR, keeping the newest captures per view
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN", "")
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILES_DIR = os.environ.get("PROFILES_DIR", str(BASE_DIR / "data" / "profiles"))
+PROFILES_KEEP_PER_VIEW = int(os.environ.get("PROFILES_KEEP_PER_VIEW", "50"))
+
+# Append sanitized /api/ requests to this NDJSON file (unset: off); replay
+# them with manage.py replay_traffic
+TRAFFIC_CAPTURE_PATH = os.environ.get("TRAFFIC_CAPTURE_PATH", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "src.warehouse_ui.instrumentation": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+# /api/ responses at least this large are sent brotli/gzip compressed
+API_COMPRESS_MIN_BYTES = int(os.environ.get("API_COMPRESS_MIN_BYTES", "1024"))
+
+# Serialized board reads (load/group lists, group detail, /api/board/) are
+# cached under their data version, shared by every worker. Point
+# BOARD_CACHE_BACKEND at django.core.cache.backends.redis.RedisCache (with a
+# redis:// BOARD_CACHE_LOCATION) to share it across hosts.
+BOARD_CACHE_BACKEND = os.environ.get(
+    "BOARD_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+BOARD_CACHE_LOCATION = os.environ.get(
+    "BOARD_CACHE_LOCATION", str(BASE_DIR / "data" / "cache" / "board")
+)
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "board": {
+        "BACKEND": BOARD_CACHE_BACKEND,
+        "LOCATION": BOARD_CACHE_LOCATION,
+        # Superseded versions are never read again; let them age out.
+        "TIMEOUT": int(os.environ.get("BOARD_CACHE_TIMEOUT", "300")),
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+}
+
+# Serve the read views' async handlers (aget); config/asgi.py turns this on,
+# WSGI keeps every handler sync
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS", "False") == "True"
+
+# /api/stream/ (ASGI only): how often each worker re-checks the change
+# counters of every shift it streams, for writes made by other workers, and
+# the idle keepalive period
+BOARD_STREAM_POLL_SECONDS = float(os.environ.get("BOARD_STREAM_POLL_SECONDS", "2"))
+BOARD_STREAM_HEARTBEAT_SECONDS = float(
+    os.environ.get("BOARD_STREAM_HEARTBEAT_SECONDS", "15")
+)
+BOARD_STREAM_RETRY_MS = int(os.environ.get("BOARD_STREAM_RETRY_MS", "5000"))
@@ -0,0 +1,186 @@
+"""
+Query plans and latency of the board's hot queries, with and without the
+composite indexes from migrations 0007 and 0012.
+
+Runs against a throwaway test database created from the configured
+DATABASES entry (in-memory for sqlite, ``test_<name>`` for PostgreSQL):
+
+    python scripts/benchmark_indexes.py --loads 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, models  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from src.warehouse_ui.models import (  # noqa: E402
+    Load,
+    LoadGroup,
+    LoadStatusChoices,
+    Shift,
+    ShiftStatusChoices,
+)
+
+PATTERN_INDEX = "load_shift_fmt_route_status_like"
+# Replaced by PATTERN_INDEX on PostgreSQL (migration 0012). Neither is in
+# the model state (0014), so they are toggled by hand.
+ROUTE_INDEX = models.Index(
+    fields=["shift", "format", "route_code", "status"],
+    name="load_shift_fmt_route_status",
+)
+
+
+def seed(loads: int, shifts: int, groups: int):
+    now = timezone.now()
+    shift_objs = [
+        Shift(
+            start_at=now - timedelta(hours=12 * i),
+            status=ShiftStatusChoices.OPEN if i == 0 else ShiftStatusChoices.CLOSED,
+        )
+        for i in range(shifts)
+    ]
+    Shift.objects.bulk_create(shift_objs)
+    group_objs = [
+        LoadGroup(
+            vehicle_id=f"V{i}", max_pallet_count=26, shift=random.choice(shift_objs)
+        )
+        for i in range(groups)
+    ]
+    LoadGroup.objects.bulk_create(group_objs)
+
+    statuses = [s for s, _ in LoadStatusChoices.choices]
+    batch = []
+    for i in range(loads):
+        small = i % 3 != 0
+        batch.append(
+            Load(
+                id=uuid.uuid4(),
+                client_name=f"Client {i}",
+                expected_qty=random.randint(1, 60),
+                format=Load.Format.SMALL if small else Load.Format.LARGE,
+                route_code=(
+                    f"{random.randint(20, 29)}{random.randint(0, 99):02d}"
+                    if small
+                    else None
+                ),
+                pallet_count=None if small else random.randint(1, 12),
+                group=None if small else random.choice(group_objs),
+                shift=shift_objs[i % shifts],
+                status=random.choice(statuses),
+            )
+        )
+        if len(batch) >= 5000:
+            Load.objects.bulk_create(batch)
+            batch = []
+    Load.objects.bulk_create(batch)
+    analyze()
+    return shift_objs[0], group_objs[0]
+
+
+def analyze():
+    # Fresh planner statistics, as a long-running database would have.
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def hot_queries(shift, group):
+    return {
+        "active loads by route": lambda: Load.objects.exclude(
+            status=LoadStatusChoices.COMPLETE
+        ).filter(format="small", shift_id=shift.id, route_code__startswith="26"),
+        "loads by shift": lambda: Load.objects.filter(shift_id=shift.id),
+        "loads by group": lambda: Load.objects.filter(group_id=group.id),
+        "active shift": lambda: Shift.objects.filter(
+            status=ShiftStatusChoices.OPEN
+        ).order_by("-start_at")[:1],
+    }
+
+
+def measure(queries, repeat: int):
+    results = {}
+    for name, build in queries.items():
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(build())
+            samples.append((time.perf_counter() - started) * 1000)
+        results[name] = (statistics.median(samples), build().explain())
+    return results
+
+
+def set_indexes(enabled: bool):
+    with connection.schema_editor() as editor:
+        for model in (Load, Shift):
+            for index in model._meta.indexes:
+                if enabled:
+                    editor.add_index(model, index)
+                else:
+                    editor.remove_index(model, index)
+        if connection.vendor != "postgresql":
+            if enabled:
+                editor.add_index(Load, ROUTE_INDEX)
+            else:
+                editor.remove_index(Load, ROUTE_INDEX)
+        elif not enabled:
+            editor.execute(f"DROP INDEX IF EXISTS {PATTERN_INDEX}")
+    if connection.vendor == "postgresql" and enabled:
+        from importlib import import_module
+
+        migration = import_module("src.warehouse_ui.migrations.0007_composite_indexes")
+        with connection.schema_editor() as editor:
+            migration.create_pattern_ops_index(None, editor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--loads", type=int, default=100_000)
+    parser.add_argument("--shifts", type=int, default=60)
+    parser.add_argument("--groups", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        started = time.perf_counter()
+        shift, group = seed(args.loads, args.shifts, args.groups)
+        print(
+            f"Seeded {args.loads} loads in {time.perf_counter() - started:.1f}s "
+            f"({connection.vendor})"
+        )
+        queries = hot_queries(shift, group)
+
+        indexed = measure(queries, args.repeat)
+        set_indexes(False)
+        analyze()
+        plain = measure(queries, args.repeat)
+        set_indexes(True)
+
+        for name in queries:
+            with_ms, with_plan = indexed[name]
+            without_ms, without_plan = plain[name]
+            print(f"\n== {name}")
+            print(f"   without indexes: {without_ms:8.2f} ms  | {without_plan}")
+            print(f"   with indexes:    {with_ms:8.2f} ms  | {with_plan}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Latency of every Repository method and the hot LoadService commands, per
+backend and store size, compared against a saved JSON baseline.
+
+Each size is filled with generate_warehouse_data (same seed every run) in
+a throwaway test database created from the configured DATABASES entry,
+and the JSON store lives in a temporary directory:
+
+    python scripts/benchmark_repositories.py --save      # record a baseline
+    python scripts/benchmark_repositories.py             # compare, exit 1 on regressions
+
+Baselines are only comparable on the machine (and database) that recorded
+them; record one there before changing a repository. An operation counts
+as slower when its 10th percentile is over the baseline's by more than
+``--threshold`` and by more than the spread (p95 - p10) the baseline
+itself showed, so an operation that is always noisy needs a bigger
+slowdown to fail. A flagged operation is then re-measured ``--confirm``
+times and fails only if none of those rounds gets back under the limit:
+a regression reproduces, a busy moment does not.
+
+A short pure-Python calibration run is stored with each baseline. When
+this machine is slower overall the baseline limits are stretched by the
+ratio; they are never tightened, since much of the work is SQLite and
+disk time that a CPU workload does not predict.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from src.application.commands import (  # noqa: E402
+    CreateLoadCommand,
+    IncrementLoadedCommand,
+)
+from src.application.queries import LoadQuery  # noqa: E402
+from src.application.services import LoadService  # noqa: E402
+from src.domain.models import (  # noqa: E402
+    LoadFormat,
+    LoadGroup,
+    LoadRecord,
+    LoadStatus,
+)
+from src.infrastructure.json_repository import JsonRepository  # noqa: E402
+from src.infrastructure.orm_repository import OrmRepository  # noqa: E402
+from src.warehouse_ui.models import Shift, ShiftStatusChoices  # noqa: E402
+
+DEFAULT_BASELINE = PROJECT_ROOT / "data" / "benchmarks" / "repositories.json"
+SHIFTS = 10
+SEED = 1
+UNTIL = "2026-01-31"
+
+
+def fill(backend: str, size: int, directory: str):
+    """Generate ``size`` loads and return a repository reading them."""
+    call_command("flush", interactive=False, verbosity=0)
+    json_path = os.path.join(directory, f"loads-{size}.json")
+    call_command(
+        "generate_warehouse_data",
+        backend=backend,
+        json_path=json_path,
+        shifts=SHIFTS,
+        loads=size,
+        seed=SEED,
+        until=UNTIL,
+        stdout=StringIO(),
+    )
+    if backend == "json":
+        return JsonRepository(json_path, journal=settings.JSON_REPOSITORY_JOURNAL)
+    return OrmRepository()
+
+
+def operations(repo, rng: random.Random) -> dict:
+    """
+    Name -> (prepare, run). ``prepare(i)`` builds the argument of sample
+    ``i`` outside the timed part; ``run(arg)`` is what gets timed.
+    """
+    service = LoadService(repo)
+    shift = Shift.objects.filter(status=ShiftStatusChoices.OPEN).get()
+    shift_id = str(shift.id)
+    loads = repo.list_loads_by_shift(shift_id)
+    load_ids = [load.id for load in loads]
+    group_ids = [group.id for group in repo.list_groups_by_shift(shift_id)]
+    active = repo.list_active_loads_by_group("small", "26", shift_id=shift_id)
+    route = active[0].route_code if active else "2601"
+    # Loads increment_loaded can add to without passing expected_qty.
+    open_loads = [
+        load.id
+        for load in loads
+        if load.status != LoadStatus.COMPLETE
+        and load.expected_qty - load.loaded_qty >= 5
+    ]
+
+    def new_load(i):
+        return LoadRecord(
+            client_name=f"Bench {i}",
+            expected_qty=10,
+            format=LoadFormat.LARGE,
+            pallet_count=1,
+            shift_id=shift_id,
+        )
+
+    def new_group(i):
+        return LoadGroup(vehicle_id=f"B{i}", max_pallet_count=26, shift_id=shift_id)
+
+    def stored_load(i):
+        load = repo.get_load(rng.choice(load_ids))
+        load.vehicle_id = f"B{i}"
+        return load
+
+    def stored_group(i):
+        group = repo.get_group(rng.choice(group_ids))
+        group.max_pallet_count = 12 + i % 14
+        return group
+
+    def saved(save, record):
+        save(record)
+        return record.id
+
+    def pick(ids):
+        return lambda i: rng.choice(ids)
+
+    def nothing(i):
+        return None
+
+    return {
+        "get_load": (pick(load_ids), repo.get_load),
+        "save_load (update)": (stored_load, repo.save_load),
+        "save_load (insert)": (new_load, repo.save_load),
+        "delete_load": (
+            lambda i: saved(repo.save_load, new_load(i)),
+            repo.delete_load,
+        ),
+        "list_active_loads_by_group": (
+            nothing,
+            lambda _: repo.list_active_loads_by_group("small", "26", shift_id),
+        ),
+        "list_all": (nothing, lambda _: repo.list_all()),
+        "list_loads_by_shift": (nothing, lambda _: repo.list_loads_by_shift(shift_id)),
+        "query_loads": (
+            nothing,
+            lambda _: repo.query_loads(LoadQuery(shift_id=shift_id, limit=50)),
+        ),
+        "get_board": (nothing, lambda _: repo.get_board(shift_id)),
+        "get_group": (pick(group_ids), repo.get_group),
+        "save_group (update)": (stored_group, repo.save_group),
+        "save_group (insert)": (new_group, repo.save_group),
+        "delete_group": (
+            lambda i: saved(repo.save_group, new_group(i)),
+            repo.delete_group,
+        ),
+        "list_all_groups": (nothing, lambda _: repo.list_all_groups()),
+        "list_groups_by_shift": (
+            nothing,
+            lambda _: repo.list_groups_by_shift(shift_id),
+        ),
+        "list_loads_by_group": (pick(group_ids), repo.list_loads_by_group),
+        "_sync_group_status": (pick(group_ids), repo._sync_group_status),
+        "LoadService.create_load": (
+            lambda i: CreateLoadCommand(
+                client_name=f"Bench {i}",
+                expected_qty=10,
+                format=LoadFormat.SMALL,
+                load_order="F",
+                shift_id=shift_id,
+                route_code=route,
+            ),
+            service.create_load,
+        ),
+        "LoadService.increment_loaded": (
+            lambda i: IncrementLoadedCommand(
+                load_id=open_loads[i % len(open_loads)], delta=1
+            ),
+            service.increment_loaded,
+        ),
+    }
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def measure(prepare, run, repeat: int, budget: float) -> dict:
+    """
+    Time ``run`` up to ``repeat`` times, stopping early (after at least
+    three samples) once ``budget`` seconds are spent; one untimed call
+    warms caches first. The 10th percentile is what gets compared: it is
+    the operation's own cost with the least scheduler and disk noise.
+    """
+    run(prepare(-1))
+    samples = []
+    spent = 0.0
+    for i in range(repeat):
+        arg = prepare(i)
+        started = time.perf_counter()
+        run(arg)
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed * 1000)
+        spent += elapsed
+        if spent > budget and len(samples) >= 3:
+            break
+    ordered = sorted(samples)
+    return {
+        "p10_ms": round(_percentile(ordered, 10), 4),
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(_percentile(ordered, 95), 4),
+        "samples": len(ordered),
+    }
+
+
+def calibrate() -> float:
+    """Median ms of a fixed CPU-bound workload, the machine's speed now."""
+    records = [{"id": str(i), "qty": i, "refs": ["x"] * 3} for i in range(20_000)]
+    samples = []
+    for _ in range(7):
+        started = time.perf_counter()
+        json.loads(json.dumps(records))
+        sorted(records, key=lambda record: -record["qty"])
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def limit(recorded: dict, scale: float, threshold: float) -> float:
+    """
+    The p10 (ms) above which an operation counts as slower than its
+    ``recorded`` baseline: over it by ``threshold`` and by the baseline's
+    own p95 - p10 spread.
+    """
+    before = recorded.get("p10_ms", recorded["median_ms"]) * scale
+    spread = max(recorded["p95_ms"] * scale - before, 0.0)
+    return before + max(before * threshold, spread)
+
+
+def flagged(ops: dict, recorded: dict, scale: float, threshold: float):
+    """Yield (name, limit ms, current p10 ms) for operations over their limit."""
+    for name, stats in ops.items():
+        if name not in recorded:
+            continue
+        allowed = limit(recorded[name], scale, threshold)
+        if stats["p10_ms"] > allowed:
+            yield name, allowed, stats["p10_ms"]
+
+
+def print_table(backend: str, sizes: dict):
+    columns = list(sizes)
+    names = list(next(iter(sizes.values())))
+    print(f"\n== {backend} (median ms)")
+    print(f"{'operation':32}" + "".join(f"{size:>12}" for size in columns))
+    for name in names:
+        cells = "".join(f"{sizes[size][name]['median_ms']:12.3f}" for size in columns)
+        print(f"{name:32}{cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument(
+        "--backends", nargs="+", choices=("json", "orm"), default=["json", "orm"]
+    )
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=5.0,
+        help="Seconds one operation may take before it stops sampling early.",
+    )
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as the baseline."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown of a p10 over the baseline (0.25 = 25%%).",
+    )
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=3,
+        help="Re-measure a flagged operation up to this many times before failing.",
+    )
+    args = parser.parse_args()
+
+    path = Path(args.baseline)
+    baseline = None
+    if not args.save:
+        if not path.exists():
+            print(f"No baseline at {path}; record one with --save.")
+            return
+        baseline = json.loads(path.read_text())
+        if baseline["meta"]["database"] != connection.vendor:
+            print(
+                f"The baseline was recorded on {baseline['meta']['database']}, "
+                f"not {connection.vendor}; record one here with --save."
+            )
+            return
+
+    rng = random.Random(SEED)
+    results = {}
+    regressions = []
+    # Read twice like the saved one; a busy machine only ever slows it.
+    calibration = min(calibrate(), calibrate())
+    scale = 1.0
+    if baseline is not None:
+        scale = max(1.0, calibration / baseline["meta"]["calibration_ms"])
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for backend in args.backends:
+                results[backend] = {}
+                for size in args.sizes:
+                    started = time.perf_counter()
+                    repo = fill(backend, size, directory)
+                    print(
+                        f"{backend}: {size} loads in "
+                        f"{time.perf_counter() - started:.1f}s ({connection.vendor})"
+                    )
+                    ops = operations(repo, rng)
+                    results[backend][str(size)] = {
+                        name: measure(prepare, run, args.repeat, args.budget)
+                        for name, (prepare, run) in ops.items()
+                    }
+                    if baseline is None:
+                        continue
+                    recorded = baseline["results"].get(backend, {}).get(str(size), {})
+                    suspects = flagged(
+                        results[backend][str(size)], recorded, scale, args.threshold
+                    )
+                    for name, allowed, now in list(suspects):
+                        prepare, run = ops[name]
+                        for _ in range(args.confirm):
+                            retry = measure(prepare, run, args.repeat, args.budget)
+                            now = min(now, retry["p10_ms"])
+                            if now <= allowed:
+                                break
+                        if now > allowed:
+                            key = f"{backend} {size} {name}"
+                            regressions.append((key, allowed, now))
+                print_table(backend, results[backend])
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if args.save:
+        calibration = min(calibration, calibrate())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stored = {
+            "meta": {
+                "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "database": connection.vendor,
+                "json_journal": settings.JSON_REPOSITORY_JOURNAL,
+                "calibration_ms": round(calibration, 3),
+            },
+            "results": results,
+        }
+        path.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"\nBaseline saved to {path}")
+        return
+    print()
+    if scale > 1:
+        print(f"Baseline limits stretched by {scale:.2f}: this machine is slower.")
+    if not regressions:
+        print(f"No regressions over {path} (threshold {args.threshold:.0%}).")
+        return
+    print(f"{len(regressions)} regression(s) over {path}:")
+    for key, allowed, now in regressions:
+        print(
+            f"   {key}: p10 {now:.3f} ms, limit {allowed:.3f} ms "
+            f"({now / allowed - 1:+.0%}, best of {args.confirm + 1} rounds)"
+        )
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
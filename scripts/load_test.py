@@ -0,0 +1,324 @@
+"""
+Load test a running server with the traffic of a shift: tablets polling
+the board, scanners updating loaded_qty, supervisors creating groups and
+loads, and a user browsing the shift calendar.
+
+    python scripts/load_test.py --url http://127.0.0.1:8000 --stages 1 2 4 8
+
+Each stage multiplies the tablet and scanner counts and runs for
+``--stage-seconds``. The report shows throughput and p50/p95/p99 per
+endpoint for every stage, the stage where throughput stopped growing
+(saturation), and lost updates: scanners increment a few shared loads the
+way the board does (read the load, PATCH ``loaded_qty + 1``), and any
+acknowledged increment missing from the final value was overwritten
+(the script then exits 1).
+
+Start the server the way production does (scripts/start_server.sh or
+gunicorn with the worker/thread counts under test) before running it.
+Supervisors add loads to the active shift; use a scratch database.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+
+ID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+# A stage whose throughput grew less than this over the previous one is
+# past saturation: more clients only queue.
+SATURATION_GAIN = 0.1
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    # Nearest rank: the smallest sample with pct% of samples at or below it.
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+class Stats:
+    """Latencies and outcomes of one stage, per endpoint."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, endpoint: str, status, seconds: float):
+        self.latencies[endpoint].append(seconds * 1000)
+        self.statuses[endpoint][status] += 1
+
+    def report(self, seconds: float) -> dict:
+        endpoints = {}
+        for name, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            endpoints[name] = {
+                "count": len(ordered),
+                "rps": round(len(ordered) / seconds, 1),
+                "p50_ms": round(_percentile(ordered, 50), 1),
+                "p95_ms": round(_percentile(ordered, 95), 1),
+                "p99_ms": round(_percentile(ordered, 99), 1),
+                "statuses": dict(sorted(self.statuses[name].items(), key=str)),
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        every = sorted(s for samples in self.latencies.values() for s in samples)
+        return {
+            "requests": total,
+            "throughput_rps": round(total / seconds, 1),
+            "p95_ms": round(_percentile(every, 95), 1) if every else None,
+            "p99_ms": round(_percentile(every, 99), 1) if every else None,
+            "endpoints": endpoints,
+        }
+
+
+class Harness:
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.stats = Stats()
+        self.shift_id = None
+        self.hot_loads = []
+        # Increments the server acknowledged, per hot load.
+        self.acknowledged = defaultdict(int)
+
+    async def request(self, method: str, path: str, body=None, headers=None):
+        endpoint = f"{method} {ID.sub('{id}', path.split('?', 1)[0])}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(
+                method, path, json=body, headers=headers
+            )
+        except httpx.HTTPError as exc:
+            self.stats.add(endpoint, type(exc).__name__, time.perf_counter() - started)
+            return None
+        self.stats.add(endpoint, response.status_code, time.perf_counter() - started)
+        return response
+
+    async def setup(self, hot_loads: int):
+        """Find (or open) the active shift and create the contended loads."""
+        config = (await self.client.get("/api/config/")).json()
+        self.shift_id = config.get("active_shift_id")
+        if not self.shift_id:
+            shift = await self.client.post(
+                "/api/shifts/",
+                json={"start_at": datetime.now(timezone.utc).isoformat()},
+            )
+            self.shift_id = shift.json()["id"]
+        for i in range(hot_loads):
+            response = await self.client.post(
+                "/api/loads/",
+                json={
+                    "client_name": f"Load test {i}",
+                    "expected_qty": 1_000_000,
+                    "format": "large",
+                    "pallet_count": 1,
+                    "shift_id": self.shift_id,
+                },
+            )
+            response.raise_for_status()
+            self.hot_loads.append(response.json()["id"])
+
+    async def tablet(self, interval: float, until: float):
+        # App.tsx polls on a fixed timer and the browser revalidates with
+        # the ETag it was given.
+        await asyncio.sleep(self.rng.uniform(0, interval))
+        etag = None
+        path = f"/api/board/?shift_id={self.shift_id}"
+        while time.monotonic() < until:
+            tick = time.monotonic()
+            headers = {"If-None-Match": etag} if etag else None
+            response = await self.request("GET", path, headers=headers)
+            if response is not None and response.status_code == 200:
+                etag = response.headers.get("ETag")
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - tick)))
+
+    async def scanner(self, interval: float, until: float):
+        await asyncio.sleep(self.rng.uniform(0, interval))
+        while time.monotonic() < until:
+            load_id = self.rng.choice(self.hot_loads)
+            path = f"/api/loads/{load_id}/"
+            response = await self.request("GET", path)
+            if response is not None and response.status_code == 200:
+                loaded = response.json()["loaded_qty"] + 1
+                update = await self.request("PATCH", path, {"loaded_qty": loaded})
+                if update is not None and update.status_code == 200:
+                    self.acknowledged[load_id] += 1
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * interval)
+
+    async def supervisor(self, interval: float, until: float):
+        await asyncio.sleep(self.rng.uniform(0, interval))
+        while time.monotonic() < until:
+            group = await self.request(
+                "POST",
+                "/api/groups/",
+                {
+                    "vehicle_id": str(self.rng.randint(100, 99999)),
+                    "max_pallet_count": 26,
+                    "shift_id": self.shift_id,
+                },
+            )
+            if group is not None and group.status_code == 201:
+                await self.request(
+                    "POST",
+                    "/api/loads/",
+                    {
+                        "client_name": "Load test supervisor",
+                        "expected_qty": self.rng.randint(20, 400),
+                        "format": "large",
+                        "pallet_count": self.rng.randint(1, 12),
+                        "shift_id": self.shift_id,
+                        "group_id": group.json()["id"],
+                    },
+                )
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * interval)
+
+    async def calendar(self, interval: float, until: float):
+        today = date.today()
+        while time.monotonic() < until:
+            first = (today - timedelta(days=30 * self.rng.randint(0, 11))).replace(
+                day=1
+            )
+            last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            await self.request(
+                "GET", f"/api/shifts/?start={first}&end={last}&include_open=true"
+            )
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * interval)
+
+    async def lost_updates(self) -> dict:
+        lost = {}
+        for load_id in self.hot_loads:
+            stored = (await self.client.get(f"/api/loads/{load_id}/")).json()
+            missing = self.acknowledged[load_id] - stored["loaded_qty"]
+            lost[load_id] = {
+                "acknowledged": self.acknowledged[load_id],
+                "stored": stored["loaded_qty"],
+                "lost": max(missing, 0),
+            }
+        return lost
+
+
+async def run(args) -> dict:
+    rng = random.Random(args.seed)
+    clients = args.stages[-1] * (args.tablets + args.scanners) + args.supervisors + 1
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=args.url, timeout=args.timeout, limits=limits
+    ) as client:
+        harness = Harness(client, rng)
+        await harness.setup(args.hot_loads)
+        stages = []
+        for factor in args.stages:
+            harness.stats = Stats()
+            started = time.monotonic()
+            until = started + args.stage_seconds
+            tasks = (
+                [
+                    harness.tablet(args.poll_interval, until)
+                    for _ in range(args.tablets * factor)
+                ]
+                + [
+                    harness.scanner(args.scan_interval, until)
+                    for _ in range(args.scanners * factor)
+                ]
+                + [
+                    harness.supervisor(args.supervisor_interval, until)
+                    for _ in range(args.supervisors)
+                ]
+                + [harness.calendar(args.calendar_interval, until)]
+            )
+            await asyncio.gather(*tasks)
+            report = harness.stats.report(time.monotonic() - started)
+            report["tablets"] = args.tablets * factor
+            report["scanners"] = args.scanners * factor
+            stages.append(report)
+            print_stage(report)
+        lost = await harness.lost_updates()
+    return {"stages": stages, "saturation": saturation(stages), "lost_updates": lost}
+
+
+def saturation(stages: list):
+    """The last stage before throughput stopped growing, or None."""
+    for previous, stage in zip(stages, stages[1:]):
+        gain = stage["throughput_rps"] / previous["throughput_rps"] - 1
+        if gain < SATURATION_GAIN:
+            return {
+                "tablets": previous["tablets"],
+                "scanners": previous["scanners"],
+                "throughput_rps": previous["throughput_rps"],
+                "p95_ms": previous["p95_ms"],
+            }
+    return None
+
+
+def print_stage(report: dict):
+    print(
+        f"\n== {report['tablets']} tablets, {report['scanners']} scanners: "
+        f"{report['throughput_rps']} req/s, p95 {report['p95_ms']} ms, "
+        f"p99 {report['p99_ms']} ms"
+    )
+    print(
+        f"   {'endpoint':28}{'count':>7}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+        "  statuses"
+    )
+    for name, e in report["endpoints"].items():
+        print(
+            f"   {name:28}{e['count']:>7}{e['rps']:>8}{e['p50_ms']:>9}"
+            f"{e['p95_ms']:>9}{e['p99_ms']:>9}  {e['statuses']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--tablets", type=int, default=10)
+    parser.add_argument("--scanners", type=int, default=5)
+    parser.add_argument("--supervisors", type=int, default=2)
+    parser.add_argument(
+        "--stages",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="Multipliers of the tablet and scanner counts, one stage each.",
+    )
+    parser.add_argument("--stage-seconds", type=float, default=60)
+    parser.add_argument("--poll-interval", type=float, default=5)
+    parser.add_argument("--scan-interval", type=float, default=2)
+    parser.add_argument("--supervisor-interval", type=float, default=20)
+    parser.add_argument("--calendar-interval", type=float, default=10)
+    parser.add_argument(
+        "--hot-loads",
+        type=int,
+        default=3,
+        help="Loads all scanners share; fewer means more contention.",
+    )
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the full report as JSON.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    peak = result["saturation"]
+    if peak:
+        print(
+            f"\nSaturation: {peak['throughput_rps']} req/s at {peak['tablets']} "
+            f"tablets and {peak['scanners']} scanners (p95 {peak['p95_ms']} ms); "
+            "more clients did not add throughput."
+        )
+    else:
+        print("\nNo saturation: throughput still grew at the last stage.")
+    lost = sum(load["lost"] for load in result["lost_updates"].values())
+    acknowledged = sum(load["acknowledged"] for load in result["lost_updates"].values())
+    print(f"Lost updates: {lost} of {acknowledged} acknowledged increments.")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    sys.exit(1 if lost else 0)
+
+
+if __name__ == "__main__":
+    main()
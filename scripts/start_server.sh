@@ -5,6 +5,8 @@ PORT_VALUE=${PORT:-8000}
 WEB_CONCURRENCY_VALUE=${WEB_CONCURRENCY:-2}
 GUNICORN_THREADS_VALUE=${GUNICORN_THREADS:-4}
 GUNICORN_TIMEOUT_VALUE=${GUNICORN_TIMEOUT:-120}
+# asgi: uvicorn workers, required for the /api/stream/ event stream
+SERVER_INTERFACE_VALUE=${SERVER_INTERFACE:-wsgi}
 
 echo "Applying migrations..."
 python manage.py migrate --noinput
@@ -12,8 +14,19 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+if [ "${SERVER_INTERFACE_VALUE}" = "asgi" ]; then
+  echo "Starting Gunicorn (uvicorn workers) on port ${PORT_VALUE}..."
+  exec gunicorn config.asgi:application \
+    --config config/gunicorn.conf.py \
+    --worker-class uvicorn.workers.UvicornWorker \
+    --bind "0.0.0.0:${PORT_VALUE}" \
+    --workers "${WEB_CONCURRENCY_VALUE}" \
+    --timeout "${GUNICORN_TIMEOUT_VALUE}"
+fi
+
 echo "Starting Gunicorn on port ${PORT_VALUE}..."
 exec gunicorn config.wsgi:application \
+  --config config/gunicorn.conf.py \
   --bind "0.0.0.0:${PORT_VALUE}" \
   --workers "${WEB_CONCURRENCY_VALUE}" \
   --threads "${GUNICORN_THREADS_VALUE}" \
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class ChangeNotifier:
+    """
+    Wakes board stream subscribers in this process after a write commits.
+    Subscribers re-read the repository's change counters when woken, so a
+    notification carries no payload; writes made by other workers are
+    picked up by a ChangeWatcher setting the same events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def subscribe(self) -> asyncio.Event:
+        """Register an event set on every notification; call from the loop."""
+        event = asyncio.Event()
+        with self._lock:
+            self._waiters.add((asyncio.get_running_loop(), event))
+        return event
+
+    def unsubscribe(self, event: asyncio.Event):
+        with self._lock:
+            self._waiters = {w for w in self._waiters if w[1] is not event}
+
+    def notify(self):
+        """Wake every subscriber; safe to call from any thread."""
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed; its stream unsubscribes on the way out.
+                pass
+
+    async def wait(self, event: asyncio.Event, timeout: Optional[float]) -> bool:
+        """Wait for a notification; False when ``timeout`` elapsed first."""
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except TimeoutError:
+            return False
+        event.clear()
+        return True
+
+
+class ChangeWatcher:
+    """
+    One poll loop per key (e.g. a shift) and event loop, shared by every
+    subscriber watching that key: it awaits ``probe(key)`` every
+    ``interval()`` seconds and sets the subscribers' events when the result
+    changes, so idle subscribers make no queries of their own. Call every
+    method from the event loop.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[Any], Awaitable[Any]],
+        interval: Callable[[], float],
+    ):
+        self._probe = probe
+        self._interval = interval
+        self._watches: Dict[
+            Tuple[asyncio.AbstractEventLoop, Any],
+            Tuple["asyncio.Task[None]", Set[asyncio.Event]],
+        ] = {}
+
+    def watch(self, key: Any, event: asyncio.Event):
+        """Set ``event`` whenever the probe of ``key`` changes."""
+        watch_key = (asyncio.get_running_loop(), key)
+        if watch_key not in self._watches:
+            events: Set[asyncio.Event] = set()
+            task = asyncio.get_running_loop().create_task(self._poll(key, events))
+            self._watches[watch_key] = (task, events)
+        self._watches[watch_key][1].add(event)
+
+    def unwatch(self, key: Any, event: asyncio.Event):
+        """Stop setting ``event``; the last subscriber stops the poll loop."""
+        watch_key = (asyncio.get_running_loop(), key)
+        watch = self._watches.get(watch_key)
+        if watch is None:
+            return
+        task, events = watch
+        events.discard(event)
+        if not events:
+            task.cancel()
+            del self._watches[watch_key]
+
+    async def _poll(self, key: Any, events: Set[asyncio.Event]):
+        # The first probe also wakes everyone: subscribers took their own
+        # state before it and catch up on anything written in between.
+        last: Any = _UNSET
+        while True:
+            try:
+                current = await self._probe(key)
+            except Exception:
+                logger.exception("Change probe for %r failed", key)
+            else:
+                if current != last:
+                    last = current
+                    for event in list(events):
+                        event.set()
+            await asyncio.sleep(self._interval())
+
+
+board_changes = ChangeNotifier()
@@ -1,5 +1,17 @@
-from typing import Protocol, List, Optional
-from src.domain.models import LoadRecord
+import asyncio
+from contextlib import nullcontext
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Iterable,
+    Protocol,
+    List,
+    Optional,
+    Tuple,
+)
+from src.domain.models import LoadGroup, LoadRecord, ShiftTotals
+from .queries import BoardSnapshot, ChangeSet, LoadQuery
 
 
 class Repository(Protocol):
@@ -18,3 +30,158 @@ class Repository(Protocol):
 
     def list_all(self) -> List[LoadRecord]: ...
     def delete_load(self, load_id: str) -> bool: ...
+
+    def transaction(self) -> ContextManager[None]:
+        """
+        Unit of work: writes inside the block are persisted together on exit
+        (one file write / one DB transaction) and group status is recomputed
+        once at commit. Nested blocks join the outer one.
+        """
+        return nullcontext()
+
+    def list_loads_by_shift(self, shift_id: Optional[str]) -> List[LoadRecord]:
+        """
+        Returns every load recorded against the given shift.
+        Backends with a shift index should override this scan.
+        """
+        return [l for l in self.list_all() if l.shift_id == shift_id]
+
+    def query_loads(self, query: LoadQuery) -> Tuple[List[LoadRecord], Optional[str]]:
+        """
+        Returns one page of loads matching the query, plus the cursor of the
+        next page (None on the last one). Backends should push the filters,
+        ordering and limit down instead of using this scan.
+        """
+        if query.shift_id is not None:
+            return query.paginate(self.list_loads_by_shift(query.shift_id))
+        return query.paginate(self.list_all())
+
+    def get_board(self, shift_id: Optional[str]) -> BoardSnapshot:
+        """
+        Returns the loads and groups of a shift (all of them when shift_id
+        is None) plus the change cursor read before them, so the board is
+        built from one pass. Backends can override to read it atomically.
+        """
+        cursor = self.get_change_cursor(shift_id)
+        if shift_id is None:
+            return BoardSnapshot(self.list_all(), self.list_all_groups(), cursor)
+        return BoardSnapshot(
+            self.list_loads_by_shift(shift_id),
+            self.list_groups_by_shift(shift_id),
+            cursor,
+        )
+
+    def get_data_version(self, shift_id: Optional[str] = None) -> Optional[int]:
+        """
+        Returns a counter bumped by every load or group write in the shift
+        (the whole store when shift_id is None), for cheap change detection.
+        None means the backend does not track versions.
+        """
+        return None
+
+    def get_store_id(self) -> Optional[str]:
+        """
+        Returns an id minted when the store was created, so a store that
+        was reset (its versions restarting) is never mistaken for the one
+        it replaced. None if unsupported.
+        """
+        return None
+
+    def get_cache_version(self, shift_id: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the data version qualified by the store id, for keys that
+        outlive the process (ETags, the shared board cache). None when the
+        backend does not track versions.
+        """
+        version = self.get_data_version(shift_id)
+        if version is None:
+            return None
+        store_id = self.get_store_id()
+        return f"{store_id}.{version}" if store_id else str(version)
+
+    def get_change_cursor(self, shift_id: Optional[str] = None) -> Optional[int]:
+        """
+        Returns the current position of the change sequence that stamps
+        every write, to pass back as ``since``. None if unsupported.
+        """
+        return None
+
+    def load_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        """Loads written and load ids deleted after ``since``, or None."""
+        return None
+
+    def group_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        """Groups written and group ids deleted after ``since``, or None."""
+        return None
+
+    def get_shift_totals(self, shift_id: str) -> Optional[ShiftTotals]:
+        """
+        Returns the shift's running totals. None means the backend keeps
+        them on the Shift row itself. Backends that maintain totals as
+        loads are written should override this scan.
+        """
+        totals = ShiftTotals()
+        for load in self.list_loads_by_shift(shift_id):
+            totals.add(load)
+        return totals
+
+    def rebuild_shift_totals(self) -> None:
+        """Recompute any stored shift totals from the loads themselves."""
+        return None
+
+    def bulk_insert(
+        self, groups: Iterable[LoadGroup], loads: Iterable[LoadRecord]
+    ) -> None:
+        """
+        Stores many new groups and loads at once (imports, generated data).
+        Group status and shift totals end up as if each record had been
+        saved on its own. Backends should override this per-record loop
+        with a batch write.
+        """
+        with self.transaction():
+            for group in groups:
+                self.save_group(group)
+            for load in loads:
+                self.save_load(load)
+
+    # Async read path for ASGI views. Each method runs its sync twin off the
+    # event loop; backends with thread-bound connections override
+    # ``_run_sync``, and native async drivers can override the methods.
+
+    async def _run_sync(self, func: Callable[..., Any], *args) -> Any:
+        return await asyncio.to_thread(func, *args)
+
+    async def aget_load(self, load_id: str) -> Optional[LoadRecord]:
+        return await self._run_sync(self.get_load, load_id)
+
+    async def aquery_loads(
+        self, query: LoadQuery
+    ) -> Tuple[List[LoadRecord], Optional[str]]:
+        return await self._run_sync(self.query_loads, query)
+
+    async def aget_group(self, group_id: str):
+        return await self._run_sync(self.get_group, group_id)
+
+    async def alist_loads_by_group(self, group_id: str) -> List[LoadRecord]:
+        return await self._run_sync(self.list_loads_by_group, group_id)
+
+    async def aget_data_version(self, shift_id: Optional[str] = None) -> Optional[int]:
+        return await self._run_sync(self.get_data_version, shift_id)
+
+    async def aget_cache_version(self, shift_id: Optional[str] = None) -> Optional[str]:
+        return await self._run_sync(self.get_cache_version, shift_id)
+
+    async def aget_change_cursor(self, shift_id: Optional[str] = None) -> Optional[int]:
+        return await self._run_sync(self.get_change_cursor, shift_id)
+
+    async def aload_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        return await self._run_sync(self.load_changes, since, shift_id)
+
+    async def aget_shift_totals(self, shift_id: str) -> Optional[ShiftTotals]:
+        return await self._run_sync(self.get_shift_totals, shift_id)
@@ -0,0 +1,160 @@
+import base64
+import heapq
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+from src.domain.models import LoadRecord
+
+# Loading sequence on the dock; unknown codes sort last.
+LOAD_ORDER_SEQUENCE = ("F", "MF", "M", "MP", "P")
+LOAD_ORDERINGS = ("created_at", "updated_at", "load_order")
+
+
+def load_order_rank(load_order: Optional[str]) -> int:
+    try:
+        return LOAD_ORDER_SEQUENCE.index(load_order)
+    except ValueError:
+        return len(LOAD_ORDER_SEQUENCE)
+
+
+@dataclass
+class LoadQuery:
+    """
+    Filters, ordering and keyset page for ``Repository.query_loads``.
+    ``None`` filters are not applied; ``order`` takes a ``-`` prefix for
+    descending order and ``after`` is the cursor of the previous page.
+    """
+
+    shift_id: Optional[str] = None
+    status: Optional[str] = None
+    format: Optional[str] = None
+    group_id: Optional[str] = None
+    vehicle_id: Optional[str] = None
+    route_prefix: Optional[str] = None
+    order: str = "created_at"
+    limit: Optional[int] = None
+    after: Optional[str] = None
+
+    def __post_init__(self):
+        if self.order_field not in LOAD_ORDERINGS:
+            raise ValueError(f"Unsupported order: {self.order}")
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("limit must be positive")
+        self._after_key = None
+        if self.after is not None:
+            value, load_id = decode_cursor(self.after)
+            expected = int if self.order_field == "load_order" else str
+            if not isinstance(value, expected):
+                raise ValueError("Cursor does not match the requested order")
+            self._after_key = (value, load_id)
+
+    @property
+    def order_field(self) -> str:
+        return self.order.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.order.startswith("-")
+
+    @property
+    def after_key(self) -> Optional[Tuple[Any, str]]:
+        return self._after_key
+
+    def matches(self, load: LoadRecord) -> bool:
+        if self.shift_id is not None and load.shift_id != self.shift_id:
+            return False
+        if self.status is not None and _value(load.status) != self.status:
+            return False
+        if self.format is not None and _value(load.format) != self.format:
+            return False
+        if self.group_id is not None and load.group_id != self.group_id:
+            return False
+        if self.vehicle_id is not None and load.vehicle_id != self.vehicle_id:
+            return False
+        route_code = load.route_code or ""
+        if self.route_prefix is not None and not route_code.startswith(
+            self.route_prefix
+        ):
+            return False
+        return True
+
+    def sort_key(self, load: LoadRecord) -> Tuple[Any, str]:
+        if self.order_field == "load_order":
+            return (load_order_rank(load.load_order), load.id)
+        return (getattr(load, self.order_field), load.id)
+
+    def is_after_cursor(self, key: Tuple[Any, str]) -> bool:
+        after = self.after_key
+        if after is None:
+            return True
+        return key < after if self.descending else key > after
+
+    def paginate(
+        self, loads: Iterable[LoadRecord]
+    ) -> Tuple[List[LoadRecord], Optional[str]]:
+        """Order, apply the cursor and cut one page from matching loads."""
+        candidates = []
+        for load in loads:
+            if self.matches(load):
+                key = self.sort_key(load)
+                if self.is_after_cursor(key):
+                    candidates.append((key, load))
+        if self.limit is None:
+            ordered = sorted(candidates, key=_first, reverse=self.descending)
+        else:
+            select = heapq.nlargest if self.descending else heapq.nsmallest
+            ordered = select(self.limit + 1, candidates, key=_first)
+        return self.page([l for _, l in ordered])
+
+    def page(self, ordered: List[LoadRecord]) -> Tuple[List[LoadRecord], Optional[str]]:
+        """Trim an ordered ``limit + 1`` fetch to one page plus next cursor."""
+        if self.limit is None or len(ordered) <= self.limit:
+            return ordered, None
+        page = ordered[: self.limit]
+        return page, encode_cursor(self.sort_key(page[-1]))
+
+
+def encode_cursor(key: Tuple[Any, str]) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, load_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    return value, str(load_id)
+
+
+def _value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def _first(item):
+    return item[0]
+
+
+@dataclass
+class ChangeSet:
+    """
+    Records written after a change cursor, plus ids deleted since then.
+    ``reset`` means the cursor predates the retained deletion markers and
+    the client must reload the full list.
+    """
+
+    records: List[Any]
+    deleted: List[str]
+    cursor: int
+    reset: bool = False
+
+
+@dataclass
+class BoardSnapshot:
+    """Loads and groups of one board (one shift, or everything) read together."""
+
+    loads: List[LoadRecord]
+    groups: List[Any]
+    cursor: Optional[int] = None
@@ -1,3 +1,5 @@
+import functools
+
 from src.domain.models import LoadRecord, LoadStatus, LoadFormat, VerificationStatus
 from src.domain.rules import validate_load
 from src.domain.exceptions import DomainError, RouteConflictError
@@ -12,10 +14,22 @@ from .commands import (
 )
 
 
+def _unit_of_work(method):
+    """Run a command's reads and writes as one repository transaction."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.repo.transaction():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class LoadService:
     def __init__(self, repository: Repository):
         self.repo = repository
 
+    @_unit_of_work
     def create_load(self, cmd: CreateLoadCommand) -> LoadRecord:
         # Pre-validation (concurrency rules)
         if cmd.format == LoadFormat.SMALL:
@@ -43,6 +57,7 @@ class LoadService:
         self.repo.save_load(load)
         return load
 
+    @_unit_of_work
     def assign_vehicle(self, cmd: AssignVehicleCommand) -> LoadRecord:
         load = self._get_load_or_raise(cmd.load_id)
         if load.status == LoadStatus.COMPLETE:
@@ -53,6 +68,7 @@ class LoadService:
         self.repo.save_load(load)
         return load
 
+    @_unit_of_work
     def increment_loaded(self, cmd: IncrementLoadedCommand) -> LoadRecord:
         load = self._get_load_or_raise(cmd.load_id)
 
@@ -70,6 +86,7 @@ class LoadService:
         self.repo.save_load(load)
         return load
 
+    @_unit_of_work
     def set_missing(self, cmd: SetMissingCommand) -> LoadRecord:
         load = self._get_load_or_raise(cmd.load_id)
 
@@ -81,6 +98,7 @@ class LoadService:
         self.repo.save_load(load)
         return load
 
+    @_unit_of_work
     def change_status(self, cmd: ChangeStatusCommand) -> LoadRecord:
         load = self._get_load_or_raise(cmd.load_id)
 
@@ -96,6 +114,7 @@ class LoadService:
         self.repo.save_load(load)
         return load
 
+    @_unit_of_work
     def set_verification(self, cmd: SetVerificationStatusCommand) -> LoadRecord:
         load = self._get_load_or_raise(cmd.load_id)
         if load.format != LoadFormat.LARGE:
@@ -83,3 +83,27 @@ class LoadRecord:
     def touch(self):
         """Update updated_at timestamp."""
         self.updated_at = datetime.now().isoformat()
+
+
+@dataclass
+class ShiftTotals:
+    """
+    Running expected/loaded quantities of a shift, per format.
+    Maintained by the repositories as loads are written.
+    """
+
+    expected_small: int = 0
+    loaded_small: int = 0
+    expected_large: int = 0
+    loaded_large: int = 0
+    load_count: int = 0
+
+    def add(self, load: LoadRecord, sign: int = 1):
+        """Add (sign=1) or remove (sign=-1) one load's quantities."""
+        fmt = load.format.value if hasattr(load.format, "value") else load.format
+        if fmt in (LoadFormat.SMALL.value, LoadFormat.LARGE.value):
+            expected = f"expected_{fmt}"
+            loaded = f"loaded_{fmt}"
+            setattr(self, expected, getattr(self, expected) + sign * load.expected_qty)
+            setattr(self, loaded, getattr(self, loaded) + sign * load.loaded_qty)
+        self.load_count += sign
@@ -1,20 +1,157 @@
+import copy
 import json
 import os
-from typing import List, Optional, Dict, Any
-from dataclasses import asdict
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from dataclasses import fields
 from src.domain.models import (
     LoadRecord,
     LoadGroup,
     LoadFormat,
     LoadStatus,
+    ShiftTotals,
     VerificationStatus,
 )
 from src.application.interfaces import Repository
+from src.application.queries import BoardSnapshot, ChangeSet, LoadQuery
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Route codes are grouped by their first two digits ("26", "23", ...).
+ROUTE_PREFIX_LEN = 2
+# Deletion markers kept per record kind for delta sync; clients whose
+# cursor is older than the oldest dropped marker are told to reload.
+MAX_TOMBSTONES = 5000
+# Journal size (bytes) past which it is folded into a fresh snapshot.
+DEFAULT_COMPACT_THRESHOLD = 4 * 1024 * 1024
+# How long the writer thread waits for more mutations before flushing.
+DEFAULT_COMMIT_WINDOW = 0.002
+LOAD_FIELDS = tuple(f.name for f in fields(LoadRecord))
+GROUP_FIELDS = tuple(f.name for f in fields(LoadGroup))
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive advisory lock shared by every process writing ``path``."""
+    with open(path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _new_store_id() -> str:
+    """Random id stored in a new snapshot; see Repository.get_store_id."""
+    return uuid.uuid4().hex
+
+
+class _UnitOfWork:
+    def __init__(self):
+        self.ops: List[Dict[str, Any]] = []
+        # Pending state by id; None marks a buffered delete.
+        self.loads: Dict[str, Optional[LoadRecord]] = {}
+        self.groups: Dict[str, Optional[LoadGroup]] = {}
+        self.touched_groups: Set[str] = set()
+        self.refreshed = False
+
+
+class _PendingCommit:
+    def __init__(self, ops: List[Dict[str, Any]], touched_groups: Iterable[str]):
+        self.ops = ops
+        self.touched_groups = set(touched_groups)
+        self.applied = False
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
 
 
 class JsonRepository(Repository):
-    def __init__(self, filepath: str):
+    """
+    File-backed repository.
+
+    The parsed document is cached in-process together with dict indexes
+    (by load id, group id, shift id and route prefix). The cache is only
+    rebuilt when the file's mtime/size signature changes, so point reads
+    are O(1) and filtered lists are O(matches).
+
+    With ``journal=True`` every mutation is appended as one JSON line to
+    ``<filepath>.<generation>.journal`` instead of rewriting the snapshot.
+    Reads replay the journal over the last snapshot, and once the journal
+    grows past ``compact_threshold`` bytes it is compacted into a new
+    snapshot and a fresh, empty journal generation.
+
+    Every write holds an advisory lock on ``<filepath>.lock`` so several
+    worker processes can share the file. With ``group_commit=True`` a
+    single writer thread per process coalesces the mutations that arrive
+    within ``commit_window`` seconds into one write and one fsync; callers
+    block until their batch is on disk.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        journal: bool = False,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        group_commit: bool = False,
+        commit_window: float = DEFAULT_COMMIT_WINDOW,
+    ):
         self.filepath = filepath
+        self.journal = journal
+        self.compact_threshold = compact_threshold
+        self.group_commit = group_commit
+        self.commit_window = commit_window
+        self._lock = threading.RLock()
+        # Held for a whole unit of work; see transaction().
+        self._uow_lock = threading.Lock()
+        self._local = threading.local()
+        self._queue: "queue.Queue[_PendingCommit]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._generation = 0
+        self._journal_offset = 0
+        self._extra: Dict[str, Any] = {}
+        self._loads: Dict[str, LoadRecord] = {}
+        self._groups: Dict[str, LoadGroup] = {}
+        # Indexes map a key to an insertion-ordered set of load ids.
+        self._loads_by_group: Dict[str, Dict[str, None]] = {}
+        self._loads_by_shift: Dict[Optional[str], Dict[str, None]] = {}
+        self._loads_by_route_prefix: Dict[str, Dict[str, None]] = {}
+        self._shift_totals: Dict[Optional[str], ShiftTotals] = {}
+        self._versions: Dict[str, int] = {}
+        # Per kind ("loads"/"groups"): id -> change seq, oldest first, and
+        # id -> [seq, shift_id] for deleted records.
+        self._change_seqs: Dict[str, Dict[str, int]] = {}
+        self._tombstones: Dict[str, Dict[str, List[Any]]] = {}
         self._ensure_file()
 
     def _ensure_file(self):
@@ -23,7 +160,7 @@ class JsonRepository(Repository):
 
         if not os.path.exists(self.filepath):
             with open(self.filepath, "w") as f:
-                json.dump({"loads": [], "groups": []}, f)
+                json.dump({"loads": [], "groups": [], "store_id": _new_store_id()}, f)
         else:
             # Migration check: if file is just a list, convert to dict
             try:
@@ -31,172 +168,755 @@ class JsonRepository(Repository):
                     data = json.load(f)
                 if isinstance(data, list):
                     with open(self.filepath, "w") as f:
-                        json.dump({"loads": data, "groups": []}, f, indent=2)
+                        json.dump(
+                            {"loads": data, "groups": [], "store_id": _new_store_id()},
+                            f,
+                            indent=2,
+                        )
             except (json.JSONDecodeError, FileNotFoundError):
                 pass
 
+    # --- Cache management -------------------------------------------------
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _journal_path(self, generation: Optional[int] = None) -> str:
+        if generation is None:
+            generation = self._generation
+        return f"{self.filepath}.{generation}.journal"
+
+    def _refresh(self):
+        """Reload the cached document if the snapshot or journal changed."""
+        signature = self._stat_signature()
+        if signature is None or signature != self._signature:
+            data = self._load_data()
+            self._rebuild(data)
+            self._signature = signature
+        self._replay_journal()
+
+    def _replay_journal(self):
+        """Apply journal entries appended since the last replay."""
+        try:
+            size = os.path.getsize(self._journal_path())
+        except FileNotFoundError:
+            return
+        if size <= self._journal_offset:
+            return
+
+        with open(self._journal_path(), "rb") as f:
+            f.seek(self._journal_offset)
+            chunk = f.read(size - self._journal_offset)
+
+        # Only complete lines are applied; a torn trailing write is retried
+        # on the next refresh (and dropped by the next compaction).
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._apply(op)
+        self._journal_offset += end
+
+    def _rebuild(self, data: Dict[str, Any]):
+        self._extra = {k: v for k, v in data.items() if k not in ("loads", "groups")}
+        self._generation = int(self._extra.get("journal_generation", 0))
+        self._journal_offset = 0
+        self._loads = {}
+        self._groups = {}
+        self._loads_by_group = {}
+        self._loads_by_shift = {}
+        self._loads_by_route_prefix = {}
+        self._shift_totals = {}
+        # Change counters per shift ("" = unassigned, "*" = everything);
+        # stored in the snapshot and bumped again by journal replay.
+        self._versions = self._extra.setdefault("versions", {})
+        self._change_seqs = self._extra.setdefault(
+            "change_seqs", {"loads": {}, "groups": {}}
+        )
+        self._tombstones = self._extra.setdefault(
+            "tombstones", {"loads": {}, "groups": {}}
+        )
+        for d in data.get("loads", []):
+            load = self._from_dict(d)
+            self._loads[load.id] = load
+            self._index_load(load)
+        for d in data.get("groups", []):
+            group = self._group_from_dict(d)
+            self._groups[group.id] = group
+
+    def _index_load(self, load: LoadRecord):
+        if load.group_id:
+            self._loads_by_group.setdefault(load.group_id, {})[load.id] = None
+        self._loads_by_shift.setdefault(load.shift_id, {})[load.id] = None
+        if load.route_code:
+            prefix = load.route_code[:ROUTE_PREFIX_LEN]
+            self._loads_by_route_prefix.setdefault(prefix, {})[load.id] = None
+        self._shift_totals.setdefault(load.shift_id, ShiftTotals()).add(load)
+
+    def _unindex_load(self, load: LoadRecord):
+        if load.group_id:
+            self._discard(self._loads_by_group, load.group_id, load.id)
+        self._discard(self._loads_by_shift, load.shift_id, load.id)
+        if load.route_code:
+            prefix = load.route_code[:ROUTE_PREFIX_LEN]
+            self._discard(self._loads_by_route_prefix, prefix, load.id)
+        totals = self._shift_totals.get(load.shift_id)
+        if totals is not None:
+            totals.add(load, -1)
+            if not totals.load_count:
+                del self._shift_totals[load.shift_id]
+
+    @staticmethod
+    def _discard(index: Dict[Any, Dict[str, None]], key: Any, load_id: str):
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(load_id, None)
+        if not bucket:
+            del index[key]
+
+    def _put_load(self, load: LoadRecord):
+        existing = self._loads.get(load.id)
+        if existing is not None:
+            self._unindex_load(existing)
+            self._bump_version(existing.shift_id)
+        self._loads[load.id] = load
+        self._index_load(load)
+        self._bump_version(load.shift_id)
+        self._stamp("loads", load.id)
+
+    def _remove_load(self, load_id: str) -> Optional[LoadRecord]:
+        existing = self._loads.pop(load_id, None)
+        if existing is not None:
+            self._unindex_load(existing)
+            self._bump_version(existing.shift_id)
+            self._bury("loads", load_id, existing.shift_id)
+        return existing
+
+    def _bump_version(self, shift_id: Optional[str]):
+        for key in {shift_id or "", "*"}:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _stamp(self, kind: str, record_id: str):
+        """Record the write at the current change seq (keeps seq order)."""
+        seqs = self._change_seqs[kind]
+        seqs.pop(record_id, None)
+        seqs[record_id] = self._versions.get("*", 0)
+        self._tombstones[kind].pop(record_id, None)
+
+    def _bury(self, kind: str, record_id: str, shift_id: Optional[str]):
+        self._change_seqs[kind].pop(record_id, None)
+        tombstones = self._tombstones[kind]
+        tombstones[record_id] = [self._versions.get("*", 0), shift_id]
+        while len(tombstones) > MAX_TOMBSTONES:
+            seq, _ = tombstones.pop(next(iter(tombstones)))
+            horizon = self._extra.get("tombstone_horizon", 0)
+            self._extra["tombstone_horizon"] = max(horizon, seq)
+
+    @staticmethod
+    def _clone(load: LoadRecord) -> LoadRecord:
+        # Callers mutate returned records before saving them; never hand out
+        # (or keep) a reference to the cached instance.
+        clone = copy.copy(load)
+        clone.missing_refs = list(load.missing_refs or [])
+        return clone
+
+    # --- Raw file access --------------------------------------------------
+
     def _load_data(self) -> Dict[str, List[Dict[str, Any]]]:
         try:
             with open(self.filepath, "r") as f:
-                return json.load(f)
+                data = json.load(f)
         except (json.JSONDecodeError, FileNotFoundError):
             return {"loads": [], "groups": []}
+        if isinstance(data, list):
+            return {"loads": data, "groups": []}
+        return data
+
+    def _save_data(self, data: Dict[str, List[Dict[str, Any]]], fsync: bool = False):
+        # Write to a sibling file and swap it in so concurrent readers never
+        # observe (and cache) a half-written document.
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, "w") as f:
+            # dumps, unlike dump, encodes in C (indent included), and the
+            # snapshot is rewritten whole anyway.
+            f.write(json.dumps(data, indent=2))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
+
+    def _write_snapshot(self, fsync: bool = False):
+        """Rewrite the snapshot from the cache, retiring any journal."""
+        old_journal = self._journal_path()
+        has_journal = os.path.exists(old_journal)
+        if self.journal or has_journal:
+            self._extra["journal_generation"] = self._generation + 1
+
+        data = dict(self._extra)
+        data["loads"] = [self._to_dict(load) for load in self._loads.values()]
+        data["groups"] = [self._group_to_dict(g) for g in self._groups.values()]
+        self._save_data(data, fsync=fsync)
+        self._signature = self._stat_signature()
+
+        self._generation = int(self._extra.get("journal_generation", 0))
+        self._journal_offset = 0
+        if has_journal:
+            os.remove(old_journal)
+
+    def _append_journal(self, ops: List[Dict[str, Any]], fsync: bool = False):
+        payload = "".join(json.dumps(op, separators=(",", ":")) + "\n" for op in ops)
+        with open(self._journal_path(), "a") as f:
+            f.write(payload)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+            self._journal_offset = f.tell()
+
+        if self._journal_offset >= self.compact_threshold:
+            self._write_snapshot(fsync=fsync)
+
+    def compact(self):
+        """Fold the journal into a new snapshot."""
+        with self._lock, file_lock(f"{self.filepath}.lock"):
+            self._refresh()
+            self._write_snapshot()
+
+    # --- Mutations --------------------------------------------------------
+
+    def _commit(
+        self,
+        ops: List[Dict[str, Any]],
+        touched_groups: Iterable[str] = (),
+    ) -> bool:
+        """
+        Apply ``ops`` to the cache, derive the resulting group status
+        changes and persist everything with a single write.
+
+        Returns False if any op had nothing to act on (e.g. deleting a
+        load that does not exist); such ops are not persisted.
+        """
+        pending = _PendingCommit(ops, touched_groups)
+        if not self.group_commit:
+            self._write_batch([pending])
+        else:
+            self._ensure_writer()
+            self._queue.put(pending)
+            pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.applied
+
+    def _write_batch(self, batch: List[_PendingCommit], fsync: bool = False):
+        with self._lock, file_lock(f"{self.filepath}.lock"):
+            # Pick up whatever other workers wrote before applying ours.
+            self._refresh()
+            written: List[Dict[str, Any]] = []
+            touched: Set[str] = set()
+            try:
+                for pending in batch:
+                    pending.applied = True
+                    touched.update(pending.touched_groups)
+                    for op in pending.ops:
+                        op_touched = self._apply(op)
+                        if op_touched is None:
+                            pending.applied = False
+                            continue
+                        touched.update(op_touched)
+                        written.append(op)
+
+                group_ops = self._group_status_ops(touched)
+                for op in group_ops:
+                    self._apply(op)
+                written.extend(group_ops)
+
+                if not written:
+                    return
+                if self.journal:
+                    self._append_journal(written, fsync=fsync)
+                else:
+                    self._write_snapshot(fsync=fsync)
+            except BaseException:
+                # Anything applied so far is in the cache but not on disk
+                # (a later op or the write failed); force a full reload.
+                self._signature = None
+                raise
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._writer is not None and self._writer_pid == os.getpid():
+                return
+            # Threads do not survive a fork; start one per worker process.
+            self._queue = queue.Queue()
+            self._writer_pid = os.getpid()
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"json-repository-writer:{os.path.basename(self.filepath)}",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.commit_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
 
-    def _save_data(self, data: Dict[str, List[Dict[str, Any]]]):
-        with open(self.filepath, "w") as f:
-            json.dump(data, f, indent=2)
+            try:
+                self._write_batch(batch, fsync=True)
+            except BaseException as exc:
+                for pending in batch:
+                    pending.error = exc
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+    def _apply(self, op: Dict[str, Any]) -> Optional[Set[str]]:
+        """
+        Apply one mutation to the cache and return the group ids it touched,
+        or None if its target did not exist.
+        """
+        touched: Set[str] = set()
+        kind = op.get("op")
+        if kind == "put_load":
+            load = self._from_dict(dict(op["data"]))
+            existing = self._loads.get(load.id)
+            if existing is not None and existing.group_id:
+                touched.add(existing.group_id)
+            if load.group_id:
+                touched.add(load.group_id)
+            self._put_load(load)
+        elif kind == "delete_load":
+            existing = self._remove_load(op["id"])
+            if existing is None:
+                return None
+            if existing.group_id:
+                touched.add(existing.group_id)
+        elif kind == "put_group":
+            group = self._group_from_dict(dict(op["data"]))
+            self._groups[group.id] = group
+            self._bump_version(group.shift_id)
+            self._stamp("groups", group.id)
+        elif kind == "delete_group":
+            group_id = op["id"]
+            group = self._groups.pop(group_id, None)
+            if group is None:
+                return None
+            self._bump_version(group.shift_id)
+            self._bury("groups", group_id, group.shift_id)
+            # Also clean up loads that belonged to this group
+            for load_id in list(self._loads_by_group.get(group_id, {})):
+                load = self._clone(self._loads[load_id])
+                load.group_id = None
+                self._put_load(load)
+        return touched
+
+    def _group_status_ops(self, group_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        ops = []
+        for group_id in group_ids:
+            group = self._groups.get(group_id)
+            if not group:
+                continue
 
-    def _load_all_records(self) -> List[LoadRecord]:
-        data = self._load_data()
-        return [self._from_dict(d) for d in data.get("loads", [])]
+            child_loads = [
+                self._loads[load_id]
+                for load_id in self._loads_by_group.get(group_id, {})
+            ]
+            if not child_loads:
+                continue
 
-    def list_all(self) -> List[LoadRecord]:
-        return self._load_all_records()
+            all_complete = all(l.status == LoadStatus.COMPLETE for l in child_loads)
+            any_in_process = any(l.status == LoadStatus.IN_PROCESS for l in child_loads)
+
+            new_status = LoadStatus.PENDING
+            if all_complete:
+                new_status = LoadStatus.COMPLETE
+            elif any_in_process:
+                new_status = LoadStatus.IN_PROCESS
+
+            if group.status != new_status:
+                updated = copy.copy(group)
+                updated.status = new_status
+                updated.touch()
+                ops.append({"op": "put_group", "data": self._group_to_dict(updated)})
+        return ops
+
+    # --- Unit of work -----------------------------------------------------
+
+    def _unit_of_work(self) -> Optional["_UnitOfWork"]:
+        return getattr(self._local, "unit_of_work", None)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Buffer every write made in the block and persist them (plus one
+        group status pass) with a single commit on exit. Reads inside the
+        block see the buffered writes and skip re-checking the file.
+
+        Units of work of one repository run one at a time, commit
+        included, so a write command's read-modify-write (an increment, a
+        PATCH) cannot be overwritten by another thread's in between.
+        """
+        if self._unit_of_work() is not None:
+            # Nested blocks join the outer unit of work.
+            yield
+            return
 
-    def _save_all_records(self, loads: List[LoadRecord]):
-        data = self._load_data()
-        data["loads"] = [self._to_dict(load) for load in loads]
-        self._save_data(data)
+        with self._uow_lock:
+            uow = _UnitOfWork()
+            self._local.unit_of_work = uow
+            try:
+                yield
+            finally:
+                self._local.unit_of_work = None
+            if uow.ops or uow.touched_groups:
+                self._commit(uow.ops, uow.touched_groups)
+
+    def _begin_read(self):
+        uow = self._unit_of_work()
+        if uow is None or not uow.refreshed:
+            self._refresh()
+            if uow is not None:
+                uow.refreshed = True
+
+    def _loads_view(
+        self, load_ids: Iterable[str], predicate: Callable[[LoadRecord], bool]
+    ) -> List[LoadRecord]:
+        """Clone the matching loads, merged with any pending unit of work."""
+        return [self._clone(l) for l in self._visible_loads(load_ids) if predicate(l)]
+
+    def _visible_loads(self, load_ids: Iterable[str]) -> Iterator[LoadRecord]:
+        """Yield cached loads (not clones) with pending writes applied."""
+        uow = self._unit_of_work()
+        pending = uow.loads if uow is not None else {}
+        seen = set()
+        for load_id in load_ids:
+            seen.add(load_id)
+            load = pending.get(load_id, self._loads[load_id])
+            if load is not None:
+                yield load
+        for load_id, load in pending.items():
+            if load_id not in seen and load is not None:
+                yield load
+
+    def _groups_view(self, predicate: Callable[[LoadGroup], bool]) -> List[LoadGroup]:
+        uow = self._unit_of_work()
+        pending = uow.groups if uow is not None else {}
+        result = []
+        for group_id, group in self._groups.items():
+            group = pending.get(group_id, group)
+            if group is not None and predicate(group):
+                result.append(copy.copy(group))
+        for group_id, group in pending.items():
+            if group_id not in self._groups and group is not None and predicate(group):
+                result.append(copy.copy(group))
+        return result
+
+    def _visible_load(self, load_id: str) -> Optional[LoadRecord]:
+        uow = self._unit_of_work()
+        if uow is not None and load_id in uow.loads:
+            return uow.loads[load_id]
+        return self._loads.get(load_id)
+
+    def _visible_group(self, group_id: str) -> Optional[LoadGroup]:
+        uow = self._unit_of_work()
+        if uow is not None and group_id in uow.groups:
+            return uow.groups[group_id]
+        return self._groups.get(group_id)
+
+    # --- Loads ------------------------------------------------------------
+
+    def list_all(self) -> List[LoadRecord]:
+        with self._lock:
+            self._begin_read()
+            return self._loads_view(list(self._loads), lambda load: True)
 
     def get_load(self, load_id: str) -> Optional[LoadRecord]:
-        loads = self._load_all_records()
-        for load in loads:
-            if load.id == load_id:
-                return load
-        return None
+        with self._lock:
+            self._begin_read()
+            load = self._visible_load(load_id)
+            return self._clone(load) if load else None
 
     def save_load(self, load: LoadRecord) -> None:
-        loads = self._load_all_records()
-        existing_idx = next(
-            (i for i, existing_load in enumerate(loads) if existing_load.id == load.id),
-            -1,
-        )
-
-        if existing_idx >= 0:
-            loads[existing_idx] = load
-        else:
-            loads.append(load)
-
-        self._save_all_records(loads)
-        # If this load belongs to a group, update group status
-        if load.group_id:
-            self._sync_group_status(load.group_id)
+        op = {"op": "put_load", "data": self._to_dict(load)}
+        uow = self._unit_of_work()
+        if uow is None:
+            # Group status is re-derived for the old and new group in the
+            # same write.
+            self._commit([op])
+            return
+        uow.loads[load.id] = self._clone(load)
+        uow.ops.append(op)
 
     def delete_load(self, load_id: str) -> bool:
-        loads = self._load_all_records()
-        initial_len = len(loads)
-        load_to_delete = next((l for l in loads if l.id == load_id), None)
-        loads = [load for load in loads if load.id != load_id]
-        if len(loads) < initial_len:
-            self._save_all_records(loads)
-            if load_to_delete and load_to_delete.group_id:
-                self._sync_group_status(load_to_delete.group_id)
-            return True
-        return False
+        op = {"op": "delete_load", "id": load_id}
+        uow = self._unit_of_work()
+        if uow is None:
+            return self._commit([op])
+        with self._lock:
+            self._begin_read()
+            if self._visible_load(load_id) is None:
+                return False
+        uow.loads[load_id] = None
+        uow.ops.append(op)
+        return True
+
+    def list_loads_by_shift(self, shift_id: Optional[str]) -> List[LoadRecord]:
+        with self._lock:
+            self._begin_read()
+            return self._loads_view(
+                list(self._loads_by_shift.get(shift_id, {})),
+                lambda load: load.shift_id == shift_id,
+            )
+
+    def query_loads(self, query: LoadQuery) -> Tuple[List[LoadRecord], Optional[str]]:
+        with self._lock:
+            self._begin_read()
+            # Start from the narrowest index the filters allow.
+            if query.shift_id is not None:
+                candidates = self._loads_by_shift.get(query.shift_id, {})
+            elif query.group_id is not None:
+                candidates = self._loads_by_group.get(query.group_id, {})
+            elif query.route_prefix and len(query.route_prefix) >= ROUTE_PREFIX_LEN:
+                candidates = self._loads_by_route_prefix.get(
+                    query.route_prefix[:ROUTE_PREFIX_LEN], {}
+                )
+            else:
+                candidates = self._loads
+            page, cursor = query.paginate(self._visible_loads(list(candidates)))
+            return [self._clone(l) for l in page], cursor
+
+    def get_board(self, shift_id: Optional[str]) -> BoardSnapshot:
+        # One lock for the whole snapshot, so no write lands between lists.
+        with self._lock:
+            self._begin_read()
+            cursor = self._versions.get("*", 0)
+            if shift_id is None:
+                return BoardSnapshot(self.list_all(), self.list_all_groups(), cursor)
+            return BoardSnapshot(
+                self.list_loads_by_shift(shift_id),
+                self.list_groups_by_shift(shift_id),
+                cursor,
+            )
+
+    def get_data_version(self, shift_id: Optional[str] = None) -> Optional[int]:
+        with self._lock:
+            self._begin_read()
+            return self._versions.get("*" if shift_id is None else shift_id, 0)
+
+    def get_store_id(self) -> Optional[str]:
+        with self._lock:
+            self._begin_read()
+            if "store_id" not in self._extra:
+                # Snapshots from before stores had an id get one when it is
+                # first asked for, written under the file lock so every
+                # process reads the same one.
+                with file_lock(f"{self.filepath}.lock"):
+                    self._refresh()
+                    if "store_id" not in self._extra:
+                        self._extra["store_id"] = _new_store_id()
+                        self._write_snapshot()
+            return self._extra["store_id"]
+
+    def get_change_cursor(self, shift_id: Optional[str] = None) -> Optional[int]:
+        with self._lock:
+            self._begin_read()
+            return self._versions.get("*", 0)
+
+    def load_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        return self._changes("loads", self._clone, since, shift_id)
+
+    def group_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        return self._changes("groups", copy.copy, since, shift_id)
+
+    def _changes(
+        self, kind: str, clone: Callable, since: int, shift_id: Optional[str]
+    ) -> ChangeSet:
+        with self._lock:
+            self._begin_read()
+            store = self._loads if kind == "loads" else self._groups
+            cursor = self._versions.get("*", 0)
+            horizon = self._extra.get("tombstone_horizon", 0)
+            if since < horizon or since > cursor:
+                return ChangeSet([], [], cursor, reset=True)
+
+            records = []
+            # Both maps are in seq order, so walk back only over new entries.
+            for record_id, seq in reversed(self._change_seqs[kind].items()):
+                if seq <= since:
+                    break
+                record = store[record_id]
+                if shift_id is None or record.shift_id == shift_id:
+                    records.append(clone(record))
+            deleted = []
+            for record_id, (seq, record_shift) in reversed(
+                self._tombstones[kind].items()
+            ):
+                if seq <= since:
+                    break
+                if shift_id is None or record_shift == shift_id:
+                    deleted.append(record_id)
+            records.reverse()
+            deleted.reverse()
+            return ChangeSet(records, deleted, cursor)
+
+    def get_shift_totals(self, shift_id: str) -> Optional[ShiftTotals]:
+        uow = self._unit_of_work()
+        if uow is not None and uow.loads:
+            # Pending writes are not in the running totals yet.
+            return super().get_shift_totals(shift_id)
+        with self._lock:
+            self._begin_read()
+            return copy.copy(self._shift_totals.get(shift_id) or ShiftTotals())
+
+    def rebuild_shift_totals(self) -> None:
+        with self._lock:
+            # Totals are derived while indexing; a full reload recomputes them.
+            self._signature = None
+            self._refresh()
 
     def list_active_loads_by_group(
         self, format_type: str, route_prefix: str, shift_id: Optional[str] = None
     ) -> List[LoadRecord]:
-        loads = self._load_all_records()
-        active_loads = []
-        for load in loads:
+        def is_match(load: LoadRecord) -> bool:
             if load.status == LoadStatus.COMPLETE:
-                continue
-
-            if shift_id is None:
-                if load.shift_id is not None:
-                    continue
-            elif load.shift_id != shift_id:
-                continue
-
+                return False
+            if load.shift_id != shift_id:
+                return False
             # Filter by format (loose string match or enum)
             if load.format != format_type:
-                continue
-
+                return False
             # Filter by route prefix (small only check)
-            if load.format == LoadFormat.SMALL and load.route_code:
-                if load.route_code.startswith(route_prefix):
-                    active_loads.append(load)
-
-        return active_loads
+            return bool(
+                load.format == LoadFormat.SMALL
+                and load.route_code
+                and load.route_code.startswith(route_prefix)
+            )
+
+        with self._lock:
+            self._begin_read()
+            candidates = self._loads_by_shift.get(shift_id, {})
+            if route_prefix and len(route_prefix) >= ROUTE_PREFIX_LEN:
+                by_prefix = self._loads_by_route_prefix.get(
+                    route_prefix[:ROUTE_PREFIX_LEN], {}
+                )
+                if len(by_prefix) < len(candidates):
+                    candidates = by_prefix
+            return self._loads_view(list(candidates), is_match)
+
+    # --- Groups -----------------------------------------------------------
 
     def get_group(self, group_id: str) -> Optional[LoadGroup]:
-        groups = self.list_all_groups()
-        for g in groups:
-            if g.id == group_id:
-                return g
-        return None
+        with self._lock:
+            self._begin_read()
+            group = self._visible_group(group_id)
+            return copy.copy(group) if group else None
 
     def save_group(self, group: LoadGroup) -> None:
-        groups = self.list_all_groups()
-        existing_idx = next(
-            (
-                i
-                for i, existing_group in enumerate(groups)
-                if existing_group.id == group.id
-            ),
-            -1,
-        )
-
-        if existing_idx >= 0:
-            groups[existing_idx] = group
-        else:
-            groups.append(group)
-
-        data = self._load_data()
-        data["groups"] = [self._group_to_dict(g) for g in groups]
-        self._save_data(data)
+        op = {"op": "put_group", "data": self._group_to_dict(group)}
+        uow = self._unit_of_work()
+        if uow is None:
+            self._commit([op])
+            return
+        uow.groups[group.id] = copy.copy(group)
+        uow.ops.append(op)
 
     def list_all_groups(self) -> List[LoadGroup]:
-        data = self._load_data()
-        return [self._group_from_dict(d) for d in data.get("groups", [])]
+        with self._lock:
+            self._begin_read()
+            return self._groups_view(lambda group: True)
 
-    def delete_group(self, group_id: str) -> bool:
-        data = self._load_data()
-        initial_len = len(data.get("groups", []))
-        data["groups"] = [g for g in data.get("groups", []) if g["id"] != group_id]
-
-        # Also clean up loads that belonged to this group
-        loads = self._load_all_records()
-        for load in loads:
-            if load.group_id == group_id:
-                load.group_id = None
-        data["loads"] = [self._to_dict(l) for l in loads]
+    def list_groups_by_shift(self, shift_id: Optional[str]) -> List[LoadGroup]:
+        with self._lock:
+            self._begin_read()
+            return self._groups_view(lambda group: group.shift_id == shift_id)
 
-        if len(data["groups"]) < initial_len:
-            self._save_data(data)
-            return True
-        return False
+    def delete_group(self, group_id: str) -> bool:
+        op = {"op": "delete_group", "id": group_id}
+        uow = self._unit_of_work()
+        if uow is None:
+            return self._commit([op])
+        with self._lock:
+            self._begin_read()
+            if self._visible_group(group_id) is None:
+                return False
+            members = self.list_loads_by_group(group_id)
+        uow.groups[group_id] = None
+        # Applying the op detaches members at commit; mirror it for reads.
+        for load in members:
+            load.group_id = None
+            uow.loads[load.id] = load
+        uow.ops.append(op)
+        return True
 
     def list_loads_by_group(self, group_id: str) -> List[LoadRecord]:
-        loads = self._load_all_records()
-        return [l for l in loads if l.group_id == group_id]
+        with self._lock:
+            self._begin_read()
+            return self._loads_view(
+                list(self._loads_by_group.get(group_id, {})),
+                lambda load: load.group_id == group_id,
+            )
+
+    def bulk_insert(
+        self, groups: Iterable[LoadGroup], loads: Iterable[LoadRecord]
+    ) -> None:
+        """
+        Put the records straight into the cache and write one snapshot,
+        skipping the per-record ops (and the journal) a transaction builds.
+        """
+        with self._lock, file_lock(f"{self.filepath}.lock"):
+            self._refresh()
+            try:
+                for group in groups:
+                    self._groups[group.id] = copy.copy(group)
+                    self._bump_version(group.shift_id)
+                    self._stamp("groups", group.id)
+                touched: Set[str] = set()
+                for load in loads:
+                    self._put_load(self._clone(load))
+                    if load.group_id:
+                        touched.add(load.group_id)
+                for op in self._group_status_ops(touched):
+                    self._apply(op)
+                self._write_snapshot()
+            except BaseException:
+                # The cache is ahead of the disk now; force a full reload.
+                self._signature = None
+                raise
 
     def _sync_group_status(self, group_id: str):
-        group = self.get_group(group_id)
-        if not group:
+        uow = self._unit_of_work()
+        if uow is not None:
+            uow.touched_groups.add(group_id)
             return
+        self._commit([], touched_groups=[group_id])
 
-        child_loads = self.list_loads_by_group(group_id)
-        if not child_loads:
-            return
-
-        all_complete = all(l.status == LoadStatus.COMPLETE for l in child_loads)
-        any_in_process = any(l.status == LoadStatus.IN_PROCESS for l in child_loads)
-
-        new_status = LoadStatus.PENDING
-        if all_complete:
-            new_status = LoadStatus.COMPLETE
-        elif any_in_process:
-            new_status = LoadStatus.IN_PROCESS
-
-        if group.status != new_status:
-            group.status = new_status
-            group.touch()
-            self.save_group(group)
+    # --- Serialization ----------------------------------------------------
 
     def _to_dict(self, load: LoadRecord) -> Dict[str, Any]:
-        d = asdict(load)
+        # Field by field: asdict() deep-copies every value, which dominates
+        # snapshot writes of large stores. missing_refs is the only mutable one.
+        d = {name: getattr(load, name) for name in LOAD_FIELDS}
+        d["missing_refs"] = list(load.missing_refs or [])
         # Convert enums to strings
         d["format"] = load.format.value
         d["status"] = load.status.value
@@ -216,7 +936,7 @@ class JsonRepository(Repository):
         return LoadRecord(**d)
 
     def _group_to_dict(self, group: LoadGroup) -> Dict[str, Any]:
-        d = asdict(group)
+        d = {name: getattr(group, name) for name in GROUP_FIELDS}
         d["status"] = group.status.value
         return d
 
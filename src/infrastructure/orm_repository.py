@@ -1,28 +1,105 @@
-from typing import List, Optional
+import secrets
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
-from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, connection, transaction
+from django.db.models import (
+    BooleanField,
+    Case,
+    CharField,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    Q,
+    Sum,
+    UUIDField,
+    Value,
+    When,
+)
+from django.db.models.functions import Greatest
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from src.application.interfaces import Repository
+from src.application.queries import LOAD_ORDER_SEQUENCE, ChangeSet, LoadQuery
 from src.domain.models import (
     LoadFormat,
     LoadGroup,
     LoadRecord,
     LoadStatus,
+    ShiftTotals,
     VerificationStatus,
 )
 from src.warehouse_ui.models import (
     Load as LoadModel,
     LoadGroup as LoadGroupModel,
+    ChangeCounter,
     LoadStatusChoices,
+    Shift as ShiftModel,
+    Tombstone,
+)
+
+# Columns that feed the Shift expected/loaded totals.
+SHIFT_TOTAL_COLUMNS = {"shift_id", "format", "expected_qty", "loaded_qty"}
+# How long deletion markers are kept for delta-sync clients.
+TOMBSTONE_RETENTION = timedelta(days=7)
+# ChangeCounter scope holding the newest change seq of a dropped marker.
+TOMBSTONE_HORIZON = "tombstone-horizon"
+# ChangeCounter scope holding a random id of this database, minted when it
+# is created (or first read after a flush).
+STORE_EPOCH = "store-epoch"
+# Rows per executemany batch in bulk_insert.
+BULK_BATCH_SIZE = 2000
+# Shift columns holding the load-derived totals; the manually entered
+# expected_*/loaded_* figures are never written here.
+SHIFT_TOTAL_FIELDS = (
+    "loads_expected_small",
+    "loads_loaded_small",
+    "loads_expected_large",
+    "loads_loaded_large",
+    "load_count",
 )
+# Load format -> the Shift (expected, loaded) total columns it feeds.
+SHIFT_TOTAL_KEYS = {
+    fmt.value: (f"loads_expected_{fmt.value}", f"loads_loaded_{fmt.value}")
+    for fmt in (LoadFormat.SMALL, LoadFormat.LARGE)
+}
 
 
 class OrmRepository(Repository):
     def __init__(self):
         self._model = LoadModel
         self._group_model = LoadGroupModel
+        self._shift_model = ShiftModel
+        self._counter_model = ChangeCounter
+        self._local = threading.local()
+
+    @contextmanager
+    def transaction(self):
+        """Run the block in one atomic transaction, syncing groups once at the end."""
+        if getattr(self._local, "pending_groups", None) is not None:
+            yield
+            return
+
+        pending: Set[str] = set()
+        with transaction.atomic():
+            self._local.pending_groups = pending
+            try:
+                yield
+            finally:
+                self._local.pending_groups = None
+            for group_id in pending:
+                self._sync_group_status(group_id)
+
+    async def _run_sync(self, func, *args):
+        # Django's thread for the request, so the ORM reuses its connection.
+        return await sync_to_async(func)(*args)
 
     def get_load(self, load_id: str) -> Optional[LoadRecord]:
         try:
@@ -32,64 +109,310 @@ class OrmRepository(Repository):
         return self._to_record(instance)
 
     def save_load(self, load: LoadRecord) -> None:
-        """Persist the dataclass into the Django ORM."""
+        """
+        Persist the dataclass into the Django ORM.
+
+        Records read through this repository carry a snapshot of their row,
+        so an update is a single ``UPDATE`` of the changed columns. Records
+        without one (new loads) are written with a single INSERT. When a
+        quantity, format or shift changes, the shift totals move from the
+        values of the row being replaced, read under a lock, not from the
+        snapshot.
+        """
+        columns = self._to_columns(load)
+        persisted = getattr(load, "_persisted", None)
+        now = timezone.now()
+
+        with transaction.atomic(savepoint=False):
+            seq = None
+            if persisted is None:
+                seq = self._bump_versions(columns["shift_id"])
+                persisted = self._insert(columns, now, seq)
+                changed = self._diff(persisted, columns)
+                if persisted is not None and changed:
+                    # The id was already stored (e.g. a re-imported record).
+                    seq = self._bump_versions(persisted["shift_id"])
+            else:
+                changed = self._diff(persisted, columns)
+                if changed:
+                    seq = self._bump_versions(
+                        persisted["shift_id"], columns["shift_id"]
+                    )
+
+            replaced = persisted
+            if persisted is not None and changed:
+                if changed & SHIFT_TOTAL_COLUMNS:
+                    replaced = self._stored_totals(columns["id"])
+                updated = self._model.objects.filter(id=columns["id"]).update(
+                    updated_at=now, change_seq=seq, **{k: columns[k] for k in changed}
+                )
+                if not updated:
+                    # Row vanished since it was read; write it back whole.
+                    self._insert(columns, now, seq)
+                    persisted, replaced, changed = None, None, set(columns)
+            if changed and (persisted is None or changed & SHIFT_TOTAL_COLUMNS):
+                self._apply_shift_totals(replaced, columns)
+
+        load._persisted = columns
+        if not changed:
+            return
+        load.updated_at = now.isoformat()
+
+        # Group status only depends on membership and load status.
+        if "group_id" in changed or "status" in changed:
+            previous_group = persisted.get("group_id") if persisted else None
+            for group_id in {previous_group, columns["group_id"]}:
+                if group_id:
+                    self._sync_group_status(str(group_id))
+
+    @staticmethod
+    def _diff(persisted: Optional[Dict[str, Any]], columns: Dict[str, Any]) -> Set[str]:
+        if persisted is None:
+            return set(columns)
+        return {k for k, v in columns.items() if persisted.get(k) != v}
+
+    def _stored_totals(self, load_id) -> Optional[Dict[str, Any]]:
+        """
+        The shift-total columns of the row about to be overwritten, locked
+        until commit. The caller's snapshot may predate a concurrent write,
+        and moving the totals from it would count that write twice.
+        """
+        return (
+            self._model.objects.select_for_update()
+            .filter(id=load_id)
+            .values(*SHIFT_TOTAL_COLUMNS)
+            .first()
+        )
+
+    def _insert(
+        self, columns: Dict[str, Any], now, seq: int
+    ) -> Optional[Dict[str, Any]]:
+        """INSERT the row; if the id already exists, return its stored columns."""
         try:
-            load_uuid = UUID(load.id)
-        except ValueError:
-            load_uuid = UUID(str(load.id))
+            with transaction.atomic():
+                obj = self._model(updated_at=now, change_seq=seq, **columns)
+                obj.save(force_insert=True)
+            return None
+        except IntegrityError:
+            existing = self._model.objects.filter(id=columns["id"]).first()
+            if existing is None:
+                raise
+            return self._to_columns(self._build_record(existing))
 
-        obj = self._model.objects.filter(id=load_uuid).first()
-        if not obj:
-            obj = self._model(id=load_uuid)
-
-        obj.client_name = load.client_name
-        obj.expected_qty = load.expected_qty
-        obj.format = load.format.value if hasattr(load.format, "value") else load.format
-        obj.load_order = load.load_order
-        obj.route_code = load.route_code
-        obj.route_group_id = load.route_group_id
-        obj.pallet_count = load.pallet_count
-        obj.verification_status = (
-            load.verification_status.value
-            if hasattr(load.verification_status, "value")
-            else load.verification_status
-        )
-        obj.vehicle_id = load.vehicle_id
-        obj.missing_refs = load.missing_refs or []
-        obj.status = load.status.value if hasattr(load.status, "value") else load.status
-        obj.is_na = load.is_na
-        obj.is_fnd = load.is_fnd
-        if load.shift_id:
-            try:
-                obj.shift_id = UUID(load.shift_id)
-            except ValueError:
-                obj.shift_id = load.shift_id
-        else:
-            obj.shift_id = None
-        if load.group_id:
-            try:
-                obj.group_id = UUID(load.group_id)
-            except ValueError:
-                obj.group_id = load.group_id
-        else:
-            obj.group = None
-        obj.loaded_qty = load.loaded_qty
-        obj.missing_qty = load.missing_qty
-        obj.updated_at = timezone.now()
-        obj.save()
-        self._sync_group_status(load.group_id)
+    def _apply_shift_totals(
+        self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]
+    ) -> None:
+        """Move one load's quantities from its old shift totals to its new ones."""
+        deltas: Dict[Any, Dict[str, int]] = {}
+        self._add_shift_deltas(deltas, old, -1)
+        self._add_shift_deltas(deltas, new, 1)
+        self._update_shift_totals(deltas)
+
+    @staticmethod
+    def _add_shift_deltas(
+        deltas: Dict[Any, Dict[str, int]], columns: Optional[Dict[str, Any]], sign: int
+    ) -> None:
+        if not columns or not columns.get("shift_id"):
+            return
+        delta = deltas.setdefault(columns["shift_id"], {})
+        delta["load_count"] = delta.get("load_count", 0) + sign
+        keys = SHIFT_TOTAL_KEYS.get(columns["format"])
+        if keys is None:
+            return
+        expected_key, loaded_key = keys
+        delta[expected_key] = delta.get(expected_key, 0) + sign * (
+            columns["expected_qty"] or 0
+        )
+        delta[loaded_key] = delta.get(loaded_key, 0) + sign * (
+            columns["loaded_qty"] or 0
+        )
+
+    def _update_shift_totals(self, deltas: Dict[Any, Dict[str, int]]) -> None:
+        for shift_id, delta in deltas.items():
+            updates = {k: Greatest(F(k) + v, 0) for k, v in delta.items() if v}
+            if updates:
+                self._shift_model.objects.filter(id=shift_id).update(**updates)
 
     def delete_load(self, load_id: str) -> bool:
         try:
             load_uuid = UUID(load_id)
-            obj = self._model.objects.filter(id=load_uuid).first()
-            group_id = str(obj.group_id) if obj and obj.group_id else None
-            deleted_count, _ = self._model.objects.filter(id=load_uuid).delete()
-            if deleted_count > 0:
-                self._sync_group_status(group_id)
-            return deleted_count > 0
-        except (ValueError, Exception):
+        except ValueError:
             return False
+        with transaction.atomic(savepoint=False):
+            # The totals move from the row as stored, locked until commit.
+            obj = self._model.objects.select_for_update().filter(id=load_uuid).first()
+            if obj is None:
+                return False
+            self._model.objects.filter(id=load_uuid).delete()
+            self._apply_shift_totals(self._to_columns(self._build_record(obj)), None)
+            seq = self._bump_versions(obj.shift_id)
+            self._bury(Tombstone.Kind.LOAD, load_uuid, obj.shift_id, seq)
+        if obj.group_id:
+            self._sync_group_status(str(obj.group_id))
+        return True
+
+    def _bump_versions(self, *shift_ids) -> int:
+        """
+        Bump the change counters of the given shifts and of "*", and return
+        the new "*" value: the change seq stamped on the written rows. The
+        "*" row stays locked until commit, so seqs are handed out in commit
+        order.
+        """
+        # One upsert, so a scope created by two writers at once still gets
+        # both bumps; sorted so concurrent writers lock rows in one order.
+        scopes = sorted({"*"} | {self._scope(s or "") for s in shift_ids})
+        table = connection.ops.quote_name(self._counter_model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (scope, value) "
+                f"VALUES {', '.join(['(%s, 1)'] * len(scopes))} "
+                f"ON CONFLICT (scope) DO UPDATE SET value = {table}.value + 1 "
+                "RETURNING scope, value",
+                scopes,
+            )
+            return dict(cursor.fetchall())["*"]
+
+    @staticmethod
+    def _scope(shift_id: Optional[str]) -> str:
+        """
+        ChangeCounter scope of a shift ("*" for the whole store): shift ids
+        in their canonical UUID form, however the caller spelled them.
+        """
+        if shift_id is None:
+            return "*"
+        try:
+            return str(UUID(str(shift_id)))
+        except ValueError:
+            return str(shift_id)
+
+    def _bury(self, kind: str, record_id, shift_id, seq: int) -> None:
+        """Leave a deletion marker for delta sync and drop expired ones."""
+        Tombstone.objects.create(
+            kind=kind,
+            record_id=str(record_id),
+            shift_id=str(shift_id) if shift_id else None,
+            change_seq=seq,
+        )
+        expired = Tombstone.objects.filter(
+            deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION
+        )
+        horizon = expired.aggregate(horizon=Max("change_seq"))["horizon"]
+        if horizon:
+            # Cursors older than the dropped markers must reload in full.
+            self._counter_model.objects.update_or_create(
+                scope=TOMBSTONE_HORIZON, defaults={"value": horizon}
+            )
+            expired.delete()
+
+    def get_change_cursor(self, shift_id: Optional[str] = None) -> Optional[int]:
+        return self.get_data_version()
+
+    def load_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        return self._changes(self._model, Tombstone.Kind.LOAD, since, shift_id)
+
+    def group_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        return self._changes(self._group_model, Tombstone.Kind.GROUP, since, shift_id)
+
+    def _changes(self, model, kind: str, since: int, shift_id: Optional[str]):
+        counters = dict(
+            self._counter_model.objects.filter(
+                scope__in=["*", TOMBSTONE_HORIZON]
+            ).values_list("scope", "value")
+        )
+        cursor = counters.get("*", 0)
+        if since < counters.get(TOMBSTONE_HORIZON, 0) or since > cursor:
+            return ChangeSet([], [], cursor, reset=True)
+
+        qs = model.objects.filter(change_seq__gt=since, change_seq__lte=cursor)
+        tombstones = Tombstone.objects.filter(
+            kind=kind, change_seq__gt=since, change_seq__lte=cursor
+        )
+        if shift_id:
+            qs = self._filter_shift(qs, shift_id)
+            tombstones = tombstones.filter(shift_id=self._scope(shift_id))
+        to_record = self._to_record if model is self._model else self._group_to_record
+        return ChangeSet(
+            [to_record(instance) for instance in qs.order_by("change_seq")],
+            list(tombstones.order_by("change_seq").values_list("record_id", flat=True)),
+            cursor,
+        )
+
+    def get_data_version(self, shift_id: Optional[str] = None) -> Optional[int]:
+        scope = self._scope(shift_id)
+        value = (
+            self._counter_model.objects.filter(scope=scope)
+            .values_list("value", flat=True)
+            .first()
+        )
+        return value or 0
+
+    def get_store_id(self) -> Optional[str]:
+        value = (
+            self._counter_model.objects.filter(scope=STORE_EPOCH)
+            .values_list("value", flat=True)
+            .first()
+        )
+        return format(self._store_epoch() if value is None else value, "x")
+
+    def get_cache_version(self, shift_id: Optional[str] = None) -> Optional[str]:
+        # Both counters in one query; this runs on every cached read.
+        scope = self._scope(shift_id)
+        values = dict(
+            self._counter_model.objects.filter(
+                scope__in=(scope, STORE_EPOCH)
+            ).values_list("scope", "value")
+        )
+        epoch = values.get(STORE_EPOCH)
+        if epoch is None:
+            epoch = self._store_epoch()
+        return f"{epoch:x}.{values.get(scope) or 0}"
+
+    def _store_epoch(self) -> int:
+        """Mint the store epoch if it is missing and return the stored one."""
+        self._counter_model.objects.bulk_create(
+            [self._counter_model(scope=STORE_EPOCH, value=secrets.randbits(62))],
+            ignore_conflicts=True,
+        )
+        return (
+            self._counter_model.objects.filter(scope=STORE_EPOCH)
+            .values_list("value", flat=True)
+            .get()
+        )
+
+    def get_shift_totals(self, shift_id: str) -> Optional[ShiftTotals]:
+        # Kept in the loads_* columns of the Shift row by save_load/delete_load.
+        return None
+
+    def rebuild_shift_totals(self) -> None:
+        totals: Dict[Any, Dict[str, int]] = {}
+        rows = (
+            self._model.objects.filter(shift__isnull=False)
+            .values("shift_id", "format")
+            .annotate(
+                count=Count("id"),
+                expected=Sum("expected_qty"),
+                loaded=Sum("loaded_qty"),
+            )
+        )
+        for row in rows:
+            shift_totals = totals.setdefault(
+                row["shift_id"],
+                dict.fromkeys(SHIFT_TOTAL_FIELDS, 0),
+            )
+            shift_totals["load_count"] += row["count"]
+            keys = SHIFT_TOTAL_KEYS.get(row["format"])
+            if keys is not None:
+                shift_totals[keys[0]] = row["expected"] or 0
+                shift_totals[keys[1]] = row["loaded"] or 0
+
+        with transaction.atomic():
+            self._shift_model.objects.update(**dict.fromkeys(SHIFT_TOTAL_FIELDS, 0))
+            for shift_id, values in totals.items():
+                self._shift_model.objects.filter(id=shift_id).update(**values)
 
     def list_active_loads_by_group(
         self, format_type: str, route_prefix: str, shift_id: Optional[str] = None
@@ -98,13 +421,7 @@ class OrmRepository(Repository):
         if format_type:
             qs = qs.filter(format=format_type)
 
-        if shift_id is None:
-            qs = qs.filter(shift__isnull=True)
-        elif shift_id:
-            try:
-                qs = qs.filter(shift_id=UUID(shift_id))
-            except ValueError:
-                qs = qs.filter(shift_id=shift_id)
+        qs = self._filter_shift(qs, shift_id)
 
         if route_prefix:
             qs = qs.filter(route_code__startswith=route_prefix)
@@ -114,6 +431,64 @@ class OrmRepository(Repository):
     def list_all(self) -> List[LoadRecord]:
         return [self._to_record(instance) for instance in self._model.objects.all()]
 
+    def list_loads_by_shift(self, shift_id: Optional[str]) -> List[LoadRecord]:
+        qs = self._filter_shift(self._model.objects.all(), shift_id)
+        return [self._to_record(instance) for instance in qs]
+
+    def query_loads(self, query: LoadQuery) -> Tuple[List[LoadRecord], Optional[str]]:
+        qs = self._model.objects.all()
+        if query.shift_id is not None:
+            qs = self._filter_shift(qs, query.shift_id)
+        if query.status is not None:
+            qs = qs.filter(status=query.status)
+        if query.format is not None:
+            qs = qs.filter(format=query.format)
+        if query.group_id is not None:
+            try:
+                qs = qs.filter(group_id=UUID(query.group_id))
+            except ValueError:
+                qs = qs.none()
+        if query.vehicle_id is not None:
+            qs = qs.filter(vehicle_id=query.vehicle_id)
+        if query.route_prefix is not None:
+            qs = qs.filter(route_code__startswith=query.route_prefix)
+
+        field = query.order_field
+        if field == "load_order":
+            field = "order_rank"
+            qs = qs.annotate(
+                order_rank=Case(
+                    *[
+                        When(load_order=code, then=Value(rank))
+                        for rank, code in enumerate(LOAD_ORDER_SEQUENCE)
+                    ],
+                    default=Value(len(LOAD_ORDER_SEQUENCE)),
+                    output_field=IntegerField(),
+                )
+            )
+
+        if query.after_key is not None:
+            value, after_id = query.after_key
+            if field != "order_rank":
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError("Invalid cursor")
+            try:
+                after_uuid = UUID(after_id)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+            op = "lt" if query.descending else "gt"
+            qs = qs.filter(
+                Q(**{f"{field}__{op}": value})
+                | Q(**{field: value, f"id__{op}": after_uuid})
+            )
+
+        prefix = "-" if query.descending else ""
+        qs = qs.order_by(f"{prefix}{field}", f"{prefix}id")
+        if query.limit is not None:
+            qs = qs[: query.limit + 1]
+        return query.page([self._to_record(instance) for instance in qs])
+
     def get_group(self, group_id: str) -> Optional[LoadGroup]:
         try:
             instance = self._group_model.objects.get(id=UUID(group_id))
@@ -144,17 +519,138 @@ class OrmRepository(Repository):
         else:
             obj.shift_id = None
         obj.updated_at = timezone.now()
-        obj.save()
+        with transaction.atomic(savepoint=False):
+            obj.change_seq = self._bump_versions(obj.shift_id)
+            obj.save()
 
         # Sync dataclass timestamps
         group.updated_at = obj.updated_at.isoformat()
         if not group.created_at or getattr(group, "created_at", None) is None:
             group.created_at = obj.created_at.isoformat()
 
+    def bulk_insert(
+        self,
+        groups: Iterable[LoadGroup],
+        loads: Iterable[LoadRecord],
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> None:
+        """
+        Insert the rows in batches inside one transaction, all stamped
+        with one change seq. Shift totals and group status are updated once
+        per shift and group afterwards rather than per row. ``loads`` is
+        consumed lazily, so a generator keeps memory flat.
+        """
+        deltas: Dict[Any, Dict[str, int]] = {}
+        member_statuses: Dict[Any, Set[str]] = {}
+        shift_ids: Set[Any] = set()
+        with transaction.atomic():
+            seq = self._bump_versions()
+            group_rows = []
+            for group in groups:
+                shift_id = self._uuid_or_raw(group.shift_id)
+                shift_ids.add(shift_id)
+                group_rows.append(
+                    self._group_model(
+                        id=self._uuid_or_raw(group.id),
+                        vehicle_id=group.vehicle_id,
+                        max_pallet_count=group.max_pallet_count,
+                        status=self._enum_value(group.status),
+                        shift_id=shift_id,
+                        change_seq=seq,
+                    )
+                )
+            self._group_model.objects.bulk_create(group_rows, batch_size=batch_size)
+
+            rows = []
+            for load in loads:
+                columns = self._to_columns(load)
+                shift_ids.add(columns["shift_id"])
+                self._add_shift_deltas(deltas, columns, 1)
+                if columns["group_id"]:
+                    member_statuses.setdefault(columns["group_id"], set()).add(
+                        columns["status"]
+                    )
+                rows.append(columns)
+                if len(rows) >= batch_size:
+                    self._insert_many(rows, seq)
+                    rows = []
+            self._insert_many(rows, seq)
+
+            self._update_shift_totals(deltas)
+            inserted = {row.id for row in group_rows}
+            by_status: Dict[str, List[Any]] = {}
+            for group_id, statuses in member_statuses.items():
+                if group_id in inserted:
+                    status = self._derived_group_status(statuses)
+                    by_status.setdefault(status, []).append(group_id)
+                else:
+                    self._sync_group_status(str(group_id))
+            for status, group_ids in by_status.items():
+                self._group_model.objects.filter(id__in=group_ids).exclude(
+                    status=status
+                ).update(status=status)
+            self._bump_versions(*shift_ids)
+
+    def _insert_many(self, rows: List[Dict[str, Any]], seq: int) -> None:
+        """
+        INSERT load column dicts with one executemany. bulk_create compiles
+        and adapts every value of every row, which is several times slower
+        at bulk_insert volumes; here only the columns whose Python value
+        needs adapting (UUIDs, JSON) go through their field.
+        """
+        if not rows:
+            return
+        # The connection itself, not the thread-local proxy, for speed.
+        db = transaction.get_connection()
+        meta = self._model._meta
+        now = timezone.now()
+        fixed = {"created_at": now, "updated_at": now, "change_seq": seq}
+        fixed_values = [
+            meta.get_field(name).get_db_prep_save(value, db)
+            for name, value in fixed.items()
+        ]
+        fields = [f for f in meta.concrete_fields if f.attname not in fixed]
+        adapted = [
+            (i, self._bulk_adapter(f, db))
+            for i, f in enumerate(fields)
+            if not isinstance(f, (CharField, IntegerField, BooleanField))
+        ]
+        quote = db.ops.quote_name
+        columns = [f.column for f in fields] + [meta.get_field(n).column for n in fixed]
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote(meta.db_table),
+            ", ".join(quote(column) for column in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+        values_of = itemgetter(*(f.attname for f in fields))
+        params = []
+        for row in rows:
+            values = list(values_of(row))
+            for i, prepare in adapted:
+                values[i] = prepare(values[i])
+            values.extend(fixed_values)
+            params.append(values)
+        with db.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+    @staticmethod
+    def _bulk_adapter(field, db):
+        prepare = field.get_db_prep_save
+        if isinstance(field, UUIDField) and not db.features.has_native_uuid_field:
+            # _to_columns already parsed the ids; store their hex directly.
+            return lambda value: (
+                value.hex if isinstance(value, UUID) else prepare(value, db)
+            )
+        return lambda value: prepare(value, db)
+
     def list_all_groups(self) -> List[LoadGroup]:
         instances = self._group_model.objects.all()
         return [self._group_to_record(instance) for instance in instances]
 
+    def list_groups_by_shift(self, shift_id: Optional[str]) -> List[LoadGroup]:
+        qs = self._filter_shift(self._group_model.objects.all(), shift_id)
+        return [self._group_to_record(instance) for instance in qs]
+
     def delete_group(self, group_id: str) -> bool:
         try:
             group_uuid = UUID(group_id)
@@ -162,10 +658,19 @@ class OrmRepository(Repository):
             return False
 
         with transaction.atomic():
+            shift_ids = list(
+                self._group_model.objects.filter(id=group_uuid).values_list(
+                    "shift_id", flat=True
+                )
+            )
+            if not shift_ids:
+                return False
+            seq = self._bump_versions(shift_ids[0])
             loads_updated = self._model.objects.filter(group_id=group_uuid).update(
-                group=None
+                group=None, change_seq=seq
             )
             deleted, _ = self._group_model.objects.filter(id=group_uuid).delete()
+            self._bury(Tombstone.Kind.GROUP, group_uuid, shift_ids[0], seq)
         return deleted > 0
 
     def list_loads_by_group(self, group_id: str) -> List[LoadRecord]:
@@ -179,6 +684,10 @@ class OrmRepository(Repository):
     def _sync_group_status(self, group_id: Optional[str]):
         if not group_id:
             return
+        pending = getattr(self._local, "pending_groups", None)
+        if pending is not None:
+            pending.add(group_id)
+            return
         try:
             group_uuid = UUID(group_id)
         except ValueError:
@@ -192,18 +701,76 @@ class OrmRepository(Repository):
         if not loads:
             return
 
-        if all(load.status == LoadStatusChoices.COMPLETE for load in loads):
-            new_status = LoadStatusChoices.COMPLETE
-        elif any(load.status == LoadStatusChoices.IN_PROCESS for load in loads):
-            new_status = LoadStatusChoices.IN_PROCESS
-        else:
-            new_status = LoadStatusChoices.PENDING
-
+        new_status = self._derived_group_status({load.status for load in loads})
         if group.status != new_status:
             group.status = new_status
-            group.save(update_fields=["status", "updated_at"])
+            with transaction.atomic(savepoint=False):
+                group.change_seq = self._bump_versions(group.shift_id)
+                group.save(update_fields=["status", "updated_at", "change_seq"])
+
+    @staticmethod
+    def _derived_group_status(load_statuses: Set[str]) -> str:
+        if load_statuses == {LoadStatusChoices.COMPLETE}:
+            return LoadStatusChoices.COMPLETE
+        if LoadStatusChoices.IN_PROCESS in load_statuses:
+            return LoadStatusChoices.IN_PROCESS
+        return LoadStatusChoices.PENDING
+
+    @staticmethod
+    def _filter_shift(qs, shift_id: Optional[str]):
+        if shift_id is None:
+            return qs.filter(shift__isnull=True)
+        if not shift_id:
+            return qs
+        try:
+            return qs.filter(shift_id=UUID(shift_id))
+        except ValueError:
+            # Not a valid shift UUID, so nothing can match it.
+            return qs.none()
+
+    @staticmethod
+    def _uuid_or_raw(value):
+        if not value:
+            return None
+        try:
+            return UUID(str(value))
+        except ValueError:
+            return value
+
+    @staticmethod
+    def _enum_value(value):
+        return value.value if hasattr(value, "value") else value
+
+    def _to_columns(self, load: LoadRecord) -> Dict[str, Any]:
+        """Map a record onto the model's column values (keyed by attname)."""
+        return {
+            "id": self._uuid_or_raw(load.id),
+            "client_name": load.client_name,
+            "expected_qty": load.expected_qty,
+            "format": self._enum_value(load.format),
+            "load_order": load.load_order,
+            "route_code": load.route_code,
+            "route_group_id": load.route_group_id,
+            "pallet_count": load.pallet_count,
+            "verification_status": self._enum_value(load.verification_status),
+            "vehicle_id": load.vehicle_id,
+            "missing_refs": list(load.missing_refs or []),
+            "status": self._enum_value(load.status),
+            "is_na": load.is_na,
+            "is_fnd": load.is_fnd,
+            "shift_id": self._uuid_or_raw(load.shift_id),
+            "group_id": self._uuid_or_raw(load.group_id),
+            "loaded_qty": load.loaded_qty,
+            "missing_qty": load.missing_qty,
+        }
 
     def _to_record(self, instance: LoadModel) -> LoadRecord:
+        record = self._build_record(instance)
+        # Snapshot of the stored row; save_load diffs against it.
+        record._persisted = self._to_columns(record)
+        return record
+
+    def _build_record(self, instance: LoadModel) -> LoadRecord:
         verification_value = (
             instance.verification_status if instance.verification_status else None
         )
@@ -216,9 +783,9 @@ class OrmRepository(Repository):
             route_code=instance.route_code,
             route_group_id=instance.route_group_id,
             pallet_count=instance.pallet_count,
-            verification_status=VerificationStatus(verification_value)
-            if verification_value
-            else None,
+            verification_status=(
+                VerificationStatus(verification_value) if verification_value else None
+            ),
             vehicle_id=instance.vehicle_id,
             group_id=str(instance.group_id) if instance.group_id else None,
             shift_id=str(instance.shift_id) if instance.shift_id else None,
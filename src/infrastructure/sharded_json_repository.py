@@ -0,0 +1,528 @@
+import json
+import os
+import re
+import threading
+import uuid
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.application.interfaces import Repository
+from src.application.queries import BoardSnapshot, ChangeSet, LoadQuery
+from src.domain.models import LoadGroup, LoadRecord, LoadStatus, ShiftTotals
+from src.infrastructure.json_repository import JsonRepository, file_lock
+
+MANIFEST_NAME = "manifest.json"
+# Every shard keeps an append-only list of the ids it stores next to its
+# file: "+L <id>"/"-L <id>" for loads, "+G"/"-G" for groups and "+M"/"-M"
+# for groups kept in another shard that have loads in this one.
+ID_INDEX_SUFFIX = ".ids"
+ID_KINDS = ("L", "G", "M")
+# Shard key for loads/groups that are not attached to any shift.
+UNASSIGNED_SHARD = "unassigned"
+
+
+def _shard_key(shift_id: Optional[str]) -> str:
+    return shift_id or UNASSIGNED_SHARD
+
+
+def _shard_filename(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", key) + ".json"
+
+
+class ShardedJsonRepository(Repository):
+    """
+    JSON backend that stores each shift in its own file
+    (``<directory>/<shift_id>.json``) next to a small manifest.
+
+    Every shard is a regular ``JsonRepository`` (so it keeps its own cache,
+    journal and locking) and is only opened the first time it is needed.
+    Shift-scoped calls touch a single shard, which keeps closed shifts off
+    the hot path. Each shard also keeps an append-only index of its load
+    and group ids (``<shift_id>.json.ids``), so point reads, deletes and
+    group lookups open only the shards involved while a write appends a
+    line to one small file. Loads are expected to share their group's
+    shift; a load grouped across shifts is recorded in its shard's index
+    when it is saved after its group.
+    """
+
+    def __init__(self, directory: str, **shard_options: Any):
+        self.directory = directory
+        self._shard_options = shard_options
+        self._lock = threading.RLock()
+        # Held for a whole unit of work, so the shards' own unit-of-work
+        # locks are never taken in two orders at once.
+        self._uow_lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: Dict[str, JsonRepository] = {}
+        # Per shard key: the ids of each kind in its index and how far the
+        # index file has been read.
+        self._ids: Dict[str, Dict[str, Set[str]]] = {}
+        self._ids_offsets: Dict[str, int] = {}
+        self._manifest: Dict[str, Any] = {
+            "version": 1,
+            "store_id": uuid.uuid4().hex,
+            "shards": {},
+        }
+        self._manifest_signature: Optional[Tuple[int, int]] = None
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self._manifest_path):
+            self._write_manifest(self._manifest)
+        self._refresh_manifest()
+        if "store_id" not in self._manifest:
+            self._mint_store_id()
+
+    # --- Manifest ---------------------------------------------------------
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _refresh_manifest(self):
+        try:
+            st = os.stat(self._manifest_path)
+        except FileNotFoundError:
+            return
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._manifest_signature:
+            return
+        try:
+            with open(self._manifest_path, "r") as f:
+                self._manifest = json.load(f)
+        except json.JSONDecodeError:
+            return
+        self._manifest_signature = signature
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest = manifest
+        st = os.stat(self._manifest_path)
+        self._manifest_signature = (st.st_mtime_ns, st.st_size)
+
+    def shard_keys(self) -> List[str]:
+        with self._lock:
+            self._refresh_manifest()
+            return list(self._manifest["shards"])
+
+    def _mint_store_id(self) -> None:
+        """Give a manifest written before store ids existed its id, once."""
+        with self._lock, file_lock(f"{self._manifest_path}.lock"):
+            self._manifest_signature = None
+            self._refresh_manifest()
+            if "store_id" not in self._manifest:
+                self._write_manifest({**self._manifest, "store_id": uuid.uuid4().hex})
+
+    # --- Id index ---------------------------------------------------------
+
+    def _ids_path(self, key: str) -> str:
+        entry = self._manifest["shards"][key]
+        return os.path.join(self.directory, entry["file"]) + ID_INDEX_SUFFIX
+
+    def _indexed(self, kind: str, record_id: str) -> List[str]:
+        with self._lock:
+            return [key for key, ids in self._ids.items() if record_id in ids[kind]]
+
+    def _refresh_ids(self) -> None:
+        """Replay what was appended to the shard indexes since the last read."""
+        with self._lock:
+            for key in self.shard_keys():
+                path = self._ids_path(key)
+                try:
+                    size = os.path.getsize(path)
+                except FileNotFoundError:
+                    self._write_ids(key, only_if_missing=True)
+                    size = os.path.getsize(path)
+                offset = self._ids_offsets.get(key, 0)
+                if size < offset:
+                    # Rewritten since (import_single_file): read it again.
+                    offset = 0
+                    self._ids.pop(key, None)
+                if size == offset:
+                    continue
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    chunk = f.read(size - offset)
+                # Only replay complete lines; a partial one is read next time.
+                end = chunk.rfind(b"\n") + 1
+                self._apply_ids(key, chunk[:end].decode().splitlines())
+                self._ids_offsets[key] = offset + end
+
+    def _apply_ids(self, key: str, entries: Iterable[str]) -> None:
+        ids = self._ids.setdefault(key, {kind: set() for kind in ID_KINDS})
+        for entry in entries:
+            op, _, record_id = entry.partition(" ")
+            if len(op) == 2 and op[1] in ids:
+                if op[0] == "+":
+                    ids[op[1]].add(record_id)
+                else:
+                    ids[op[1]].discard(record_id)
+
+    def _append_ids(self, key: str, entries: List[str]) -> None:
+        """
+        Record index entries for a registered shard. Callers append before
+        writing a record into a new shard, so a crash in between leaves at
+        worst an entry pointing at a shard without the record.
+        """
+        if not entries:
+            return
+        with self._lock:
+            path = self._ids_path(key)
+            with file_lock(f"{path}.lock"), open(path, "a") as f:
+                f.write("".join(f"{entry}\n" for entry in entries))
+            # Replaying these lines later is harmless: entries of a shard
+            # are applied in file order and adding an id twice is a no-op.
+            self._apply_ids(key, entries)
+
+    def _write_ids(self, key: str, only_if_missing: bool = False) -> None:
+        """(Re)write a shard's index from its contents."""
+        shard = self._shard(key)
+        path = self._ids_path(key)
+        with self._lock, file_lock(f"{path}.lock"):
+            if only_if_missing and os.path.exists(path):
+                return
+            group_ids = {group.id for group in shard.list_all_groups()}
+            entries = [f"+G {group_id}" for group_id in group_ids]
+            for load in shard.list_all():
+                entries.append(f"+L {load.id}")
+                if load.group_id and load.group_id not in group_ids:
+                    entries.append(f"+M {load.group_id}")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write("".join(f"{entry}\n" for entry in entries))
+            os.replace(tmp_path, path)
+            self._ids.pop(key, None)
+            self._ids_offsets.pop(key, None)
+
+    # --- Unit of work -----------------------------------------------------
+
+    @contextmanager
+    def transaction(self):
+        """
+        Open a unit of work on each shard the block touches; every shard
+        commits its buffered writes with one write on exit.
+        """
+        if getattr(self._local, "stack", None) is not None:
+            yield
+            return
+
+        with self._uow_lock, ExitStack() as stack:
+            self._local.stack = stack
+            self._local.joined = set()
+            try:
+                yield
+            finally:
+                self._local.stack = None
+
+    def _join_transaction(self, key: str, shard: JsonRepository) -> JsonRepository:
+        stack = getattr(self._local, "stack", None)
+        if stack is not None and key not in self._local.joined:
+            self._local.joined.add(key)
+            stack.enter_context(shard.transaction())
+        return shard
+
+    # --- Shards -----------------------------------------------------------
+
+    def _shard(self, key: str, create: bool = False) -> Optional[JsonRepository]:
+        with self._lock:
+            shard = self._shards.get(key)
+            if shard is not None:
+                return self._join_transaction(key, shard)
+
+            self._refresh_manifest()
+            entry = self._manifest["shards"].get(key)
+            if entry is None:
+                if not create:
+                    return None
+                entry = self._register_shard(key)
+
+            shard = JsonRepository(
+                os.path.join(self.directory, entry["file"]), **self._shard_options
+            )
+            self._shards[key] = shard
+            return self._join_transaction(key, shard)
+
+    def _register_shard(self, key: str) -> Dict[str, Any]:
+        with file_lock(f"{self._manifest_path}.lock"):
+            self._manifest_signature = None
+            self._refresh_manifest()
+            entry = self._manifest["shards"].get(key)
+            if entry is None:
+                manifest = dict(self._manifest)
+                manifest["shards"] = dict(manifest["shards"])
+                entry = {"file": _shard_filename(key)}
+                manifest["shards"][key] = entry
+                self._write_manifest(manifest)
+            return entry
+
+    def _locate(self, kind: str, record_id: str, get) -> Tuple[Optional[str], Any]:
+        # Ids written by other processes are only read from the indexes on
+        # a miss; every hit is confirmed by the shard itself.
+        for refresh in (False, True):
+            if refresh:
+                self._refresh_ids()
+            for key in self._indexed(kind, record_id):
+                shard = self._shard(key)
+                record = get(shard, record_id) if shard is not None else None
+                if record is not None:
+                    return key, record
+        return None, None
+
+    def _locate_load(self, load_id: str) -> Tuple[Optional[str], Optional[LoadRecord]]:
+        return self._locate("L", load_id, JsonRepository.get_load)
+
+    def _locate_group(self, group_id: str) -> Tuple[Optional[str], Optional[LoadGroup]]:
+        return self._locate("G", group_id, JsonRepository.get_group)
+
+    # --- Loads ------------------------------------------------------------
+
+    def get_load(self, load_id: str) -> Optional[LoadRecord]:
+        return self._locate_load(load_id)[1]
+
+    def save_load(self, load: LoadRecord) -> None:
+        key = _shard_key(load.shift_id)
+        shard = self._shard(key, create=True)
+        previous_key, _ = self._locate_load(load.id)
+        if previous_key != key:
+            self._append_ids(key, [f"+L {load.id}"])
+
+        shard.save_load(load)
+        if previous_key is not None and previous_key != key:
+            self._shard(previous_key).delete_load(load.id)
+            self._append_ids(previous_key, [f"-L {load.id}"])
+
+        if load.group_id:
+            self._sync_cross_shard_group(load.group_id, key)
+
+    def delete_load(self, load_id: str) -> bool:
+        key, load = self._locate_load(load_id)
+        if load is None:
+            return False
+        deleted = self._shard(key).delete_load(load_id)
+        self._append_ids(key, [f"-L {load_id}"])
+        if deleted and load.group_id:
+            self._sync_cross_shard_group(load.group_id, key)
+        return deleted
+
+    def list_all(self) -> List[LoadRecord]:
+        loads: List[LoadRecord] = []
+        for key in self.shard_keys():
+            loads.extend(self._shard(key).list_all())
+        return loads
+
+    def list_loads_by_shift(self, shift_id: Optional[str]) -> List[LoadRecord]:
+        shard = self._shard(_shard_key(shift_id))
+        return shard.list_loads_by_shift(shift_id) if shard else []
+
+    def list_active_loads_by_group(
+        self, format_type: str, route_prefix: str, shift_id: Optional[str] = None
+    ) -> List[LoadRecord]:
+        shard = self._shard(_shard_key(shift_id))
+        if shard is None:
+            return []
+        return shard.list_active_loads_by_group(
+            format_type, route_prefix, shift_id=shift_id
+        )
+
+    def query_loads(self, query: LoadQuery) -> Tuple[List[LoadRecord], Optional[str]]:
+        if query.shift_id is None:
+            return super().query_loads(query)
+        shard = self._shard(_shard_key(query.shift_id))
+        return shard.query_loads(query) if shard else ([], None)
+
+    def get_data_version(self, shift_id: Optional[str] = None) -> Optional[int]:
+        if shift_id is not None:
+            shard = self._shard(_shard_key(shift_id))
+            return shard.get_data_version(shift_id) if shard else 0
+        # Every shard counter only grows, so their sum does too.
+        return sum(self._shard(key).get_data_version() for key in self.shard_keys())
+
+    def get_board(self, shift_id: Optional[str]) -> BoardSnapshot:
+        if shift_id is None:
+            return super().get_board(shift_id)
+        shard = self._shard(_shard_key(shift_id))
+        return shard.get_board(shift_id) if shard else BoardSnapshot([], [], 0)
+
+    # Change seqs are per shard, so delta sync is only offered per shift.
+
+    def get_store_id(self) -> Optional[str]:
+        with self._lock:
+            self._refresh_manifest()
+            return self._manifest.get("store_id")
+
+    def get_change_cursor(self, shift_id: Optional[str] = None) -> Optional[int]:
+        if shift_id is None:
+            return None
+        shard = self._shard(_shard_key(shift_id))
+        return shard.get_change_cursor(shift_id) if shard else 0
+
+    def load_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        if shift_id is None:
+            return None
+        shard = self._shard(_shard_key(shift_id))
+        return shard.load_changes(since, shift_id) if shard else ChangeSet([], [], 0)
+
+    def group_changes(
+        self, since: int, shift_id: Optional[str] = None
+    ) -> Optional[ChangeSet]:
+        if shift_id is None:
+            return None
+        shard = self._shard(_shard_key(shift_id))
+        return shard.group_changes(since, shift_id) if shard else ChangeSet([], [], 0)
+
+    def get_shift_totals(self, shift_id: str) -> Optional[ShiftTotals]:
+        shard = self._shard(_shard_key(shift_id))
+        return shard.get_shift_totals(shift_id) if shard else ShiftTotals()
+
+    def rebuild_shift_totals(self) -> None:
+        for key in self.shard_keys():
+            self._shard(key).rebuild_shift_totals()
+
+    # --- Groups -----------------------------------------------------------
+
+    def get_group(self, group_id: str) -> Optional[LoadGroup]:
+        return self._locate_group(group_id)[1]
+
+    def save_group(self, group: LoadGroup) -> None:
+        key = _shard_key(group.shift_id)
+        shard = self._shard(key, create=True)
+        previous_key, _ = self._locate_group(group.id)
+        if previous_key != key:
+            self._append_ids(key, [f"+G {group.id}"])
+        shard.save_group(group)
+        if previous_key is not None and previous_key != key:
+            self._shard(previous_key).delete_group(group.id)
+            self._append_ids(previous_key, [f"-G {group.id}"])
+
+    def list_all_groups(self) -> List[LoadGroup]:
+        groups: List[LoadGroup] = []
+        for key in self.shard_keys():
+            groups.extend(self._shard(key).list_all_groups())
+        return groups
+
+    def list_groups_by_shift(self, shift_id: Optional[str]) -> List[LoadGroup]:
+        shard = self._shard(_shard_key(shift_id))
+        return shard.list_groups_by_shift(shift_id) if shard else []
+
+    def delete_group(self, group_id: str) -> bool:
+        key, group = self._locate_group(group_id)
+        if group is None:
+            return False
+        deleted = self._shard(key).delete_group(group_id)
+        self._append_ids(key, [f"-G {group_id}"])
+        # Detach members stored in other shards as well.
+        for other_key in self._crossing_keys(group_id, key):
+            shard = self._shard(other_key)
+            for load in shard.list_loads_by_group(group_id):
+                load.group_id = None
+                shard.save_load(load)
+            self._append_ids(other_key, [f"-M {group_id}"])
+        return deleted
+
+    def list_loads_by_group(self, group_id: str) -> List[LoadRecord]:
+        group_key, _ = self._locate_group(group_id)
+        loads: List[LoadRecord] = []
+        if group_key is not None:
+            loads.extend(self._shard(group_key).list_loads_by_group(group_id))
+        for key in self._crossing_keys(group_id, group_key):
+            loads.extend(self._shard(key).list_loads_by_group(group_id))
+        return loads
+
+    def _crossing_keys(self, group_id: str, group_key: Optional[str]) -> List[str]:
+        """Other shards holding loads of the group, as far as they exist."""
+        self._refresh_ids()
+        return [key for key in self._indexed("M", group_id) if key != group_key]
+
+    def bulk_insert(
+        self, groups: Iterable[LoadGroup], loads: Iterable[LoadRecord]
+    ) -> None:
+        """One snapshot write per shard; cross-shard groups are synced after."""
+        buckets: Dict[str, Tuple[List[LoadGroup], List[LoadRecord]]] = {}
+        for group in groups:
+            buckets.setdefault(_shard_key(group.shift_id), ([], []))[0].append(group)
+        for load in loads:
+            buckets.setdefault(_shard_key(load.shift_id), ([], []))[1].append(load)
+
+        crossing = set()
+        for key, (shard_groups, shard_loads) in buckets.items():
+            shard = self._shard(key, create=True)
+            self._append_ids(
+                key,
+                [f"+G {group.id}" for group in shard_groups]
+                + [f"+L {load.id}" for load in shard_loads],
+            )
+            shard.bulk_insert(shard_groups, shard_loads)
+            local = {group.id for group in shard_groups}
+            crossing.update(
+                (load.group_id, key)
+                for load in shard_loads
+                if load.group_id and load.group_id not in local
+            )
+        for group_id, key in crossing:
+            self._sync_cross_shard_group(group_id, key)
+
+    def _sync_cross_shard_group(self, group_id: str, load_key: str):
+        # Same-shard groups are already synced inside the shard's commit.
+        group_key, _ = self._locate_group(group_id)
+        if group_key is not None and group_key != load_key:
+            if load_key not in self._indexed("M", group_id):
+                self._append_ids(load_key, [f"+M {group_id}"])
+            self._sync_group_status(group_id)
+
+    def _sync_group_status(self, group_id: str):
+        group_key, group = self._locate_group(group_id)
+        if group is None:
+            return
+
+        child_loads = self.list_loads_by_group(group_id)
+        if not child_loads:
+            return
+
+        all_complete = all(l.status == LoadStatus.COMPLETE for l in child_loads)
+        any_in_process = any(l.status == LoadStatus.IN_PROCESS for l in child_loads)
+
+        new_status = LoadStatus.PENDING
+        if all_complete:
+            new_status = LoadStatus.COMPLETE
+        elif any_in_process:
+            new_status = LoadStatus.IN_PROCESS
+
+        if group.status != new_status:
+            group.status = new_status
+            group.touch()
+            self._shard(group_key).save_group(group)
+
+    # --- Migration --------------------------------------------------------
+
+    def import_single_file(self, source_path: str) -> Dict[str, int]:
+        """
+        Split a single-file ``loads.json`` into per-shift shards.
+
+        Existing shards for the same shifts are overwritten. Returns the
+        number of loads written per shard key.
+        """
+        source = JsonRepository(source_path)
+        buckets: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for load in source.list_all():
+            bucket = buckets.setdefault(
+                _shard_key(load.shift_id), {"loads": [], "groups": []}
+            )
+            bucket["loads"].append(source._to_dict(load))
+        for group in source.list_all_groups():
+            bucket = buckets.setdefault(
+                _shard_key(group.shift_id), {"loads": [], "groups": []}
+            )
+            bucket["groups"].append(source._group_to_dict(group))
+
+        with self._lock:
+            for key, data in buckets.items():
+                shard = self._shard(key, create=True)
+                with shard._lock, file_lock(f"{shard.filepath}.lock"):
+                    shard._rebuild(data)
+                    shard._write_snapshot()
+                self._write_ids(key)
+
+        return {key: len(data["loads"]) for key, data in buckets.items()}
@@ -0,0 +1,558 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.application.interfaces import Repository
+from src.application.queries import LOAD_ORDER_SEQUENCE, LoadQuery
+from src.domain.models import (
+    LoadFormat,
+    LoadGroup,
+    LoadRecord,
+    LoadStatus,
+    ShiftTotals,
+    VerificationStatus,
+)
+
+LOAD_COLUMNS = (
+    "id",
+    "client_name",
+    "expected_qty",
+    "format",
+    "created_at",
+    "updated_at",
+    "status",
+    "load_order",
+    "loaded_qty",
+    "missing_qty",
+    "missing_refs",
+    "is_na",
+    "is_fnd",
+    "vehicle_id",
+    "group_id",
+    "shift_id",
+    "route_code",
+    "route_group_id",
+    "pallet_count",
+    "verification_status",
+)
+GROUP_COLUMNS = (
+    "id",
+    "vehicle_id",
+    "max_pallet_count",
+    "status",
+    "shift_id",
+    "created_at",
+    "updated_at",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS loads (
+    id TEXT PRIMARY KEY,
+    client_name TEXT NOT NULL,
+    expected_qty INTEGER NOT NULL,
+    format TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    load_order TEXT NOT NULL,
+    loaded_qty INTEGER NOT NULL DEFAULT 0,
+    missing_qty INTEGER NOT NULL DEFAULT 0,
+    missing_refs TEXT NOT NULL DEFAULT '[]',
+    is_na INTEGER NOT NULL DEFAULT 0,
+    is_fnd INTEGER NOT NULL DEFAULT 0,
+    vehicle_id TEXT,
+    group_id TEXT,
+    shift_id TEXT,
+    route_code TEXT,
+    route_group_id TEXT,
+    pallet_count INTEGER,
+    verification_status TEXT
+);
+CREATE INDEX IF NOT EXISTS loads_shift_status_format_route
+    ON loads (shift_id, status, format, route_code);
+CREATE INDEX IF NOT EXISTS loads_group ON loads (group_id);
+
+CREATE TABLE IF NOT EXISTS load_groups (
+    id TEXT PRIMARY KEY,
+    vehicle_id TEXT NOT NULL,
+    max_pallet_count INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    shift_id TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS load_groups_shift ON load_groups (shift_id);
+"""
+
+SHIFT_TOTALS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shift_totals (
+    shift_key TEXT PRIMARY KEY,
+    expected_small INTEGER NOT NULL DEFAULT 0,
+    loaded_small INTEGER NOT NULL DEFAULT 0,
+    expected_large INTEGER NOT NULL DEFAULT 0,
+    loaded_large INTEGER NOT NULL DEFAULT 0,
+    load_count INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _shift_totals_upsert(row: str, sign: str) -> str:
+    """Statement adding (sign '+') or removing ('-') one load's quantities."""
+
+    def qty(fmt: str, column: str) -> str:
+        return f"CASE WHEN {row}.format = '{fmt}' THEN {row}.{column} ELSE 0 END"
+
+    values = [
+        f"COALESCE({row}.shift_id, '')",
+        f"{sign}{qty('small', 'expected_qty')}",
+        f"{sign}{qty('small', 'loaded_qty')}",
+        f"{sign}{qty('large', 'expected_qty')}",
+        f"{sign}{qty('large', 'loaded_qty')}",
+        f"{sign}1",
+    ]
+    return (
+        "INSERT INTO shift_totals (shift_key, expected_small, loaded_small, "
+        f"expected_large, loaded_large, load_count) VALUES ({', '.join(values)}) "
+        "ON CONFLICT(shift_key) DO UPDATE SET "
+        "expected_small = expected_small + excluded.expected_small, "
+        "loaded_small = loaded_small + excluded.loaded_small, "
+        "expected_large = expected_large + excluded.expected_large, "
+        "loaded_large = loaded_large + excluded.loaded_large, "
+        "load_count = load_count + excluded.load_count;"
+    )
+
+
+# Shift totals follow every write to ``loads``, inside the same transaction.
+SHIFT_TOTALS_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS loads_totals_insert AFTER INSERT ON loads BEGIN
+    {_shift_totals_upsert("NEW", "+")}
+END;
+CREATE TRIGGER IF NOT EXISTS loads_totals_delete AFTER DELETE ON loads BEGIN
+    {_shift_totals_upsert("OLD", "-")}
+END;
+CREATE TRIGGER IF NOT EXISTS loads_totals_update
+AFTER UPDATE OF shift_id, format, expected_qty, loaded_qty ON loads BEGIN
+    {_shift_totals_upsert("OLD", "-")}
+    {_shift_totals_upsert("NEW", "+")}
+END;
+"""
+# change_counters scope holding a random id minted with the database.
+STORE_EPOCH = "store-epoch"
+CHANGE_COUNTERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS change_counters (
+    scope TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _bump_counters(row: str) -> str:
+    """Statements bumping the row's shift counter and the global one."""
+    return "".join(
+        f"INSERT INTO change_counters (scope, value) VALUES ({scope}, 1) "
+        "ON CONFLICT(scope) DO UPDATE SET value = value + 1; "
+        for scope in (f"COALESCE({row}.shift_id, '')", "'*'")
+    )
+
+
+def _change_counter_triggers(table: str) -> str:
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {table}_version_insert AFTER INSERT ON {table} BEGIN
+    {_bump_counters("NEW")}
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_version_update AFTER UPDATE ON {table} BEGIN
+    {_bump_counters("OLD")}
+    {_bump_counters("NEW")}
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_version_delete AFTER DELETE ON {table} BEGIN
+    {_bump_counters("OLD")}
+END;
+"""
+
+
+# Per-shift change counters, bumped by every write to loads and groups.
+CHANGE_COUNTER_TRIGGERS = _change_counter_triggers("loads") + _change_counter_triggers(
+    "load_groups"
+)
+REBUILD_SHIFT_TOTALS = """
+DELETE FROM shift_totals;
+INSERT INTO shift_totals
+SELECT COALESCE(shift_id, ''),
+       SUM(CASE WHEN format = 'small' THEN expected_qty ELSE 0 END),
+       SUM(CASE WHEN format = 'small' THEN loaded_qty ELSE 0 END),
+       SUM(CASE WHEN format = 'large' THEN expected_qty ELSE 0 END),
+       SUM(CASE WHEN format = 'large' THEN loaded_qty ELSE 0 END),
+       COUNT(*)
+FROM loads GROUP BY COALESCE(shift_id, '');
+"""
+
+
+def _upsert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    assignments = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "id")
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT(id) DO UPDATE SET {assignments}"
+    )
+
+
+# Statements are module constants so sqlite3's per-connection statement
+# cache prepares each of them once.
+UPSERT_LOAD = _upsert_sql("loads", LOAD_COLUMNS)
+UPSERT_GROUP = _upsert_sql("load_groups", GROUP_COLUMNS)
+SELECT_LOADS = f"SELECT {', '.join(LOAD_COLUMNS)} FROM loads"
+SELECT_GROUPS = f"SELECT {', '.join(GROUP_COLUMNS)} FROM load_groups"
+
+
+class SqliteRepository(Repository):
+    """
+    Repository on plain ``sqlite3`` for single-node deployments.
+
+    Runs in WAL mode (readers never block the writer) with one connection
+    per thread, and indexes the board's access paths:
+    (shift_id, status, format, route_code) and group_id.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        has_totals = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'shift_totals'"
+        ).fetchone()
+        conn.executescript(
+            SCHEMA
+            + SHIFT_TOTALS_SCHEMA
+            + SHIFT_TOTALS_TRIGGERS
+            + CHANGE_COUNTERS_SCHEMA
+            + CHANGE_COUNTER_TRIGGERS
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO change_counters (scope, value) VALUES (?, ?)",
+            (STORE_EPOCH, secrets.randbits(62)),
+        )
+        if not has_totals:
+            # Databases created before the totals table existed.
+            self.rebuild_shift_totals()
+
+    # --- Connection handling ----------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; writes open their own BEGIN IMMEDIATE.
+            conn = sqlite3.connect(self.filepath, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.pending_groups = set()
+        return conn
+
+    def transaction(self):
+        """One BEGIN IMMEDIATE ... COMMIT around the block; groups sync once."""
+        return self._write()
+
+    @contextmanager
+    def _write(self):
+        """Run a block in one write transaction (re-entrant per thread)."""
+        conn = self._conn()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield conn
+            # Group status is derived once, after every write in the block.
+            while self._local.pending_groups:
+                self._apply_group_status(self._local.pending_groups.pop())
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+            self._local.pending_groups.clear()
+
+    # --- Loads ------------------------------------------------------------
+
+    def get_load(self, load_id: str) -> Optional[LoadRecord]:
+        row = (
+            self._conn().execute(f"{SELECT_LOADS} WHERE id = ?", (load_id,)).fetchone()
+        )
+        return self._to_record(row) if row else None
+
+    def save_load(self, load: LoadRecord) -> None:
+        with self._write() as conn:
+            previous = conn.execute(
+                "SELECT group_id FROM loads WHERE id = ?", (load.id,)
+            ).fetchone()
+            conn.execute(UPSERT_LOAD, self._to_row(load))
+            for group_id in {previous[0] if previous else None, load.group_id}:
+                self._sync_group_status(group_id)
+
+    def delete_load(self, load_id: str) -> bool:
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT group_id FROM loads WHERE id = ?", (load_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM loads WHERE id = ?", (load_id,))
+            self._sync_group_status(row[0])
+            return True
+
+    def list_all(self) -> List[LoadRecord]:
+        rows = self._conn().execute(f"{SELECT_LOADS} ORDER BY rowid")
+        return [self._to_record(row) for row in rows]
+
+    def list_loads_by_shift(self, shift_id: Optional[str]) -> List[LoadRecord]:
+        rows = self._conn().execute(
+            f"{SELECT_LOADS} WHERE shift_id IS ? ORDER BY rowid", (shift_id,)
+        )
+        return [self._to_record(row) for row in rows]
+
+    def list_active_loads_by_group(
+        self, format_type: str, route_prefix: str, shift_id: Optional[str] = None
+    ) -> List[LoadRecord]:
+        sql = f"{SELECT_LOADS} WHERE shift_id IS ? AND status != ? AND format = ?"
+        params: List[Any] = [
+            shift_id,
+            LoadStatus.COMPLETE.value,
+            getattr(format_type, "value", format_type),
+        ]
+        if route_prefix:
+            # Range scan instead of LIKE so the composite index is usable.
+            upper = route_prefix[:-1] + chr(ord(route_prefix[-1]) + 1)
+            sql += " AND route_code >= ? AND route_code < ?"
+            params.extend([route_prefix, upper])
+        else:
+            sql += " AND route_code IS NOT NULL"
+        rows = self._conn().execute(sql + " ORDER BY rowid", params)
+        return [self._to_record(row) for row in rows]
+
+    def query_loads(self, query: LoadQuery) -> Tuple[List[LoadRecord], Optional[str]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("shift_id", query.shift_id),
+            ("status", query.status),
+            ("format", query.format),
+            ("group_id", query.group_id),
+            ("vehicle_id", query.vehicle_id),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if query.route_prefix:
+            upper = query.route_prefix[:-1] + chr(ord(query.route_prefix[-1]) + 1)
+            clauses.append("route_code >= ? AND route_code < ?")
+            params.extend([query.route_prefix, upper])
+
+        if query.order_field == "load_order":
+            whens = " ".join(
+                f"WHEN '{code}' THEN {rank}"
+                for rank, code in enumerate(LOAD_ORDER_SEQUENCE)
+            )
+            sort = f"(CASE load_order {whens} ELSE {len(LOAD_ORDER_SEQUENCE)} END)"
+        else:
+            sort = query.order_field
+        if query.after_key is not None:
+            op = "<" if query.descending else ">"
+            clauses.append(f"({sort}, id) {op} (?, ?)")
+            params.extend(query.after_key)
+
+        sql = SELECT_LOADS
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        direction = "DESC" if query.descending else "ASC"
+        sql += f" ORDER BY {sort} {direction}, id {direction}"
+        if query.limit is not None:
+            sql += " LIMIT ?"
+            params.append(query.limit + 1)
+        rows = self._conn().execute(sql, params)
+        return query.page([self._to_record(row) for row in rows])
+
+    def get_data_version(self, shift_id: Optional[str] = None) -> Optional[int]:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT value FROM change_counters WHERE scope = ?",
+                ("*" if shift_id is None else shift_id,),
+            )
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def get_store_id(self) -> Optional[str]:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT value FROM change_counters WHERE scope = ?", (STORE_EPOCH,)
+            )
+            .fetchone()
+        )
+        return format(row[0], "x") if row else None
+
+    def get_shift_totals(self, shift_id: str) -> Optional[ShiftTotals]:
+        row = (
+            self._conn()
+            .execute(
+                "SELECT expected_small, loaded_small, expected_large, loaded_large, "
+                "load_count FROM shift_totals WHERE shift_key = ?",
+                (shift_id or "",),
+            )
+            .fetchone()
+        )
+        return ShiftTotals(*row) if row else ShiftTotals()
+
+    def rebuild_shift_totals(self) -> None:
+        with self._write() as conn:
+            for statement in REBUILD_SHIFT_TOTALS.strip().split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    # --- Groups -----------------------------------------------------------
+
+    def get_group(self, group_id: str) -> Optional[LoadGroup]:
+        row = (
+            self._conn()
+            .execute(f"{SELECT_GROUPS} WHERE id = ?", (group_id,))
+            .fetchone()
+        )
+        return self._group_to_record(row) if row else None
+
+    def save_group(self, group: LoadGroup) -> None:
+        with self._write() as conn:
+            conn.execute(UPSERT_GROUP, self._group_to_row(group))
+
+    def list_all_groups(self) -> List[LoadGroup]:
+        rows = self._conn().execute(f"{SELECT_GROUPS} ORDER BY rowid")
+        return [self._group_to_record(row) for row in rows]
+
+    def list_groups_by_shift(self, shift_id: Optional[str]) -> List[LoadGroup]:
+        rows = self._conn().execute(
+            f"{SELECT_GROUPS} WHERE shift_id IS ? ORDER BY rowid", (shift_id,)
+        )
+        return [self._group_to_record(row) for row in rows]
+
+    def delete_group(self, group_id: str) -> bool:
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE loads SET group_id = NULL WHERE group_id = ?", (group_id,)
+            )
+            deleted = conn.execute("DELETE FROM load_groups WHERE id = ?", (group_id,))
+            return deleted.rowcount > 0
+
+    def list_loads_by_group(self, group_id: str) -> List[LoadRecord]:
+        rows = self._conn().execute(
+            f"{SELECT_LOADS} WHERE group_id = ? ORDER BY rowid", (group_id,)
+        )
+        return [self._to_record(row) for row in rows]
+
+    def _sync_group_status(self, group_id: Optional[str]):
+        if not group_id:
+            return
+        with self._write():
+            self._local.pending_groups.add(group_id)
+
+    def _apply_group_status(self, group_id: str):
+        conn = self._conn()
+        group = conn.execute(
+            "SELECT status FROM load_groups WHERE id = ?", (group_id,)
+        ).fetchone()
+        if group is None:
+            return
+
+        statuses = [
+            row[0]
+            for row in conn.execute(
+                "SELECT status FROM loads WHERE group_id = ?", (group_id,)
+            )
+        ]
+        if not statuses:
+            return
+
+        if all(s == LoadStatus.COMPLETE.value for s in statuses):
+            new_status = LoadStatus.COMPLETE
+        elif any(s == LoadStatus.IN_PROCESS.value for s in statuses):
+            new_status = LoadStatus.IN_PROCESS
+        else:
+            new_status = LoadStatus.PENDING
+
+        if group[0] != new_status.value:
+            updated = self.get_group(group_id)
+            updated.status = new_status
+            updated.touch()
+            conn.execute(UPSERT_GROUP, self._group_to_row(updated))
+
+    # --- Row mapping ------------------------------------------------------
+
+    @staticmethod
+    def _enum_value(value):
+        return value.value if hasattr(value, "value") else value
+
+    def _to_row(self, load: LoadRecord) -> Tuple[Any, ...]:
+        return (
+            load.id,
+            load.client_name,
+            load.expected_qty,
+            self._enum_value(load.format),
+            load.created_at,
+            load.updated_at,
+            self._enum_value(load.status),
+            load.load_order,
+            load.loaded_qty,
+            load.missing_qty,
+            json.dumps(load.missing_refs or []),
+            int(bool(load.is_na)),
+            int(bool(load.is_fnd)),
+            load.vehicle_id,
+            load.group_id,
+            load.shift_id,
+            load.route_code,
+            load.route_group_id,
+            load.pallet_count,
+            self._enum_value(load.verification_status),
+        )
+
+    def _to_record(self, row: Tuple[Any, ...]) -> LoadRecord:
+        d: Dict[str, Any] = dict(zip(LOAD_COLUMNS, row))
+        d["format"] = LoadFormat(d["format"])
+        d["status"] = LoadStatus(d["status"])
+        d["missing_refs"] = json.loads(d["missing_refs"] or "[]")
+        d["is_na"] = bool(d["is_na"])
+        d["is_fnd"] = bool(d["is_fnd"])
+        if d["verification_status"]:
+            d["verification_status"] = VerificationStatus(d["verification_status"])
+        return LoadRecord(**d)
+
+    def _group_to_row(self, group: LoadGroup) -> Tuple[Any, ...]:
+        return (
+            group.id,
+            group.vehicle_id,
+            group.max_pallet_count,
+            self._enum_value(group.status),
+            group.shift_id,
+            group.created_at,
+            group.updated_at,
+        )
+
+    def _group_to_record(self, row: Tuple[Any, ...]) -> LoadGroup:
+        d: Dict[str, Any] = dict(zip(GROUP_COLUMNS, row))
+        d["status"] = LoadStatus(d["status"])
+        return LoadGroup(**d)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WarehouseUiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.warehouse_ui"
+
+    def ready(self):
+        # Hooks query timing into every connection opened from here on.
+        from src.warehouse_ui import instrumentation  # noqa: F401
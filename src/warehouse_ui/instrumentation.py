@@ -0,0 +1,212 @@
+"""
+Per-request timings: wall time, database queries, repository calls and
+JSON encoding, collected into a context variable so they follow the
+request into worker threads (sync_to_async and asyncio.to_thread copy it).
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import random
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Callable
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+from src.warehouse_ui import metrics
+
+logger = logging.getLogger(__name__)
+
+_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+@dataclass
+class RequestTimings:
+    db_count: int = 0
+    db_ms: float = 0.0
+    repo_count: int = 0
+    repo_ms: float = 0.0
+    serialize_ms: float = 0.0
+    total_ms: float = 0.0
+
+    def add(self, kind: str, started: float):
+        elapsed = (perf_counter() - started) * 1000
+        setattr(self, f"{kind}_ms", getattr(self, f"{kind}_ms") + elapsed)
+        if kind != "serialize":
+            setattr(self, f"{kind}_count", getattr(self, f"{kind}_count") + 1)
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db_ms:.1f};desc="{self.db_count} queries"',
+                f'repo;dur={self.repo_ms:.1f};desc="{self.repo_count} calls"',
+                f"serialize;dur={self.serialize_ms:.1f}",
+                f"total;dur={self.total_ms:.1f}",
+            ]
+        )
+
+
+@contextmanager
+def timed(kind: str):
+    """Add the block's duration to the current request, if it is sampled."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(kind, started)
+
+
+def _time_query(execute, sql, params, many, context):
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+def _install_query_timer(sender, connection, **kwargs):
+    connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(_install_query_timer)
+
+
+class _TimedProxy:
+    """
+    Wraps every public method of ``target`` and passes each call to
+    ``record(name, started, failed)`` once it returns or raises.
+    """
+
+    def __init__(self, target, record: Callable[[str, float, bool], None]):
+        self._target = target
+        self._record = record
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        if iscoroutinefunction(attr):
+
+            @functools.wraps(attr)
+            async def timed_call(*args, **kwargs):
+                started, failed = perf_counter(), True
+                try:
+                    result = await attr(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._record(name, started, failed)
+
+        else:
+
+            @functools.wraps(attr)
+            def timed_call(*args, **kwargs):
+                started, failed = perf_counter(), True
+                try:
+                    result = attr(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._record(name, started, failed)
+
+        return timed_call
+
+
+class InstrumentedRepository(_TimedProxy):
+    """
+    Times every public call on the wrapped repository into the current
+    request and the repository metrics. Calls the repository makes on
+    itself are not proxied, so each counts once.
+    """
+
+    def __init__(self, repository):
+        super().__init__(repository, self._observe)
+        self._backend = type(repository).__name__
+
+    def _observe(self, name: str, started: float, failed: bool):
+        timings = _timings.get()
+        if timings is not None:
+            timings.add("repo", started)
+        metrics.observe_repository(self._backend, name, perf_counter() - started)
+
+
+class InstrumentedService(_TimedProxy):
+    """Reports every LoadService command to the command metrics."""
+
+    def __init__(self, service):
+        super().__init__(service, self._observe)
+
+    def _observe(self, name: str, started: float, failed: bool):
+        outcome = "error" if failed else "ok"
+        metrics.observe_command(name, outcome, perf_counter() - started)
+
+
+class RequestTimingMiddleware:
+    """
+    For a REQUEST_TIMING_SAMPLE_RATE share of requests, report the timings
+    in a ``Server-Timing`` header and one JSON log line.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._report(request, response, timings, started)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._report(request, response, timings, started)
+
+    @staticmethod
+    def _sampled() -> bool:
+        rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    @staticmethod
+    def _report(request, response, timings, started):
+        # Streams are timed up to their first byte.
+        timings.total_ms = (perf_counter() - started) * 1000
+        response["Server-Timing"] = timings.server_timing()
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            **{k: round(v, 2) for k, v in asdict(timings).items()},
+        }
+        logger.info(json.dumps(record))
+        return response
@@ -0,0 +1,305 @@
+import os
+import random
+from bisect import bisect
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from django.utils import timezone
+
+from src.domain.models import (
+    LoadFormat,
+    LoadGroup,
+    LoadRecord,
+    LoadStatus,
+    VerificationStatus,
+)
+from src.infrastructure.json_repository import JsonRepository
+from src.infrastructure.orm_repository import OrmRepository
+from src.warehouse_ui.models import Shift, ShiftStatusChoices
+
+SHIFT_HOURS = 12
+CLIENTS = (
+    "Walgreens",
+    "CVS Pharmacy",
+    "Walmart",
+    "Sam's Club",
+    "Costco",
+    "Econo",
+    "Pueblo",
+    "Amigo",
+    "Selectos",
+    "Mr. Special",
+    "Supermax",
+    "Farmacias Caridad",
+    "Kmart",
+    "Walgreens DC",
+)
+LOAD_ORDERS = ("F", "MF", "M", "MP", "P")
+# Small-format route families and their share of small loads.
+FAMILIES = (("26", 0.4), ("28", 0.35), ("23", 0.25))
+ROUTES_PER_FAMILY = 40
+G23_ROUTE_GROUPS = ("WAG-A", "WAG-B", "WAG-C", "WAG-D")
+SMALL_SHARE = 0.7
+LOADS_PER_VEHICLE = (3, 10)
+# Status mix of loads still on the open shift's board.
+OPEN_STATUSES = (
+    (LoadStatus.PENDING, 0.45),
+    (LoadStatus.IN_PROCESS, 0.3),
+    (LoadStatus.COMPLETE, 0.2),
+    (LoadStatus.HOLD, 0.05),
+)
+
+
+class _Generator:
+    """
+    Seeded source of shifts, groups and loads. Every id and timestamp
+    comes from the seed and ``until``, so two runs build the same data.
+
+    Loads respect the route rules LoadService enforces on create: in the
+    open shift only one g26 and one g28 route is active at a time, and
+    active g23 loads share one route_group_id. Closed shifts are complete.
+    """
+
+    def __init__(self, seed: int, until: datetime):
+        self.rng = random.Random(seed)
+        self.until = until
+
+    # random.randint/choice/choices are several times slower than one
+    # random() call, which adds up over a million loads.
+
+    def randint(self, low: int, high: int) -> int:
+        return low + int(self.rng.random() * (high - low + 1))
+
+    def choice(self, values):
+        return values[int(self.rng.random() * len(values))]
+
+    def weighted(self, values, cumulative):
+        return values[bisect(cumulative, self.rng.random() * cumulative[-1])]
+
+    def uuid(self) -> str:
+        h = f"{self.rng.getrandbits(128):032x}"
+        variant = "89ab"[int(h[16], 16) & 3]
+        return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}"
+
+    def shifts(self, count: int):
+        return [
+            Shift(
+                id=self.uuid(),
+                start_at=self.until - timedelta(hours=SHIFT_HOURS * (i + 1)),
+                end_at=(
+                    None if i == 0 else self.until - timedelta(hours=SHIFT_HOURS * i)
+                ),
+                status=ShiftStatusChoices.OPEN if i == 0 else ShiftStatusChoices.CLOSED,
+            )
+            for i in range(count)
+        ]
+
+    def vehicle_groups(self, shift: Shift, count: int):
+        """Return the shift's groups, each with how many large loads it gets."""
+        start = shift.start_at.replace(tzinfo=None).isoformat()
+        groups = []
+        remaining = round(count * (1 - SMALL_SHARE))
+        while remaining > 0:
+            size = min(remaining, self.randint(*LOADS_PER_VEHICLE))
+            group = LoadGroup(
+                vehicle_id=str(self.randint(100, 99999)),
+                max_pallet_count=self.choice((12, 18, 26)),
+                id=self.uuid(),
+                shift_id=str(shift.id),
+                created_at=start,
+                updated_at=start,
+            )
+            groups.append((group, size))
+            remaining -= size
+        return groups
+
+    def loads(self, shift: Shift, count: int, groups):
+        """Yield the shift's loads: ``groups``' large loads, then small ones."""
+        rng = self.rng
+        is_open = shift.status == ShiftStatusChoices.OPEN
+        shift_id = str(shift.id)
+        start = shift.start_at.replace(tzinfo=None)
+        statuses = [status for status, _ in OPEN_STATUSES]
+        status_weights = list(accumulate(weight for _, weight in OPEN_STATUSES))
+
+        def status():
+            if not is_open:
+                return LoadStatus.COMPLETE
+            return self.weighted(statuses, status_weights)
+
+        large_count = 0
+        for group, size in groups:
+            large_count += size
+            for _ in range(size):
+                load_status = status()
+                expected = self.randint(20, 400)
+                yield self._load(
+                    start,
+                    load_status,
+                    expected,
+                    LoadFormat.LARGE,
+                    shift_id=shift_id,
+                    group_id=group.id,
+                    vehicle_id=group.vehicle_id,
+                    pallet_count=max(1, expected // 30),
+                    verification_status=(
+                        VerificationStatus.VERIFIED
+                        if load_status == LoadStatus.COMPLETE or rng.random() < 0.3
+                        else VerificationStatus.UNVERIFIED
+                    ),
+                )
+
+        current = {
+            "26": f"26{self.randint(1, ROUTES_PER_FAMILY):02d}",
+            "28": f"28{self.randint(1, ROUTES_PER_FAMILY):02d}",
+            "23": self.choice(G23_ROUTE_GROUPS),
+        }
+        families = [family for family, _ in FAMILIES]
+        family_weights = list(accumulate(weight for _, weight in FAMILIES))
+        for _ in range(count - large_count):
+            family = self.weighted(families, family_weights)
+            route = f"{family}{self.randint(1, ROUTES_PER_FAMILY):02d}"
+            route_group_id = self.choice(G23_ROUTE_GROUPS) if family == "23" else None
+            load_status = status()
+            # Only the family's current route (g26/g28) or route group (g23)
+            # may have loads that are not complete.
+            if (route_group_id if family == "23" else route) != current[family]:
+                load_status = LoadStatus.COMPLETE
+            yield self._load(
+                start,
+                load_status,
+                self.randint(1, 80),
+                LoadFormat.SMALL,
+                shift_id=shift_id,
+                route_code=route,
+                route_group_id=route_group_id,
+                vehicle_id=str(self.randint(100, 99999)),
+            )
+
+    def _load(self, start, status, expected, load_format, **fields):
+        rng = self.rng
+        missing = 0
+        refs = []
+        if status == LoadStatus.COMPLETE:
+            if rng.random() < 0.08:
+                missing = self.randint(1, min(3, expected))
+                refs = [f"{missing}x {self.randint(1000, 9999)}"]
+            loaded = expected - missing
+        elif status in (LoadStatus.IN_PROCESS, LoadStatus.HOLD):
+            loaded = self.randint(0, max(0, expected - 1))
+        else:
+            loaded = 0
+        created = (
+            start + timedelta(seconds=self.randint(0, SHIFT_HOURS * 3600 - 1))
+        ).isoformat()
+        return LoadRecord(
+            client_name=f"{self.choice(CLIENTS)} #{self.randint(1, 250)}",
+            expected_qty=expected,
+            format=load_format,
+            id=self.uuid(),
+            created_at=created,
+            updated_at=created,
+            status=status,
+            load_order=self.choice(LOAD_ORDERS),
+            loaded_qty=loaded,
+            missing_qty=missing,
+            missing_refs=refs,
+            is_na=rng.random() < 0.02,
+            is_fnd=rng.random() < 0.02,
+            **fields,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate seeded, realistic shifts, vehicle groups and loads (g23/g26/g28 "
+        "small routes, large loads with pallets) and bulk insert them into a "
+        "repository backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--shifts", type=int, default=30)
+        parser.add_argument(
+            "--loads", type=int, default=10_000, help="Total loads, spread evenly."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--until",
+            help="End of the newest (open) shift, YYYY-MM-DD; defaults to "
+            "today. Keep it fixed to reproduce a dataset exactly.",
+        )
+        parser.add_argument(
+            "--backend",
+            choices=("configured", "json", "orm"),
+            default="configured",
+            help="'configured' writes wherever the app reads (REPOSITORY_BACKEND).",
+        )
+        parser.add_argument(
+            "--json-path",
+            default=os.path.join("data", "loads.json"),
+            help="Store used by --backend json.",
+        )
+
+    def handle(self, *args, **options):
+        if options["shifts"] < 1 or options["loads"] < 0:
+            raise CommandError("--shifts must be at least 1 and --loads positive")
+        until = timezone.make_aware(
+            datetime.combine(
+                (
+                    datetime.fromisoformat(options["until"]).date()
+                    if options["until"]
+                    else timezone.localdate()
+                ),
+                time(),
+            )
+        )
+        repo = self._repository(options)
+        generator = _Generator(options["seed"], until)
+
+        started = perf_counter()
+        shifts = generator.shifts(options["shifts"])
+        try:
+            Shift.objects.bulk_create(shifts)
+        except IntegrityError:
+            raise CommandError(
+                "These shifts already exist; pick another --seed or --until."
+            )
+
+        per_shift, extra = divmod(options["loads"], len(shifts))
+        counts = [per_shift + (1 if i < extra else 0) for i in range(len(shifts))]
+        plans = [
+            generator.vehicle_groups(shift, count)
+            for shift, count in zip(shifts, counts)
+        ]
+        groups = [group for plan in plans for group, _ in plan]
+        loads = (
+            load
+            for shift, count, plan in zip(shifts, counts, plans)
+            for load in generator.loads(shift, count, plan)
+        )
+
+        repo.bulk_insert(groups, loads)
+        elapsed = perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {len(shifts)} shifts, {len(groups)} groups and "
+                f"{options['loads']} loads to {options['backend']} repository "
+                f"in {elapsed:.1f}s."
+            )
+        )
+
+    @staticmethod
+    def _repository(options):
+        if options["backend"] == "json":
+            return JsonRepository(
+                options["json_path"], journal=settings.JSON_REPOSITORY_JOURNAL
+            )
+        if options["backend"] == "orm":
+            return OrmRepository()
+        from src.warehouse_ui.views import repo
+
+        return repo
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from src.warehouse_ui.views import repo
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-shift expected/loaded totals from the loads stored "
+        "by the configured repository backend."
+    )
+
+    def handle(self, *args, **options):
+        repo.rebuild_shift_totals()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt shift totals ({type(repo).__name__}).")
+        )
@@ -0,0 +1,99 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from src.application.services import LoadService
+from src.infrastructure.json_repository import JsonRepository
+from src.infrastructure.orm_repository import OrmRepository
+from src.warehouse_ui import traffic, views
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a capture written by TrafficRecorderMiddleware against a fresh "
+        "JsonRepository or OrmRepository deployment in this process, on a "
+        "throwaway test database, and report throughput and latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("capture", help="NDJSON file from TRAFFIC_CAPTURE_PATH.")
+        parser.add_argument("--backend", choices=("json", "orm"), default="json")
+        parser.add_argument(
+            "--speedup",
+            type=float,
+            default=0,
+            help="Replay the recorded pacing this many times faster; 0 sends "
+            "requests back to back.",
+        )
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--output", help="Also write the report here as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            entries = traffic.read_capture(options["capture"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {options['capture']}: {exc}")
+        if not entries:
+            raise CommandError(f"{options['capture']} holds no requests")
+
+        with tempfile.TemporaryDirectory() as workdir:
+            report = self._replay(entries, options, Path(workdir))
+
+        self.stdout.write(
+            f"{report['requests']} requests in {report['seconds']}s "
+            f"({report['throughput_rps']} req/s, {options['backend']} backend)"
+        )
+        self.stdout.write(
+            f"{'endpoint':<32} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}  statuses"
+        )
+        for name, row in report["endpoints"].items():
+            statuses = ", ".join(f"{k}: {v}" for k, v in row["statuses"].items())
+            self.stdout.write(
+                f"{name:<32} {row['count']:>6} {row['p50_ms']:>8} "
+                f"{row['p95_ms']:>8} {row['p99_ms']:>8}  {statuses}"
+            )
+            for message, count in row["errors"].items():
+                self.stdout.write(f"    {count} x {message}")
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=2))
+
+    def _replay(self, entries, options, workdir):
+        if connection.vendor == "sqlite":
+            # A file rather than shared-cache memory, so concurrent workers
+            # wait on the busy timeout instead of failing on table locks.
+            connection.settings_dict["TEST"]["NAME"] = str(workdir / "replay.sqlite3")
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0)
+
+        if options["backend"] == "orm":
+            repo = OrmRepository()
+        else:
+            repo = JsonRepository(str(workdir / "loads.json"))
+        saved = views.repo, views.service, views.REPOSITORY_NAME
+        views.repo, views.service = repo, LoadService(repo)
+        views.REPOSITORY_NAME = type(repo).__name__
+        try:
+            # Fresh versions restart at 0, so keep board cache entries
+            # private to this run; and do not record the replay itself.
+            with override_settings(
+                TRAFFIC_CAPTURE_PATH="",
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+                    },
+                    "board": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "LOCATION": "replay",
+                    },
+                },
+            ):
+                return traffic.replay(
+                    entries, options["speedup"], options["concurrency"]
+                )
+        finally:
+            views.repo, views.service, views.REPOSITORY_NAME = saved
+            connection.creation.destroy_test_db(old_name, verbosity=0)
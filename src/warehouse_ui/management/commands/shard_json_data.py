@@ -0,0 +1,43 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from src.infrastructure.sharded_json_repository import ShardedJsonRepository
+
+
+class Command(BaseCommand):
+    help = (
+        "Split the single-file JSON store (data/loads.json) into per-shift "
+        "shards under data/shifts/. Set JSON_REPOSITORY_LAYOUT=sharded afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source",
+            default=os.path.join("data", "loads.json"),
+            help="Single-file JSON store to read.",
+        )
+        parser.add_argument(
+            "--target",
+            default=os.path.join("data", "shifts"),
+            help="Directory that receives the shard files and manifest.",
+        )
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        if not os.path.exists(source):
+            raise CommandError(f"Could not find {source}")
+
+        repo = ShardedJsonRepository(
+            options["target"], journal=settings.JSON_REPOSITORY_JOURNAL
+        )
+        counts = repo.import_single_file(source)
+        for key, count in sorted(counts.items()):
+            self.stdout.write(f"{key}: {count} loads")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {len(counts)} shards to {options['target']}; "
+                "set JSON_REPOSITORY_LAYOUT=sharded to use them."
+            )
+        )
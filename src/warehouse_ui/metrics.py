@@ -0,0 +1,76 @@
+"""
+Prometheus metrics for views, repository operations, LoadService commands
+and domain errors. prometheus_client is optional: without it every hook
+is a no-op and /metrics answers 501.
+
+Under gunicorn, config/gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR
+before the workers start, so each worker writes its samples to files
+there and /metrics sums them across workers.
+"""
+
+import os
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        "warehouse_http_request_duration_seconds",
+        "Time spent serving a request, by view.",
+        ["view", "method", "status"],
+    )
+    REPOSITORY_LATENCY = prometheus_client.Histogram(
+        "warehouse_repository_operation_duration_seconds",
+        "Time spent in one Repository call, by backend.",
+        ["backend", "operation"],
+    )
+    COMMAND_LATENCY = prometheus_client.Histogram(
+        "warehouse_service_command_duration_seconds",
+        "Time spent in one LoadService command.",
+        ["command", "outcome"],
+    )
+    DOMAIN_ERRORS = prometheus_client.Counter(
+        "warehouse_domain_errors_total",
+        "Domain rule violations reported to clients, by error code.",
+        ["code"],
+    )
+
+
+def enabled() -> bool:
+    return prometheus_client is not None
+
+
+def observe_request(view: str, method: str, status: int, seconds: float):
+    if prometheus_client is not None:
+        REQUEST_LATENCY.labels(view, method, str(status)).observe(seconds)
+
+
+def observe_repository(backend: str, operation: str, seconds: float):
+    if prometheus_client is not None:
+        REPOSITORY_LATENCY.labels(backend, operation).observe(seconds)
+
+
+def observe_command(command: str, outcome: str, seconds: float):
+    if prometheus_client is not None:
+        COMMAND_LATENCY.labels(command, outcome).observe(seconds)
+
+
+def count_domain_error(code: str):
+    if prometheus_client is not None:
+        DOMAIN_ERRORS.labels(code).inc()
+
+
+def render():
+    """Return the exposition body and its content type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return (
+        prometheus_client.generate_latest(registry),
+        prometheus_client.CONTENT_TYPE_LATEST,
+    )
@@ -0,0 +1,131 @@
+from inspect import iscoroutinefunction
+from time import perf_counter
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+from src.application.events import board_changes
+from src.warehouse_ui import metrics
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Middle of brotli's range: most of the size win at a fraction of the
+# CPU of the default (11), which matters when compressing per request.
+BROTLI_QUALITY = 5
+
+
+class BoardChangeMiddleware(MiddlewareMixin):
+    """
+    Wake this worker's board streams once an API write has returned, i.e.
+    after the view committed it. Streams in other workers are woken by
+    their worker's shared poll of the change counters.
+    """
+
+    def process_response(self, request, response):
+        if (
+            request.method in WRITE_METHODS
+            and request.path.startswith("/api/")
+            and response.status_code < 400
+        ):
+            board_changes.notify()
+        return response
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli (when installed) or gzip for API responses of at least
+    API_COMPRESS_MIN_BYTES, whichever the client accepts. Streams and
+    responses that are already encoded pass through untouched.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or not request.path.startswith("/api/")
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.API_COMPRESS_MIN_BYTES
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accepted = _accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+            compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        elif "gzip" in accepted:
+            encoding = "gzip"
+            compressed = compress_string(response.content)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # Same rule as GZipMiddleware: the bytes differ, so the ETag is weak.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class MetricsMiddleware:
+    """Request latency per view (URL name), method and status code."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    @staticmethod
+    def _observe(request, response, started):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unmatched"
+        metrics.observe_request(
+            view, request.method, response.status_code, perf_counter() - started
+        )
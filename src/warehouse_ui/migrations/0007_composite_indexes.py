@@ -0,0 +1,50 @@
+# Generated by Django 6.1.2 on 2026-10-17 00:21
+
+from django.db import migrations, models
+
+PATTERN_INDEX = "load_shift_fmt_route_status_like"
+
+
+def create_pattern_ops_index(apps, schema_editor):
+    # route_code LIKE 'xx%' can only use a btree index under a non-C
+    # collation when the column uses varchar_pattern_ops (PostgreSQL only).
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {PATTERN_INDEX} ON warehouse_ui_load "
+        "(shift_id, format, route_code varchar_pattern_ops, status)"
+    )
+
+
+def drop_pattern_ops_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {PATTERN_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0006_load_shift_loadgroup_shift"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="load",
+            index=models.Index(
+                fields=["shift", "format", "route_code", "status"],
+                name="load_shift_fmt_route_status",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="load",
+            index=models.Index(fields=["group", "status"], name="load_group_status"),
+        ),
+        migrations.AddIndex(
+            model_name="shift",
+            index=models.Index(
+                fields=["status", "start_at"], name="shift_status_start_at"
+            ),
+        ),
+        migrations.RunPython(create_pattern_ops_index, drop_pattern_ops_index),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0008_changecounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("load", "Load"), ("group", "Group")], max_length=8
+                    ),
+                ),
+                ("record_id", models.CharField(max_length=64)),
+                ("shift_id", models.CharField(blank=True, max_length=64, null=True)),
+                ("change_seq", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "warehouse_ui_tombstone",
+            },
+        ),
+        migrations.AddField(
+            model_name="load",
+            name="change_seq",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="loadgroup",
+            name="change_seq",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="load",
+            index=models.Index(
+                fields=["shift", "change_seq"], name="load_shift_change_seq"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="loadgroup",
+            index=models.Index(
+                fields=["shift", "change_seq"], name="group_shift_change_seq"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["kind", "change_seq"], name="tombstone_kind_seq"
+            ),
+        ),
+    ]
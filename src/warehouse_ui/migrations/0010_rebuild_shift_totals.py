@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0009_change_seq_tombstone"),
+    ]
+
+    # This used to overwrite the manually entered totals of every shift with
+    # loads by their load sums. Those sums have their own columns since 0013,
+    # so it no longer touches any data.
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:50
+
+import secrets
+
+from django.db import migrations
+
+STORE_EPOCH = "store-epoch"
+
+
+def mint_store_epoch(apps, schema_editor):
+    # A random id per database: ETags and board cache keys carry it, so a
+    # recreated database never matches entries cached for the old one.
+    ChangeCounter = apps.get_model("warehouse_ui", "ChangeCounter")
+    ChangeCounter.objects.get_or_create(
+        scope=STORE_EPOCH, defaults={"value": secrets.randbits(62)}
+    )
+
+
+def drop_store_epoch(apps, schema_editor):
+    ChangeCounter = apps.get_model("warehouse_ui", "ChangeCounter")
+    ChangeCounter.objects.filter(scope=STORE_EPOCH).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0010_rebuild_shift_totals"),
+    ]
+
+    operations = [
+        migrations.RunPython(mint_store_epoch, drop_store_epoch),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-17 02:05
+
+from django.db import migrations
+
+ROUTE_INDEX = "load_shift_fmt_route_status"
+
+
+def drop_plain_route_index(apps, schema_editor):
+    # On PostgreSQL the varchar_pattern_ops copy from 0007 serves the same
+    # equality lookups plus route_code LIKE 'xx%'; the plain one only costs
+    # writes. Other vendors keep it; 0014 takes it out of the model state.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {ROUTE_INDEX}")
+
+
+def create_plain_route_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {ROUTE_INDEX} ON warehouse_ui_load "
+        "(shift_id, format, route_code, status)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0011_store_epoch"),
+    ]
+
+    operations = [
+        # Group lookups filter on group_id alone, which the foreign key's
+        # own index already covers; the plans were the same without it.
+        migrations.RemoveIndex(model_name="load", name="load_group_status"),
+        migrations.RunPython(drop_plain_route_index, create_plain_route_index),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.1 on 2026-10-17 02:40
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+TOTAL_FORMATS = ("small", "large")
+
+
+def fill_load_totals(apps, schema_editor):
+    # Same sums as OrmRepository.rebuild_shift_totals, into the new columns;
+    # the manually entered expected_*/loaded_* figures are left alone.
+    Load = apps.get_model("warehouse_ui", "Load")
+    Shift = apps.get_model("warehouse_ui", "Shift")
+    totals = {}
+    rows = (
+        Load.objects.filter(shift__isnull=False)
+        .values("shift_id", "format")
+        .annotate(
+            count=Count("id"), expected=Sum("expected_qty"), loaded=Sum("loaded_qty")
+        )
+    )
+    for row in rows:
+        shift_totals = totals.setdefault(row["shift_id"], {"load_count": 0})
+        shift_totals["load_count"] += row["count"]
+        if row["format"] in TOTAL_FORMATS:
+            shift_totals[f"loads_expected_{row['format']}"] = row["expected"] or 0
+            shift_totals[f"loads_loaded_{row['format']}"] = row["loaded"] or 0
+    for shift_id, values in totals.items():
+        Shift.objects.filter(id=shift_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0012_route_index_per_vendor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="shift",
+            name="load_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="shift",
+            name="loads_expected_large",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="shift",
+            name="loads_expected_small",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="shift",
+            name="loads_loaded_large",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="shift",
+            name="loads_loaded_small",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_load_totals, migrations.RunPython.noop),
+    ]
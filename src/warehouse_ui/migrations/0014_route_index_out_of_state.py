@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-17 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse_ui", "0013_shift_load_totals"),
+    ]
+
+    operations = [
+        # The plain route index only exists outside PostgreSQL since 0012,
+        # so it leaves the model state without touching any database; like
+        # the varchar_pattern_ops copy from 0007, it is now only managed by
+        # these migrations.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="load",
+                    name="load_shift_fmt_route_status",
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="load",
+            index=models.Index(fields=["group", "status"], name="load_group_status"),
+        ),
+    ]
@@ -26,11 +26,16 @@ class LoadGroup(models.Model):
         choices=LoadStatusChoices.choices,
         default=LoadStatusChoices.PENDING,
     )
+    # Value of the "*" change counter when the row was last written.
+    change_seq = models.BigIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "warehouse_ui_loadgroup"
+        indexes = [
+            models.Index(fields=["shift", "change_seq"], name="group_shift_change_seq"),
+        ]
 
     def __str__(self):
         return f"Group {self.vehicle_id} ({self.status})"
@@ -93,12 +98,25 @@ class Load(models.Model):
     missing_qty = models.PositiveIntegerField(default=0)
     is_na = models.BooleanField(default=False)
     is_fnd = models.BooleanField(default=False)
+    # Value of the "*" change counter when the row was last written.
+    change_seq = models.BigIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "warehouse_ui_load"
+        # The route-conflict check on create and the board's shift filter
+        # use (shift, format, route_code, status), with status last since the
+        # check excludes it (an inequality). It differs per vendor, so the
+        # migrations create it outside the model state: plain everywhere but
+        # PostgreSQL, which gets a varchar_pattern_ops copy (0007, 0012, 0014).
+        indexes = [
+            # Group status sync: the statuses of a group's loads.
+            models.Index(fields=["group", "status"], name="load_group_status"),
+            # Delta sync: rows written after a cursor.
+            models.Index(fields=["shift", "change_seq"], name="load_shift_change_seq"),
+        ]
 
     def __str__(self):
         return f"{self.client_name} ({self.route_code or 'unspecified'})"
@@ -124,11 +142,62 @@ class Shift(models.Model):
     expected_large = models.PositiveIntegerField(default=0)
     loaded_large = models.PositiveIntegerField(default=0)
 
+    # Sums over the shift's loads, kept by the ORM repository. They replace
+    # the figures above once the shift has loads (load_count > 0).
+    loads_expected_small = models.PositiveIntegerField(default=0)
+    loads_loaded_small = models.PositiveIntegerField(default=0)
+    loads_expected_large = models.PositiveIntegerField(default=0)
+    loads_loaded_large = models.PositiveIntegerField(default=0)
+    load_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "warehouse_ui_shift"
+        indexes = [
+            # Active-shift lookup: status=open ORDER BY start_at DESC.
+            models.Index(fields=["status", "start_at"], name="shift_status_start_at"),
+        ]
 
     def __str__(self):
         return f"Shift {self.start_at.isoformat()} ({self.status})"
+
+
+class ChangeCounter(models.Model):
+    """
+    Monotonic write counter per scope: a shift id, "" for loads without a
+    shift, or "*" for the whole store. Backs the list endpoints' ETags.
+    """
+
+    scope = models.CharField(max_length=64, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "warehouse_ui_changecounter"
+
+    def __str__(self):
+        return f"{self.scope or 'unassigned'}: {self.value}"
+
+
+class Tombstone(models.Model):
+    """Deletion marker so delta-sync clients can drop removed records."""
+
+    class Kind(models.TextChoices):
+        LOAD = "load", "Load"
+        GROUP = "group", "Group"
+
+    kind = models.CharField(max_length=8, choices=Kind.choices)
+    record_id = models.CharField(max_length=64)
+    shift_id = models.CharField(max_length=64, null=True, blank=True)
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "warehouse_ui_tombstone"
+        indexes = [
+            models.Index(fields=["kind", "change_seq"], name="tombstone_kind_seq"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.record_id} @ {self.change_seq}"
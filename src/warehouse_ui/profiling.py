@@ -0,0 +1,223 @@
+"""
+On-demand cProfile capture. A request carrying ``X-Profile-Token`` equal
+to PROFILING_TOKEN, or picked by PROFILING_SAMPLE_RATE, runs under
+cProfile and leaves three files in PROFILES_DIR/<view>/:
+
+* ``<stamp>.pstats`` for ``python -m pstats`` or snakeviz,
+* ``<stamp>.collapsed``, one ``frame;frame;frame microseconds`` line per
+  stack, for flamegraph.pl or speedscope,
+* ``<stamp>.json`` with the method, path, status and wall time.
+
+Only one request per worker is profiled at a time; others that ask while
+a capture is running are served normally. cProfile follows a single
+thread, so under ASGI a capture covers the event loop but not repository
+work the async views hand to worker threads.
+"""
+
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import random
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Optional
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+TOKEN_HEADER = "HTTP_X_PROFILE_TOKEN"
+FILE_NAME = re.compile(r"^\d{8}T\d{12}Z\.(pstats|collapsed|json)$")
+# A per-view directory name as _view_dir_name writes it; never "." or "..".
+VIEW_NAME = re.compile(r"(?!\.+$)[\w.-]+")
+
+_capture = threading.Lock()
+
+
+def has_token(request) -> bool:
+    token = settings.PROFILING_TOKEN
+    given = request.META.get(TOKEN_HEADER, "")
+    return bool(token) and hmac.compare_digest(given.encode(), token.encode())
+
+
+def _view_dir_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    name = match.view_name if match and match.view_name else "unmatched"
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def _label(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name.replace(";", ":")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Counter:
+    """
+    Rebuild stacks from cProfile's caller/callee edges. cProfile keeps no
+    full stacks, so a function reached along several paths has its time
+    split between them in proportion to each edge's cumulative time.
+    """
+    entries = stats.stats
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+
+    stacks = Counter()
+
+    def walk(func, path, labels, share):
+        total_time = entries[func][2]
+        labels = labels + [_label(func)]
+        own = int(total_time * share * 1_000_000)
+        if own:
+            stacks[";".join(labels)] += own
+        for callee, edge_time in callees.get(func, ()):
+            callee_time = entries[callee][3]
+            if callee in path or not callee_time or edge_time * share < 1e-6:
+                continue
+            walk(callee, path | {callee}, labels, share * edge_time / callee_time)
+
+    # Roots are frames entered from code that was already running when the
+    # profiler started. cProfile records no edge for those calls, so they
+    # show up as calls the recorded edges (nc first) do not account for.
+    for func, (primitive, calls, _, _, callers) in entries.items():
+        outside = calls - sum(edge[0] for edge in callers.values())
+        if outside > 0:
+            walk(func, {func}, [], min(outside / primitive, 1.0))
+    return stacks
+
+
+def save_profile(profiler, request, response, elapsed: float) -> str:
+    """Write the capture under PROFILES_DIR and return its directory."""
+    directory = os.path.join(settings.PROFILES_DIR, _view_dir_name(request))
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    base = os.path.join(directory, stamp)
+
+    profiler.dump_stats(base + ".pstats")
+    stacks = collapsed_stacks(pstats.Stats(profiler))
+    with open(base + ".collapsed", "w", encoding="utf-8") as f:
+        for stack, micros in stacks.most_common():
+            f.write(f"{stack} {micros}\n")
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "method": request.method,
+                "path": request.get_full_path(),
+                "status": response.status_code,
+                "total_ms": round(elapsed * 1000, 2),
+            },
+            f,
+        )
+    _prune(directory)
+    return directory
+
+
+def _prune(directory: str):
+    stamps = sorted(
+        {name.split(".")[0] for name in os.listdir(directory) if FILE_NAME.match(name)}
+    )
+    for stamp in stamps[: -settings.PROFILES_KEEP_PER_VIEW]:
+        for ext in ("pstats", "collapsed", "json"):
+            try:
+                os.remove(os.path.join(directory, f"{stamp}.{ext}"))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles(view: str = None) -> Optional[list]:
+    """
+    Saved captures, newest first, optionally for one view only. None when
+    ``view`` is not a view directory name.
+    """
+    if view is not None and not VIEW_NAME.fullmatch(view):
+        return None
+    root = settings.PROFILES_DIR
+    if not os.path.isdir(root):
+        return []
+    views = [view] if view else sorted(os.listdir(root))
+    profiles = []
+    for name in views:
+        directory = os.path.join(root, name)
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.listdir(directory):
+            if not (FILE_NAME.match(entry) and entry.endswith(".json")):
+                continue
+            with open(os.path.join(directory, entry), encoding="utf-8") as f:
+                meta = json.load(f)
+            profiles.append({"view": name, "id": entry[: -len(".json")], **meta})
+    profiles.sort(key=lambda p: p["id"], reverse=True)
+    return profiles
+
+
+def profile_file(view: str, name: str):
+    """Path of one saved file, or None when the name is not a capture."""
+    if not FILE_NAME.match(name) or not VIEW_NAME.fullmatch(view):
+        return None
+    path = os.path.join(settings.PROFILES_DIR, view, name)
+    return path if os.path.isfile(path) else None
+
+
+class ProfilingMiddleware:
+    """Run flagged or sampled requests under cProfile and save the result."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._wanted(request) or not _capture.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            profiler = cProfile.Profile()
+            started = perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            save_profile(profiler, request, response, perf_counter() - started)
+        finally:
+            _capture.release()
+        return response
+
+    async def __acall__(self, request):
+        if not self._wanted(request) or not _capture.acquire(blocking=False):
+            return await self.get_response(request)
+        try:
+            profiler = cProfile.Profile()
+            started = perf_counter()
+            profiler.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.disable()
+            await sync_to_async(save_profile, thread_sensitive=False)(
+                profiler, request, response, perf_counter() - started
+            )
+        finally:
+            _capture.release()
+        return response
+
+    @staticmethod
+    def _wanted(request) -> bool:
+        # The listing is read with the token; do not profile it.
+        if request.path.startswith("/profiles/"):
+            return False
+        rate = settings.PROFILING_SAMPLE_RATE
+        return has_token(request) or (rate > 0 and random.random() < rate)
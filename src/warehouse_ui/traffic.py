@@ -0,0 +1,334 @@
+"""
+Record API traffic as NDJSON and replay it in-process.
+
+With TRAFFIC_CAPTURE_PATH set, every /api/ request except the event
+stream is appended to that file as one line::
+
+    {"t": 1760659200.123, "method": "PATCH", "path": "/api/loads/<id>/",
+     "body": {"loaded_qty": 4}, "status": 200, "duration_ms": 3.1}
+
+Headers, cookies and non-JSON bodies are never written, and body keys
+that look like credentials are masked. Creates also record the
+``created_id`` they returned, which lets ``replay`` map ids from the
+capture to the ids the replay target hands out.
+
+Lines are appended by a background thread per process, so neither a
+request thread nor the event loop under ASGI waits on the file; call
+``flush`` to wait for what was captured so far.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import defaultdict
+from inspect import iscoroutinefunction
+from time import perf_counter
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+SENSITIVE_KEY = re.compile(r"pass|secret|token|auth|cookie|session", re.IGNORECASE)
+SKIPPED_PATHS = ("/api/stream/",)
+
+logger = logging.getLogger(__name__)
+
+# (path, line) pairs waiting for the writer thread of this process.
+_pending: "queue.Queue[tuple]" = queue.Queue()
+_writer = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+
+def sanitize(value):
+    """Copy of a JSON body with credential-like keys masked."""
+    if isinstance(value, dict):
+        return {
+            key: "[redacted]" if SENSITIVE_KEY.search(key) else sanitize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+def _json_body(raw: bytes):
+    if not raw:
+        return None
+    try:
+        return sanitize(json.loads(raw))
+    except ValueError:
+        return None
+
+
+def _created_id(request, response):
+    if request.method != "POST" or response.status_code != 201:
+        return None
+    try:
+        return json.loads(response.content).get("id")
+    except (ValueError, AttributeError):
+        return None
+
+
+def record(request, response, started_at: float, elapsed: float):
+    try:
+        body = _json_body(request.body)
+    except Exception:
+        # Bodies already consumed as a stream (uploads) are not captured.
+        body = None
+    entry = {
+        "t": round(started_at, 3),
+        "method": request.method,
+        "path": request.get_full_path(),
+        "body": body,
+        "status": response.status_code,
+        "duration_ms": round(elapsed * 1000, 2),
+    }
+    created_id = _created_id(request, response)
+    if created_id is not None:
+        entry["created_id"] = created_id
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    _ensure_writer()
+    _pending.put((settings.TRAFFIC_CAPTURE_PATH, line))
+
+
+def flush():
+    """Block until every line captured so far in this process is written."""
+    if _writer is not None and _writer_pid == os.getpid():
+        _pending.join()
+
+
+def _ensure_writer():
+    global _pending, _writer, _writer_pid
+    with _writer_lock:
+        if _writer is not None and _writer_pid == os.getpid():
+            return
+        # Threads do not survive a fork; start one per worker process.
+        _pending = queue.Queue()
+        _writer_pid = os.getpid()
+        _writer = threading.Thread(
+            target=_write_loop,
+            args=(_pending,),
+            name="traffic-capture-writer",
+            daemon=True,
+        )
+        _writer.start()
+
+
+def _write_loop(pending: queue.Queue):
+    while True:
+        batch = [pending.get()]
+        # Whatever queued up meanwhile goes out with the same write.
+        while True:
+            try:
+                batch.append(pending.get_nowait())
+            except queue.Empty:
+                break
+        lines = defaultdict(list)
+        for path, line in batch:
+            lines[path].append(line)
+        try:
+            for path, chunk in lines.items():
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(chunk))
+        except OSError:
+            logger.exception("Could not append %d captured requests", len(batch))
+        finally:
+            for _ in batch:
+                pending.task_done()
+
+
+# Daemon threads are stopped at exit; write out what is still queued first.
+atexit.register(flush)
+
+
+class TrafficRecorderMiddleware:
+    """Append /api/ requests to TRAFFIC_CAPTURE_PATH when it is set."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._wanted(request):
+            return self.get_response(request)
+        started_at, started = time.time(), perf_counter()
+        response = self.get_response(request)
+        record(request, response, started_at, perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not self._wanted(request):
+            return await self.get_response(request)
+        started_at, started = time.time(), perf_counter()
+        response = await self.get_response(request)
+        record(request, response, started_at, perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _wanted(request) -> bool:
+        return (
+            bool(settings.TRAFFIC_CAPTURE_PATH)
+            and request.path.startswith("/api/")
+            and not request.path.startswith(SKIPPED_PATHS)
+        )
+
+
+def read_capture(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    # Nearest rank: the smallest sample with pct% of samples at or below it.
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def endpoint(method: str, path: str) -> str:
+    try:
+        view = resolve(path.split("?", 1)[0]).view_name
+    except Resolver404:
+        view = "unmatched"
+    return f"{method} {view}"
+
+
+def _error_message(response) -> str:
+    try:
+        return str(json.loads(response.content).get("error"))
+    except (ValueError, AttributeError):
+        return f"HTTP {response.status_code}"
+
+
+class _IdMap:
+    """Recorded id -> id the replay target created for the same request."""
+
+    def __init__(self, pending):
+        self._ids = {}
+        self._pending = set(pending)
+        self._changed = threading.Condition()
+
+    def set(self, recorded, replayed):
+        with self._changed:
+            self._ids[recorded] = replayed
+            self._pending.discard(recorded)
+            self._changed.notify_all()
+
+    def forget(self, recorded):
+        # The create failed; requests that use the id get the recorded one.
+        self.set(recorded, recorded)
+
+    def apply(self, text: str, timeout: float = 30) -> str:
+        with self._changed:
+            # With several workers a request can overtake the create it
+            # depends on; wait for that create to finish first.
+            self._changed.wait_for(
+                lambda: not any(i in text for i in self._pending), timeout
+            )
+            for recorded, replayed in self._ids.items():
+                if recorded != replayed:
+                    text = text.replace(recorded, replayed)
+        return text
+
+
+def replay(entries: list, speedup: float = 0, concurrency: int = 1) -> dict:
+    """
+    Send ``entries`` through the full middleware stack of this process in
+    recorded order, using Django's test client in ``concurrency`` threads.
+    ``speedup`` > 0 keeps the recorded pacing, compressed by that factor;
+    0 sends each request as soon as a worker is free.
+
+    Returns throughput and per-endpoint latency (p50/p95/p99 in ms).
+    """
+    from django.test import Client
+
+    ids = _IdMap(e["created_id"] for e in entries if "created_id" in e)
+    work = queue.Queue()
+    for entry in entries:
+        work.put(entry)
+    first_t = entries[0]["t"] if entries else 0
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    errors = defaultdict(lambda: defaultdict(int))
+    results_lock = threading.Lock()
+    started = perf_counter()
+
+    def send(client, entry):
+        path = ids.apply(entry["path"])
+        body = entry.get("body")
+        data = ids.apply(json.dumps(body)) if body is not None else None
+        method = getattr(client, entry["method"].lower())
+        sent = perf_counter()
+        if data is None:
+            response = method(path)
+        else:
+            response = method(path, data, content_type="application/json")
+        elapsed = perf_counter() - sent
+
+        if "created_id" in entry:
+            try:
+                ids.set(entry["created_id"], json.loads(response.content)["id"])
+            except (ValueError, KeyError, TypeError):
+                ids.forget(entry["created_id"])
+        name = endpoint(entry["method"], entry["path"])
+        with results_lock:
+            latencies[name].append(elapsed * 1000)
+            statuses[name][response.status_code] += 1
+            if response.status_code >= 400:
+                errors[name][_error_message(response)] += 1
+
+    def worker():
+        client = Client(raise_request_exception=False)
+        try:
+            while True:
+                try:
+                    entry = work.get_nowait()
+                except queue.Empty:
+                    return
+                if speedup > 0:
+                    due = (entry["t"] - first_t) / speedup
+                    delay = due - (perf_counter() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                send(client, entry)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = perf_counter() - started
+
+    endpoints = {}
+    for name, samples in sorted(latencies.items()):
+        ordered = sorted(samples)
+        endpoints[name] = {
+            "count": len(ordered),
+            "statuses": dict(sorted(statuses[name].items())),
+            "p50_ms": round(_percentile(ordered, 50), 2),
+            "p95_ms": round(_percentile(ordered, 95), 2),
+            "p99_ms": round(_percentile(ordered, 99), 2),
+            "errors": dict(errors[name]),
+        }
+    return {
+        "requests": len(entries),
+        "seconds": round(wall, 3),
+        "throughput_rps": round(len(entries) / wall, 1) if wall else 0.0,
+        "endpoints": endpoints,
+    }
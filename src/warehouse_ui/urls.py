@@ -8,12 +8,26 @@ from .views import (
     ShiftListCreateView,
     ShiftDetailView,
     ConfigView,
+    BoardStreamView,
+    BoardView,
+    MetricsView,
+    ProfileListView,
+    ProfileFileView,
 )
 
 urlpatterns = [
     path("", IndexView.as_view(), name="index"),
     path("calendar/", IndexView.as_view(), name="calendar"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("profiles/", ProfileListView.as_view(), name="profile-list"),
+    path(
+        "profiles/<str:view>/<str:name>",
+        ProfileFileView.as_view(),
+        name="profile-file",
+    ),
     path("api/config/", ConfigView.as_view(), name="config"),
+    path("api/board/", BoardView.as_view(), name="board"),
+    path("api/stream/", BoardStreamView.as_view(), name="board-stream"),
     path("api/loads/", LoadListCreateView.as_view(), name="load-list"),
     path("api/loads/<str:load_id>/", LoadDetailView.as_view(), name="load-detail"),
     path("api/groups/", GroupListCreateView.as_view(), name="group-list"),
@@ -1,19 +1,31 @@
+import hashlib
 import json
 import os
+import uuid
 from datetime import datetime, timedelta, time
+from time import monotonic
 from zoneinfo import ZoneInfo
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, close_old_connections
+from django.db.models import Count, Max, Q
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.functional import classproperty
 from django.views.generic import TemplateView
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
-from dataclasses import asdict
 
 from src.application.commands import CreateLoadCommand, AssignVehicleCommand
+from src.application.events import ChangeWatcher, board_changes
+from src.application.queries import LoadQuery
 from src.application.services import LoadService
 from src.domain.exceptions import DomainError
 from src.domain.models import (
@@ -21,45 +33,60 @@ from src.domain.models import (
     LoadGroup,
     LoadFormat,
     LoadStatus,
+    ShiftTotals,
     VerificationStatus,
 )
 from src.domain.rules import validate_load
 from src.infrastructure.json_repository import JsonRepository
 from src.infrastructure.orm_repository import OrmRepository
+from src.infrastructure.sharded_json_repository import ShardedJsonRepository
+from src.infrastructure.sqlite_repository import SqliteRepository
+from src.warehouse_ui import metrics, profiling
+from src.warehouse_ui.instrumentation import (
+    InstrumentedRepository,
+    InstrumentedService,
+)
 from src.warehouse_ui.models import Shift, ShiftStatusChoices
+from src.warehouse_ui.serializers import (
+    JsonResponse,
+    dumps,
+    serialize_group,
+    serialize_load,
+)
 
 # Initialize Repository
 REPO_PATH = os.path.join("data", "loads.json")
+SHARD_DIR = os.path.join("data", "shifts")
 USE_JSON_REPO = settings.REPOSITORY_BACKEND == "json" or (
     settings.REPOSITORY_BACKEND == "auto" and settings.DEBUG
 )
-repo = JsonRepository(REPO_PATH) if USE_JSON_REPO else OrmRepository()
+JSON_REPO_OPTIONS = dict(
+    journal=settings.JSON_REPOSITORY_JOURNAL,
+    compact_threshold=settings.JSON_JOURNAL_COMPACT_BYTES,
+    group_commit=settings.JSON_REPOSITORY_GROUP_COMMIT,
+    commit_window=settings.JSON_GROUP_COMMIT_WINDOW_MS / 1000,
+)
+if settings.REPOSITORY_BACKEND == "sqlite":
+    repo = SqliteRepository(settings.SQLITE_REPOSITORY_PATH)
+elif not USE_JSON_REPO:
+    repo = OrmRepository()
+elif settings.JSON_REPOSITORY_LAYOUT == "sharded":
+    repo = ShardedJsonRepository(SHARD_DIR, **JSON_REPO_OPTIONS)
+else:
+    repo = JsonRepository(REPO_PATH, **JSON_REPO_OPTIONS)
+# Names the backend in shared cache keys; the timing proxy hides the class.
+REPOSITORY_NAME = type(repo).__name__
+if settings.REQUEST_TIMING_SAMPLE_RATE > 0 or metrics.enabled():
+    repo = InstrumentedRepository(repo)
 service = LoadService(repo)
+if metrics.enabled():
+    service = InstrumentedService(service)
 
+# Upper bound for ?limit= on paginated list endpoints.
+MAX_PAGE_SIZE = 500
 
-def serialize_load(load: LoadRecord):
-    """Convert domain model to dictionary safe for JSON."""
-    d = asdict(load)
-    # Convert enums
-    d["format"] = load.format.value if hasattr(load.format, "value") else load.format
-    d["status"] = load.status.value if hasattr(load.status, "value") else load.status
-    if load.verification_status:
-        d["verification_status"] = (
-            load.verification_status.value
-            if hasattr(load.verification_status, "value")
-            else load.verification_status
-        )
-    if load.shift_id:
-        d["shift_id"] = load.shift_id
-    return d
-
-
-def serialize_group(group: LoadGroup):
-    d = asdict(group)
-    d["status"] = group.status.value if hasattr(group.status, "value") else group.status
-    if group.shift_id:
-        d["shift_id"] = group.shift_id
-    return d
+# Response headers stored alongside cached board payloads.
+CACHED_HEADERS = ("X-Next-Cursor", "X-Change-Cursor")
 
 
 def _ensure_completion_total(load: LoadRecord):
@@ -124,27 +151,28 @@ def _shift_duration_hours(shift: Shift):
 
 
 def _serialize_shift(shift: Shift):
-    shift_id = str(shift.id)
-    load_records = [l for l in repo.list_all() if l.shift_id == shift_id]
-
-    if load_records:
-        expected_small = sum(
-            l.expected_qty for l in load_records if l.format == LoadFormat.SMALL
-        )
-        loaded_small = sum(
-            l.loaded_qty for l in load_records if l.format == LoadFormat.SMALL
+    return _shift_payload(shift, repo.get_shift_totals(str(shift.id)))
+
+
+def _shift_payload(shift: Shift, totals):
+    # Running totals kept by the repository; None means they live in the
+    # loads_* columns of the Shift row. Shifts without loads keep their
+    # manually entered totals.
+    if totals is None:
+        totals = ShiftTotals(
+            expected_small=shift.loads_expected_small,
+            loaded_small=shift.loads_loaded_small,
+            expected_large=shift.loads_expected_large,
+            loaded_large=shift.loads_loaded_large,
+            load_count=shift.load_count,
         )
-        expected_large = sum(
-            l.expected_qty for l in load_records if l.format == LoadFormat.LARGE
-        )
-        loaded_large = sum(
-            l.loaded_qty for l in load_records if l.format == LoadFormat.LARGE
-        )
-    else:
-        expected_small = shift.expected_small
-        loaded_small = shift.loaded_small
-        expected_large = shift.expected_large
-        loaded_large = shift.loaded_large
+    if not totals.load_count:
+        totals = shift
+
+    expected_small = totals.expected_small
+    loaded_small = totals.loaded_small
+    expected_large = totals.expected_large
+    loaded_large = totals.loaded_large
 
     expected_total = expected_small + expected_large
     loaded_total = loaded_small + loaded_large
@@ -171,19 +199,364 @@ def _serialize_shift(shift: Shift):
     }
 
 
+def _list_etag(request, *args, **kwargs):
+    """
+    ETag of a polled list endpoint: the store id and the shift's change
+    counter plus the exact path/query, so unchanged polls get a 304 without
+    listing anything.
+    """
+    shift_id = _canonical_shift_id(request.GET.get("shift_id") or None)
+    return _versioned_etag(request, repo.get_cache_version(shift_id))
+
+
+def _canonical_shift_id(shift_id):
+    """A UUID shift id in the form shifts are stored under, else as given."""
+    if shift_id is None:
+        return None
+    try:
+        return str(uuid.UUID(shift_id))
+    except ValueError:
+        return shift_id
+
+
+def _versioned_etag(request, version):
+    if version is None:
+        return None
+    digest = hashlib.sha1(request.get_full_path().encode()).hexdigest()[:16]
+    return f"{version}-{digest}"
+
+
+async def _aconditional(request, etag, build):
+    """What ``@condition`` does for sync handlers, for an ETag read async."""
+    etag = quote_etag(etag) if etag is not None else None
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await build()
+    if etag:
+        response.headers.setdefault("ETag", etag)
+    return response
+
+
+def _board_etag(request, *args, **kwargs):
+    # The board also carries the active shift, so shift writes and shifts
+    # turning overdue must change the tag too.
+    etag = _list_etag(request)
+    if etag is None:
+        return None
+    shifts = hashlib.sha1(repr(_shift_signature()).encode()).hexdigest()[:8]
+    return f"{etag}-{shifts}"
+
+
+def _cached_read(request, shift_id, build, extra=""):
+    """
+    Serve a read through the shared board cache. Keys carry the store id
+    and the data version of the shift (all data when shift_id is None), so
+    every repository write moves readers on to fresh keys, and a reset
+    store never reads entries cached for the one it replaced.
+    """
+    # Read before building: an entry can be newer than its key, never older.
+    version = repo.get_cache_version(shift_id)
+    if version is None:
+        return build()
+    key = _cache_key(request, version, extra)
+    cached = caches["board"].get(key)
+    if cached is not None:
+        return _cached_response(cached)
+    response = build()
+    if response.status_code == 200:
+        caches["board"].set(key, _cache_entry(response))
+    return response
+
+
+async def _acached_read(request, version, build):
+    """``_cached_read`` for async views, given the version already read."""
+    if version is None:
+        return await build()
+    key = _cache_key(request, version)
+    cached = await caches["board"].aget(key)
+    if cached is not None:
+        return _cached_response(cached)
+    response = await build()
+    if response.status_code == 200:
+        await caches["board"].aset(key, _cache_entry(response))
+    return response
+
+
+def _cache_key(request, version, extra=""):
+    raw = f"{REPOSITORY_NAME}:{version}:{extra}:{request.get_full_path()}"
+    return "board:" + hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _cache_entry(response):
+    headers = {h: response[h] for h in CACHED_HEADERS if response.has_header(h)}
+    return response.content, headers
+
+
+def _cached_response(entry):
+    content, headers = entry
+    response = HttpResponse(content, content_type="application/json")
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def _changes_response(request, list_changes, serialize):
+    """Delta-sync reply for ``?since=<cursor>`` on a list endpoint."""
+    try:
+        since = int(request.GET["since"])
+    except ValueError:
+        return JsonResponse({"error": "since must be an integer cursor"}, status=400)
+    changes = list_changes(since, request.GET.get("shift_id") or None)
+    return _changes_reply(changes, serialize)
+
+
+async def _achanges_response(request, list_changes, serialize):
+    try:
+        since = int(request.GET["since"])
+    except ValueError:
+        return JsonResponse({"error": "since must be an integer cursor"}, status=400)
+    changes = await list_changes(since, request.GET.get("shift_id") or None)
+    return _changes_reply(changes, serialize)
+
+
+def _changes_reply(changes, serialize):
+    if changes is None:
+        return JsonResponse(
+            {"error": "Delta sync is not supported by this backend"}, status=400
+        )
+    return JsonResponse(
+        {
+            "cursor": changes.cursor,
+            "reset": changes.reset,
+            "changes": [serialize(r) for r in changes.records],
+            "deleted": changes.deleted,
+        }
+    )
+
+
+def _with_change_cursor(response, cursor):
+    # Starting point for ?since= polls, read before the list was built.
+    if cursor is not None:
+        response["X-Change-Cursor"] = str(cursor)
+    return response
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+def _shift_signature():
+    # Shift writes bump updated_at, deletes change the count, and an open
+    # shift passing 12 hours changes the overdue count.
+    overdue_start = timezone.now() - timedelta(hours=12)
+    totals = Shift.objects.aggregate(
+        count=Count("id"),
+        updated_at=Max("updated_at"),
+        overdue=Count(
+            "id",
+            filter=Q(status=ShiftStatusChoices.OPEN, start_at__lte=overdue_start),
+        ),
+    )
+    return tuple(totals.values())
+
+
+def _open_board_stream(shift_id):
+    try:
+        cursor = repo.get_change_cursor(shift_id)
+        return {
+            "version": repo.get_data_version(shift_id),
+            "loads": cursor,
+            "groups": cursor,
+            "shifts": _shift_signature(),
+        }
+    finally:
+        close_old_connections()
+
+
+def _poll_board_stream(shift_id, state):
+    """
+    Events for everything written since ``state`` was taken, advancing
+    ``state``. Backends without change counters refresh on every wakeup.
+    """
+    events = []
+    try:
+        version = repo.get_data_version(shift_id)
+        changed = version is None or version != state["version"]
+        if changed:
+            state["version"] = version
+            events.extend(_board_changes(shift_id, state))
+        signature = _shift_signature()
+        if signature != state["shifts"]:
+            state["shifts"] = signature
+            shifts = Shift.objects.filter(status=ShiftStatusChoices.OPEN)
+            events.append(
+                ("shifts", [_serialize_shift(s) for s in shifts.order_by("start_at")])
+            )
+    finally:
+        close_old_connections()
+    return events
+
+
+def _board_changes(shift_id, state):
+    events = []
+    for kind, list_changes, serialize in (
+        ("loads", repo.load_changes, serialize_load),
+        ("groups", repo.group_changes, serialize_group),
+    ):
+        since = state[kind]
+        changes = list_changes(since, shift_id) if since is not None else None
+        if changes is None or changes.reset:
+            # No usable delta: the client reloads the lists instead.
+            cursor = repo.get_change_cursor(shift_id)
+            state["loads"] = state["groups"] = cursor
+            return [("refresh", {"cursor": cursor})]
+        state[kind] = changes.cursor
+        if changes.records or changes.deleted:
+            data = {
+                "cursor": changes.cursor,
+                "changes": [serialize(r) for r in changes.records],
+                "deleted": changes.deleted,
+            }
+            events.append((kind, data))
+    return events
+
+
+def _in_thread(func):
+    # Shared executor rather than the request's own thread, so an idle
+    # stream holds no thread between polls.
+    return sync_to_async(func, thread_sensitive=False)
+
+
+def _stream_probe(shift_id):
+    """What the shared stream poller compares between polls."""
+    try:
+        return repo.get_data_version(shift_id), _shift_signature()
+    finally:
+        close_old_connections()
+
+
+# Writes by other workers: one poller per shift and process wakes every
+# stream on that shift, instead of each stream polling on its own.
+_stream_watcher = ChangeWatcher(
+    lambda shift_id: _in_thread(_stream_probe)(shift_id),
+    lambda: settings.BOARD_STREAM_POLL_SECONDS,
+)
+
+
+async def _board_stream(shift_id):
+    # Local writes set the event through board_changes, other workers'
+    # through the watcher; an idle stream only wakes for its keepalive.
+    woken = board_changes.subscribe()
+    _stream_watcher.watch(shift_id, woken)
+    try:
+        state = await _in_thread(_open_board_stream)(shift_id)
+        yield f"retry: {settings.BOARD_STREAM_RETRY_MS}\n" + _sse(
+            "ready", {"cursor": state["loads"]}
+        )
+        last_sent = monotonic()
+        while True:
+            idle = monotonic() - last_sent
+            timeout = max(settings.BOARD_STREAM_HEARTBEAT_SECONDS - idle, 0)
+            if await board_changes.wait(woken, timeout):
+                events = await _in_thread(_poll_board_stream)(shift_id, state)
+                if not events:
+                    continue
+                yield "".join(_sse(event, data) for event, data in events)
+            else:
+                # Comment line: keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+            last_sent = monotonic()
+    finally:
+        _stream_watcher.unwatch(shift_id, woken)
+        board_changes.unsubscribe(woken)
+
+
+class AsyncReadView(View):
+    """
+    View with an ``aget`` twin of ``get``. Under ASGI (ASYNC_READ_VIEWS,
+    set by config/asgi.py) reads run as ``aget`` on the event loop and
+    writes run their sync handler in a worker thread; under WSGI the view
+    stays fully sync.
+    """
+
+    @classproperty
+    def view_is_async(cls):
+        return settings.ASYNC_READ_VIEWS
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.view_is_async:
+            return super().dispatch(request, *args, **kwargs)
+        method = request.method.lower()
+        if method in ("get", "head"):
+            return self.aget(request, *args, **kwargs)
+        if method in ("post", "put", "patch", "delete") and hasattr(self, method):
+            return sync_to_async(getattr(self, method))(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+
 class IndexView(TemplateView):
     template_name = "index.html"
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class LoadListCreateView(View):
+@method_decorator(condition(etag_func=_list_etag), name="get")
+class LoadListCreateView(AsyncReadView):
     def get(self, request):
-        loads = repo.list_all()
-        shift_id = request.GET.get("shift_id")
-        if shift_id:
-            loads = [l for l in loads if l.shift_id == shift_id]
+        params = request.GET
+        if "since" in params:
+            return _changes_response(request, repo.load_changes, serialize_load)
+        shift_id = params.get("shift_id") or None
+        return _cached_read(request, shift_id, lambda: self._list(params))
+
+    async def aget(self, request):
+        params = request.GET
+        if "since" in params:
+            return await _achanges_response(request, repo.aload_changes, serialize_load)
+        version = await repo.aget_cache_version(params.get("shift_id") or None)
+        return await _aconditional(
+            request,
+            _versioned_etag(request, version),
+            lambda: _acached_read(request, version, lambda: self._alist(params)),
+        )
+
+    @staticmethod
+    def _query(params):
+        limit = params.get("limit")
+        return LoadQuery(
+            shift_id=params.get("shift_id") or None,
+            status=params.get("status") or None,
+            format=_normalize_format_value(params.get("format")) or None,
+            group_id=params.get("group_id") or None,
+            vehicle_id=params.get("vehicle_id") or None,
+            route_prefix=params.get("route_prefix") or None,
+            order=params.get("order") or "created_at",
+            limit=min(int(limit), MAX_PAGE_SIZE) if limit else None,
+            after=params.get("after") or None,
+        )
+
+    def _list(self, params):
+        cursor = repo.get_change_cursor(params.get("shift_id") or None)
+        try:
+            loads, next_cursor = repo.query_loads(self._query(params))
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        return self._list_response(loads, next_cursor, cursor)
+
+    async def _alist(self, params):
+        cursor = await repo.aget_change_cursor(params.get("shift_id") or None)
+        try:
+            loads, next_cursor = await repo.aquery_loads(self._query(params))
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        return self._list_response(loads, next_cursor, cursor)
+
+    @staticmethod
+    def _list_response(loads, next_cursor, cursor):
         data = [serialize_load(l) for l in loads]
-        return JsonResponse(data, safe=False)
+        response = JsonResponse(data, safe=False)
+        if next_cursor:
+            response["X-Next-Cursor"] = next_cursor
+        return _with_change_cursor(response, cursor)
 
     def post(self, request):
         try:
@@ -225,26 +598,29 @@ class LoadListCreateView(View):
                 else None,
             )
 
-            load = service.create_load(command)
+            # Create, vehicle assignment and extra fields persist as one write.
+            with repo.transaction():
+                load = service.create_load(command)
 
-            if data.get("vehicle_id"):
-                load = service.assign_vehicle(
-                    AssignVehicleCommand(load.id, data.get("vehicle_id"))
-                )
+                if data.get("vehicle_id"):
+                    load = service.assign_vehicle(
+                        AssignVehicleCommand(load.id, data.get("vehicle_id"))
+                    )
 
-            if data.get("group_id"):
-                load.group_id = data.get("group_id")
+                if data.get("group_id"):
+                    load.group_id = data.get("group_id")
 
-            if data.get("missing_refs") is not None:
-                load.missing_refs = data.get("missing_refs") or []
+                if data.get("missing_refs") is not None:
+                    load.missing_refs = data.get("missing_refs") or []
 
-            load.is_na = bool(data.get("is_na", load.is_na))
-            load.is_fnd = bool(data.get("is_fnd", load.is_fnd))
+                load.is_na = bool(data.get("is_na", load.is_na))
+                load.is_fnd = bool(data.get("is_fnd", load.is_fnd))
 
-            validate_load(load)
-            repo.save_load(load)
+                validate_load(load)
+                repo.save_load(load)
             return JsonResponse(serialize_load(load), status=201)
         except DomainError as exc:
+            metrics.count_domain_error(exc.code)
             return JsonResponse({"error": exc.message, "code": exc.code}, status=400)
         except Exception as exc:
             return JsonResponse({"error": str(exc)}, status=400)
@@ -259,6 +635,15 @@ class LoadDetailView(View):
         return JsonResponse(serialize_load(load))
 
     def patch(self, request, load_id):
+        try:
+            with repo.transaction():
+                return self._patch(request, load_id)
+        except IntegrityError:
+            # Deferred constraints only fail at commit; group_id is the only
+            # foreign key a PATCH can set. The driver's message stays private.
+            return JsonResponse({"error": "Unknown group_id"}, status=400)
+
+    def _patch(self, request, load_id):
         load = repo.get_load(load_id)
         if not load:
             return JsonResponse({"error": "Not found"}, status=404)
@@ -305,6 +690,7 @@ class LoadDetailView(View):
             repo.save_load(load)
             return JsonResponse(serialize_load(load))
         except DomainError as exc:
+            metrics.count_domain_error(exc.code)
             return JsonResponse({"error": exc.message, "code": exc.code}, status=400)
         except Exception as exc:
             return JsonResponse({"error": str(exc)}, status=400)
@@ -317,14 +703,21 @@ class LoadDetailView(View):
 
 
 @method_decorator(csrf_exempt, name="dispatch")
+@method_decorator(condition(etag_func=_list_etag), name="get")
 class GroupListCreateView(View):
     def get(self, request):
-        groups = repo.list_all_groups()
+        if "since" in request.GET:
+            return _changes_response(request, repo.group_changes, serialize_group)
         shift_id = request.GET.get("shift_id")
-        if shift_id:
-            groups = [g for g in groups if g.shift_id == shift_id]
+        return _cached_read(request, shift_id or None, lambda: self._list(shift_id))
+
+    def _list(self, shift_id):
+        cursor = repo.get_change_cursor(shift_id or None)
+        groups = (
+            repo.list_groups_by_shift(shift_id) if shift_id else repo.list_all_groups()
+        )
         data = [serialize_group(g) for g in groups]
-        return JsonResponse(data, safe=False)
+        return _with_change_cursor(JsonResponse(data, safe=False), cursor)
 
     def post(self, request):
         try:
@@ -349,13 +742,35 @@ class GroupListCreateView(View):
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class GroupDetailView(View):
+class GroupDetailView(AsyncReadView):
+    # Cached under the version of the group's own shift ("" for groups
+    # without one), not the whole store's, which the sharded backend can
+    # only compute by opening every shard. Members share the group's shift.
+
     def get(self, request, group_id):
         group = repo.get_group(group_id)
         if not group:
             return JsonResponse({"error": "Not found"}, status=404)
+        return _cached_read(
+            request,
+            group.shift_id or "",
+            lambda: self._detail_response(group, repo.list_loads_by_group(group_id)),
+        )
+
+    async def aget(self, request, group_id):
+        group = await repo.aget_group(group_id)
+        if not group:
+            return JsonResponse({"error": "Not found"}, status=404)
+        version = await repo.aget_cache_version(group.shift_id or "")
 
-        loads = repo.list_loads_by_group(group_id)
+        async def build():
+            loads = await repo.alist_loads_by_group(group_id)
+            return self._detail_response(group, loads)
+
+        return await _acached_read(request, version, build)
+
+    @staticmethod
+    def _detail_response(group, loads):
         data = serialize_group(group)
         data["loads"] = [serialize_load(l) for l in loads]
         return JsonResponse(data)
@@ -387,26 +802,154 @@ class GroupDetailView(View):
         return JsonResponse({"status": "deleted"}, status=200)
 
 
-class ConfigView(View):
-    def get(self, request):
-        active_shift = (
-            Shift.objects.filter(status=ShiftStatusChoices.OPEN)
-            .order_by("-start_at")
-            .first()
+class BoardStreamView(View):
+    """
+    Server-Sent Events feed of load, group and shift changes for the board.
+    Only served under ASGI, where an idle stream is a suspended coroutine;
+    WSGI clients get a 501 and keep polling.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"error": "Event stream requires the ASGI server"}, status=501
+            )
+        response = StreamingHttpResponse(
+            _board_stream(request.GET.get("shift_id") or None),
+            content_type="text/event-stream",
         )
-        return JsonResponse(
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+def _open_shifts_latest_first():
+    return Shift.objects.filter(status=ShiftStatusChoices.OPEN).order_by("-start_at")
+
+
+def _active_shift():
+    return _open_shifts_latest_first().first()
+
+
+def _config(active_shift):
+    return {
+        "warehouse_time_zone": getattr(settings, "WAREHOUSE_TIME_ZONE", "UTC"),
+        "active_shift_id": str(active_shift.id) if active_shift else None,
+    }
+
+
+class MetricsView(View):
+    def get(self, request):
+        if not metrics.enabled():
+            return JsonResponse(
+                {"error": "prometheus_client is not installed"}, status=501
+            )
+        body, content_type = metrics.render()
+        return HttpResponse(body, content_type=content_type)
+
+
+class ProfileListView(View):
+    """
+    Saved cProfile captures, newest first (``?view=`` narrows to one URL
+    name). Staff sessions or the X-Profile-Token header only.
+    """
+
+    def get(self, request):
+        if not (request.user.is_staff or profiling.has_token(request)):
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        profiles = profiling.list_profiles(request.GET.get("view") or None)
+        if profiles is None:
+            raise Http404
+        for profile in profiles:
+            for ext in ("pstats", "collapsed"):
+                profile[ext] = request.build_absolute_uri(
+                    f"{profile['view']}/{profile['id']}.{ext}"
+                )
+        return JsonResponse({"profiles": profiles})
+
+
+class ProfileFileView(View):
+    def get(self, request, view, name):
+        if not (request.user.is_staff or profiling.has_token(request)):
+            return JsonResponse({"error": "Forbidden"}, status=403)
+        path = profiling.profile_file(view, name)
+        if path is None:
+            raise Http404
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
+
+
+class ConfigView(AsyncReadView):
+    def get(self, request):
+        return JsonResponse(_config(_active_shift()))
+
+    async def aget(self, request):
+        return JsonResponse(_config(await _open_shifts_latest_first().afirst()))
+
+
+@method_decorator(condition(etag_func=_board_etag), name="get")
+class BoardView(View):
+    """
+    Everything one board poll needs: loads, groups with their member load
+    ids, the active shift and config, from a single repository read.
+    """
+
+    def get(self, request):
+        shift_id = request.GET.get("shift_id") or None
+        # The active shift is not covered by the data version.
+        shifts = repr(_shift_signature())
+        return _cached_read(request, shift_id, lambda: self._board(shift_id), shifts)
+
+    def _board(self, shift_id):
+        board = repo.get_board(shift_id)
+        members = {}
+        for load in board.loads:
+            if load.group_id:
+                members.setdefault(load.group_id, []).append(load.id)
+        groups = []
+        for group in board.groups:
+            data = serialize_group(group)
+            data["load_ids"] = members.get(group.id, [])
+            groups.append(data)
+
+        active_shift = _active_shift()
+        response = JsonResponse(
             {
-                "warehouse_time_zone": getattr(settings, "WAREHOUSE_TIME_ZONE", "UTC"),
-                "active_shift_id": str(active_shift.id) if active_shift else None,
+                "config": _config(active_shift),
+                "active_shift": (
+                    _serialize_shift(active_shift) if active_shift else None
+                ),
+                "loads": [serialize_load(l) for l in board.loads],
+                "groups": groups,
             }
         )
+        return _with_change_cursor(response, board.cursor)
 
 
 @method_decorator(csrf_exempt, name="dispatch")
-class ShiftListCreateView(View):
+class ShiftListCreateView(AsyncReadView):
     def get(self, request):
-        status_param = request.GET.get("status")
-        include_open = request.GET.get("include_open", "false").lower() == "true"
+        try:
+            shifts = self._filter(request.GET)
+        except ValueError:
+            return JsonResponse({"error": "Invalid date range"}, status=400)
+        data = [_serialize_shift(s) for s in shifts]
+        return JsonResponse(data, safe=False)
+
+    async def aget(self, request):
+        try:
+            shifts = self._filter(request.GET)
+        except ValueError:
+            return JsonResponse({"error": "Invalid date range"}, status=400)
+        data = [
+            _shift_payload(s, await repo.aget_shift_totals(str(s.id)))
+            async for s in shifts
+        ]
+        return JsonResponse(data, safe=False)
+
+    @staticmethod
+    def _filter(params):
+        status_param = params.get("status")
+        include_open = params.get("include_open", "false").lower() == "true"
 
         shifts = Shift.objects.all()
         if status_param:
@@ -415,25 +958,20 @@ class ShiftListCreateView(View):
         elif not include_open:
             shifts = shifts.filter(status=ShiftStatusChoices.CLOSED)
 
-        start_param = request.GET.get("start")
-        end_param = request.GET.get("end")
+        start_param = params.get("start")
+        end_param = params.get("end")
         if start_param and end_param:
-            try:
-                start_date = datetime.strptime(start_param, "%Y-%m-%d").date()
-                end_date = datetime.strptime(end_param, "%Y-%m-%d").date()
-                tz = _get_warehouse_tz()
-                start_dt = timezone.make_aware(
-                    datetime.combine(start_date, time.min), timezone=tz
-                )
-                end_dt = timezone.make_aware(
-                    datetime.combine(end_date, time.max), timezone=tz
-                )
-                shifts = shifts.filter(start_at__gte=start_dt, start_at__lte=end_dt)
-            except ValueError:
-                return JsonResponse({"error": "Invalid date range"}, status=400)
-
-        data = [_serialize_shift(s) for s in shifts.order_by("start_at")]
-        return JsonResponse(data, safe=False)
+            start_date = datetime.strptime(start_param, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end_param, "%Y-%m-%d").date()
+            tz = _get_warehouse_tz()
+            start_dt = timezone.make_aware(
+                datetime.combine(start_date, time.min), timezone=tz
+            )
+            end_dt = timezone.make_aware(
+                datetime.combine(end_date, time.max), timezone=tz
+            )
+            shifts = shifts.filter(start_at__gte=start_dt, start_at__lte=end_dt)
+        return shifts.order_by("start_at")
 
     def post(self, request):
         try:
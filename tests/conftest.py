@@ -5,6 +5,7 @@ import sys
 from pathlib import Path
 
 import django
+import pytest
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -12,3 +13,14 @@ if str(PROJECT_ROOT) not in sys.path:
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()
+
+
+@pytest.fixture(autouse=True)
+def board_cache(tmp_path):
+    # Keep cached responses out of the dev cache in data/cache/board.
+    from django.conf import settings
+    from django.test import override_settings
+
+    board = {**settings.CACHES["board"], "LOCATION": str(tmp_path / "board-cache")}
+    with override_settings(CACHES={**settings.CACHES, "board": board}):
+        yield
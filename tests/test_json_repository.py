@@ -0,0 +1,310 @@
+import json
+
+from src.domain.models import LoadFormat, LoadGroup, LoadRecord, LoadStatus
+from src.infrastructure.json_repository import JsonRepository
+
+
+def _small_load(route_code, shift_id=None, **kwargs):
+    return LoadRecord(
+        client_name=f"Client {route_code}",
+        expected_qty=10,
+        format=LoadFormat.SMALL,
+        route_code=route_code,
+        shift_id=shift_id,
+        **kwargs,
+    )
+
+
+def test_cached_reads_do_not_leak_mutations(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    load = _small_load("2601")
+    repo.save_load(load)
+
+    fetched = repo.get_load(load.id)
+    fetched.loaded_qty = 99
+    fetched.missing_refs.append("X")
+
+    again = repo.get_load(load.id)
+    assert again.loaded_qty == 0
+    assert again.missing_refs == []
+
+
+def test_external_file_change_invalidates_cache(tmp_path):
+    path = tmp_path / "loads.json"
+    repo = JsonRepository(str(path))
+    load = _small_load("2601")
+    repo.save_load(load)
+    assert repo.get_load(load.id) is not None
+
+    # Another worker rewrites the file behind our back.
+    data = json.loads(path.read_text())
+    data["loads"][0]["loaded_qty"] = 7
+    data["loads"][0]["client_name"] = "Changed elsewhere"
+    path.write_text(json.dumps(data))
+
+    assert repo.get_load(load.id).loaded_qty == 7
+    assert JsonRepository(str(path)).get_load(load.id).loaded_qty == 7
+
+
+def test_indexed_filters(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    active = _small_load("2601", shift_id="s1")
+    other_shift = _small_load("2602", shift_id="s2")
+    done = _small_load("2603", shift_id="s1", status=LoadStatus.COMPLETE)
+    done.loaded_qty = 10
+    walgreens = _small_load("2301", shift_id="s1")
+    for load in (active, other_shift, done, walgreens):
+        repo.save_load(load)
+
+    matches = repo.list_active_loads_by_group("small", "26", shift_id="s1")
+    assert [l.id for l in matches] == [active.id]
+
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10)
+    repo.save_group(group)
+    active.group_id = group.id
+    repo.save_load(active)
+    assert [l.id for l in repo.list_loads_by_group(group.id)] == [active.id]
+
+    repo.delete_group(group.id)
+    assert repo.get_load(active.id).group_id is None
+    assert repo.list_loads_by_group(group.id) == []
+
+
+def test_journal_appends_and_compacts(tmp_path):
+    path = tmp_path / "loads.json"
+    repo = JsonRepository(str(path), journal=True, compact_threshold=10_000)
+    snapshot_before = path.read_text()
+
+    load = _small_load("2601")
+    repo.save_load(load)
+    load.loaded_qty = 3
+    repo.save_load(load)
+
+    # Writes go to the journal only; the snapshot is untouched.
+    assert path.read_text() == snapshot_before
+    journal = tmp_path / "loads.json.0.journal"
+    assert len(journal.read_text().splitlines()) == 2
+
+    # A second process replays the journal over the snapshot.
+    other = JsonRepository(str(path), journal=True)
+    assert other.get_load(load.id).loaded_qty == 3
+
+    repo.compact()
+    assert not journal.exists()
+    data = json.loads(path.read_text())
+    assert data["journal_generation"] == 1
+    assert data["loads"][0]["loaded_qty"] == 3
+    assert other.get_load(load.id).loaded_qty == 3
+
+    # Past the threshold the journal is folded automatically.
+    for qty in range(4, 60):
+        load.loaded_qty = qty
+        repo.save_load(load)
+    assert json.loads(path.read_text())["journal_generation"] > 1
+    assert JsonRepository(str(path)).get_load(load.id).loaded_qty == 59
+
+
+def test_workers_sharing_a_file_do_not_lose_writes(tmp_path):
+    path = str(tmp_path / "loads.json")
+    worker_a = JsonRepository(path)
+    worker_b = JsonRepository(path, journal=True)
+    first = _small_load("2601")
+    second = _small_load("2801")
+
+    worker_a.get_load(first.id)  # both caches warm
+    worker_b.get_load(first.id)
+    worker_a.save_load(first)
+    worker_b.save_load(second)
+    worker_a.delete_load("missing")
+
+    for repo in (worker_a, worker_b, JsonRepository(path)):
+        assert {l.id for l in repo.list_all()} == {first.id, second.id}
+
+
+def test_group_commit_coalesces_concurrent_writes(tmp_path):
+    import threading
+
+    repo = JsonRepository(
+        str(tmp_path / "loads.json"),
+        journal=True,
+        group_commit=True,
+        commit_window=0.05,
+    )
+    loads = [_small_load(f"26{i:02d}") for i in range(8)]
+    barrier = threading.Barrier(len(loads))
+
+    def worker(load):
+        barrier.wait()
+        repo.save_load(load)
+
+    threads = [threading.Thread(target=worker, args=(l,)) for l in loads]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert repo.delete_load(loads[0].id) is True
+    assert repo.delete_load(loads[0].id) is False
+    reader = JsonRepository(str(tmp_path / "loads.json"))
+    assert {l.id for l in reader.list_all()} == {l.id for l in loads[1:]}
+
+
+def test_transaction_buffers_writes_until_exit(tmp_path):
+    path = tmp_path / "loads.json"
+    repo = JsonRepository(str(path))
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10)
+    repo.save_group(group)
+    before = path.read_text()
+
+    load = _small_load("2601", group_id=group.id, status=LoadStatus.IN_PROCESS)
+    with repo.transaction():
+        repo.save_load(load)
+        assert repo.get_load(load.id) is not None
+        assert path.read_text() == before
+    assert JsonRepository(str(path)).get_load(load.id) is not None
+    assert repo.get_group(group.id).status == LoadStatus.IN_PROCESS
+
+    try:
+        with repo.transaction():
+            repo.delete_load(load.id)
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert repo.get_load(load.id) is not None
+
+
+def test_failed_commit_does_not_leave_applied_ops_in_the_cache(tmp_path, monkeypatch):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10)
+    repo.save_group(group)
+
+    def fail(touched):
+        raise RuntimeError("boom")
+
+    # Fails after the batch's ops were applied to the cache.
+    monkeypatch.setattr(repo, "_group_status_ops", fail)
+    load = _small_load("2601", group_id=group.id)
+    try:
+        with repo.transaction():
+            repo.save_load(load)
+    except RuntimeError:
+        pass
+    assert repo.get_load(load.id) is None
+
+
+def test_shift_totals_are_maintained_incrementally(tmp_path):
+    path = str(tmp_path / "loads.json")
+    repo = JsonRepository(path)
+    first = _small_load("2601", shift_id="s1", loaded_qty=3)
+    second = _small_load("2602", shift_id="s1")
+    repo.save_load(first)
+    repo.save_load(second)
+
+    first.loaded_qty = 8
+    repo.save_load(first)
+    repo.delete_load(second.id)
+    totals = repo.get_shift_totals("s1")
+    assert (totals.expected_small, totals.loaded_small, totals.load_count) == (
+        10,
+        8,
+        1,
+    )
+    assert JsonRepository(path).get_shift_totals("s1") == totals
+    assert repo.get_shift_totals("s2").load_count == 0
+
+
+def test_query_loads_filters_orders_and_pages(tmp_path):
+    from src.application.queries import LoadQuery
+
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    orders = ["P", "F", "MF", "M", "F"]
+    loads = [
+        _small_load(f"26{i:02d}", shift_id="s1", load_order=order)
+        for i, order in enumerate(orders)
+    ]
+    for load in loads + [_small_load("2699", shift_id="s2")]:
+        repo.save_load(load)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = repo.query_loads(
+            LoadQuery(shift_id="s1", order="load_order", limit=2, after=cursor)
+        )
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert [l.load_order for l in seen] == ["F", "F", "MF", "M", "P"]
+    assert len({l.id for l in seen}) == 5
+
+    newest, cursor = repo.query_loads(LoadQuery(route_prefix="26", order="-created_at"))
+    assert cursor is None and newest[0].shift_id == "s2"
+
+
+def test_bulk_insert_matches_individual_saves(tmp_path):
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10, shift_id="s1")
+    loads = [
+        _small_load("2601", shift_id="s1", status=LoadStatus.COMPLETE),
+        LoadRecord(
+            client_name="Large",
+            expected_qty=8,
+            format=LoadFormat.LARGE,
+            pallet_count=1,
+            group_id=group.id,
+            shift_id="s1",
+            status=LoadStatus.IN_PROCESS,
+        ),
+    ]
+    bulk = JsonRepository(str(tmp_path / "bulk.json"))
+    bulk.bulk_insert([group], iter(loads))
+    single = JsonRepository(str(tmp_path / "single.json"))
+    single.save_group(group)
+    for load in loads:
+        single.save_load(load)
+
+    reloaded = JsonRepository(str(tmp_path / "bulk.json"))
+    assert {l.id for l in reloaded.list_all()} == {l.id for l in loads}
+    assert reloaded.get_group(group.id).status == LoadStatus.IN_PROCESS
+    assert reloaded.get_shift_totals("s1") == single.get_shift_totals("s1")
+
+
+def test_store_id_of_an_older_snapshot_is_minted_once(tmp_path):
+    path = tmp_path / "loads.json"
+    path.write_text(json.dumps({"loads": [], "groups": []}))
+    first, second = JsonRepository(str(path)), JsonRepository(str(path))
+    assert first.get_data_version() == second.get_data_version() == 0
+
+    store_id = first.get_store_id()
+    assert second.get_store_id() == store_id
+    assert json.loads(path.read_text())["store_id"] == store_id
+
+
+def test_concurrent_increments_are_not_lost(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    from src.application.commands import IncrementLoadedCommand
+    from src.application.services import LoadService
+
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    load = _small_load("2601")
+    repo.save_load(load)
+    service = LoadService(repo)
+
+    # Widen the window between a command's read and its write.
+    get_load = repo.get_load
+    monkeypatch.setattr(
+        repo, "get_load", lambda load_id: (get_load(load_id), time.sleep(0.01))[0]
+    )
+
+    def worker():
+        for _ in range(3):
+            service.increment_loaded(IncrementLoadedCommand(load.id, 1))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert (
+        JsonRepository(str(tmp_path / "loads.json")).get_load(load.id).loaded_qty == 6
+    )
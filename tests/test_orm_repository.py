@@ -0,0 +1,287 @@
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from src.application.queries import LoadQuery
+from src.domain.models import LoadFormat, LoadGroup, LoadRecord, LoadStatus
+from src.infrastructure.orm_repository import OrmRepository
+
+
+@pytest.fixture
+def repo():
+    # Roll everything back so the tests leave the database untouched.
+    with transaction.atomic():
+        yield OrmRepository()
+        transaction.set_rollback(True)
+
+
+def _load_queries(ctx):
+    return [q["sql"] for q in ctx.captured_queries if 'warehouse_ui_load"' in q["sql"]]
+
+
+def _large_load(**kwargs):
+    return LoadRecord(
+        client_name="Client",
+        expected_qty=4,
+        format=LoadFormat.LARGE,
+        pallet_count=2,
+        **kwargs,
+    )
+
+
+def test_update_writes_only_changed_columns(repo):
+    load = _large_load()
+    with CaptureQueriesContext(connection) as ctx:
+        repo.save_load(load)
+    assert [sql.split()[0] for sql in _load_queries(ctx)] == ["INSERT"]
+
+    stored = repo.get_load(load.id)
+    stored.loaded_qty = 3
+    with CaptureQueriesContext(connection) as ctx:
+        repo.save_load(stored)
+    # A quantity change first reads the row it replaces for the shift totals.
+    read, sql = _load_queries(ctx)
+    assert read.startswith("SELECT") and '"client_name"' not in read
+    assert sql.startswith("UPDATE") and '"client_name"' not in sql
+
+    with CaptureQueriesContext(connection) as ctx:
+        repo.save_load(stored)
+    assert ctx.captured_queries == []
+    assert repo.get_load(load.id).loaded_qty == 3
+
+
+def test_group_sync_runs_only_on_status_or_membership_change(repo):
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10)
+    repo.save_group(group)
+    load = _large_load(group_id=group.id)
+    repo.save_load(load)
+
+    stored = repo.get_load(load.id)
+    stored.loaded_qty = 1
+    with CaptureQueriesContext(connection) as ctx:
+        repo.save_load(stored)
+    assert not any("loadgroup" in q["sql"] for q in ctx.captured_queries)
+
+    stored.status = LoadStatus.IN_PROCESS
+    repo.save_load(stored)
+    assert repo.get_group(group.id).status == LoadStatus.IN_PROCESS
+
+
+def test_shift_totals_are_kept_on_the_shift_row(repo):
+    from django.utils import timezone
+
+    from src.warehouse_ui.models import Shift
+    from src.warehouse_ui.views import _shift_payload
+
+    # Manually entered figures, shown until the shift has loads.
+    shift = Shift.objects.create(
+        start_at=timezone.now(), expected_large=50, loaded_large=10
+    )
+    load = _large_load(shift_id=str(shift.id))
+    repo.save_load(load)
+
+    stored = repo.get_load(load.id)
+    stored.loaded_qty = 3
+    repo.save_load(stored)
+    shift.refresh_from_db()
+    assert (shift.loads_expected_large, shift.loads_loaded_large) == (4, 3)
+    assert shift.load_count == 1
+    payload = _shift_payload(shift, repo.get_shift_totals(str(shift.id)))
+    assert (payload["expected_large"], payload["loaded_large"]) == (4, 3)
+
+    Shift.objects.filter(id=shift.id).update(loads_loaded_large=0)
+    repo.rebuild_shift_totals()
+    shift.refresh_from_db()
+    assert shift.loads_loaded_large == 3
+
+    assert repo.delete_load(load.id)
+    assert not repo.delete_load(load.id)
+    assert not repo.delete_load("not-a-uuid")
+    shift.refresh_from_db()
+    assert (shift.loads_expected_large, shift.load_count) == (0, 0)
+    assert (shift.expected_large, shift.loaded_large) == (50, 10)
+    payload = _shift_payload(shift, repo.get_shift_totals(str(shift.id)))
+    assert (payload["expected_large"], payload["loaded_large"]) == (50, 10)
+
+
+def test_shift_totals_follow_the_stored_row_not_a_stale_snapshot(repo):
+    from django.utils import timezone
+
+    from src.warehouse_ui.models import Shift
+
+    shift = Shift.objects.create(start_at=timezone.now())
+    load = _large_load(shift_id=str(shift.id))
+    repo.save_load(load)
+
+    # Two clients read the load; the second writes after the first.
+    first, second = repo.get_load(load.id), repo.get_load(load.id)
+    first.loaded_qty = 3
+    repo.save_load(first)
+    second.loaded_qty = 2
+    repo.save_load(second)
+
+    shift.refresh_from_db()
+    assert shift.loads_loaded_large == 2
+    repo.rebuild_shift_totals()
+    shift.refresh_from_db()
+    assert shift.loads_loaded_large == 2
+
+
+def test_query_loads_pages_in_the_database(repo):
+    from src.application.queries import LoadQuery
+
+    for order in ("P", "F", "M"):
+        repo.save_load(_large_load(load_order=order, vehicle_id="V9"))
+
+    query = LoadQuery(vehicle_id="V9", order="load_order", limit=2)
+    first, cursor = repo.query_loads(query)
+    rest, last = repo.query_loads(
+        LoadQuery(vehicle_id="V9", order="load_order", limit=2, after=cursor)
+    )
+    assert [l.load_order for l in first + rest] == ["F", "M", "P"]
+    assert last is None
+
+    by_time, _ = repo.query_loads(LoadQuery(vehicle_id="V9", order="-updated_at"))
+    assert len(by_time) == 3
+
+
+def test_data_version_is_bumped_by_writes(repo):
+    load = _large_load()
+    repo.save_load(load)
+    before = repo.get_data_version()
+
+    stored = repo.get_load(load.id)
+    stored.loaded_qty = 2
+    repo.save_load(stored)
+    assert repo.get_data_version() == before + 1
+    repo.save_load(stored)
+    assert repo.get_data_version() == before + 1
+
+
+def test_change_counters_are_upserted_per_canonical_shift(repo):
+    from django.utils import timezone
+
+    from src.warehouse_ui.models import ChangeCounter, Shift
+
+    shift = Shift.objects.create(start_at=timezone.now())
+    with CaptureQueriesContext(connection) as ctx:
+        seq = repo._bump_versions(shift.id)
+    assert len(ctx.captured_queries) == 1
+    assert repo._bump_versions(str(shift.id)) == seq + 1
+    assert ChangeCounter.objects.get(scope=str(shift.id)).value == 2
+
+    # However the client spells the id, it reads the same counter.
+    assert repo.get_data_version(str(shift.id).upper()) == 2
+    assert repo.get_data_version(shift.id.hex) == 2
+
+
+def test_cache_version_carries_the_store_epoch(repo):
+    from src.warehouse_ui.models import ChangeCounter
+
+    store_id = repo.get_store_id()
+    assert repo.get_cache_version() == f"{store_id}.{repo.get_data_version()}"
+
+    # A flushed database mints a new epoch on its next read.
+    ChangeCounter.objects.all().delete()
+    assert repo.get_cache_version() != f"{store_id}.0"
+    assert repo.get_cache_version().endswith(".0")
+
+
+def test_changes_since_include_tombstones(repo):
+    kept, gone = _large_load(), _large_load()
+    repo.save_load(kept)
+    repo.save_load(gone)
+    cursor = repo.get_change_cursor()
+
+    repo.delete_load(gone.id)
+    stored = repo.get_load(kept.id)
+    stored.loaded_qty = 1
+    repo.save_load(stored)
+
+    changes = repo.load_changes(cursor)
+    assert [l.id for l in changes.records] == [kept.id]
+    assert changes.deleted == [gone.id]
+    assert repo.load_changes(changes.cursor).records == []
+    assert repo.load_changes(changes.cursor + 1).reset
+
+
+def test_async_reads_share_the_request_connection(repo):
+    load = _large_load()
+    repo.save_load(load)
+    # Uncommitted: only visible on the connection of this test's transaction.
+    assert async_to_sync(repo.aget_load)(load.id) == repo.get_load(load.id)
+    loads, _ = async_to_sync(repo.aquery_loads)(LoadQuery(format="large"))
+    assert load.id in [l.id for l in loads]
+
+
+def test_generated_data_is_bulk_inserted_consistently(repo):
+    from django.core.management import call_command
+    from django.db.models import Sum
+
+    from src.warehouse_ui.models import Load, Shift
+
+    call_command(
+        "generate_warehouse_data",
+        backend="orm",
+        shifts=3,
+        loads=300,
+        seed=7,
+        until="2026-01-15",
+        stdout=StringIO(),
+    )
+    shifts = Shift.objects.filter(start_at__gte="2026-01-13T12:00:00Z")
+    assert shifts.count() == 3
+    assert Load.objects.filter(shift__in=shifts).count() == 300
+
+    for shift in shifts:
+        loads = Load.objects.filter(shift=shift)
+        totals = loads.filter(format="large").aggregate(Sum("expected_qty"))
+        assert shift.loads_expected_large == totals["expected_qty__sum"]
+        shift_loads = repo.list_loads_by_shift(str(shift.id))
+        for group in repo.list_groups_by_shift(str(shift.id)):
+            members = [l for l in shift_loads if l.group_id == group.id]
+            assert members and all(l.pallet_count for l in members)
+            statuses = {l.status.value for l in members}
+            assert group.status.value == OrmRepository._derived_group_status(statuses)
+
+
+@pytest.fixture
+def throwaway_db():
+    # Commits go to a fresh in-memory test database, not the dev database.
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@pytest.fixture
+def committing_views(throwaway_db, monkeypatch):
+    from src.application.services import LoadService
+    from src.warehouse_ui import views
+
+    repo = OrmRepository()
+    monkeypatch.setattr(views, "repo", repo)
+    monkeypatch.setattr(views, "service", LoadService(repo))
+    return repo
+
+
+def test_patch_with_unknown_group_is_rejected_at_commit(committing_views):
+    from django.test import Client
+
+    # No surrounding atomic block: the FK check is deferred to the commit.
+    repo = committing_views
+    load = _large_load()
+    repo.save_load(load)
+    response = Client().patch(
+        f"/api/loads/{load.id}/",
+        {"group_id": "00000000-0000-4000-8000-000000000000"},
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert response.json() == {"error": "Unknown group_id"}
+    assert repo.get_load(load.id).group_id is None
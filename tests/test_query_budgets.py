@@ -0,0 +1,197 @@
+"""
+Maximum SQL queries per API request on the ORM backend. Every route in
+src/warehouse_ui/urls.py has a budget, and each one is checked against a
+small and a ten times larger generated dataset with the same budget, so
+a query per load, group or shift fails here instead of in production.
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from src.application.services import LoadService
+from src.infrastructure.orm_repository import OrmRepository
+from src.warehouse_ui import urls, views
+from src.warehouse_ui.models import Load, LoadGroup, Shift, ShiftStatusChoices
+
+# (shifts, loads) of each dataset; the budgets must hold for all of them.
+DATASETS = {"small": (2, 40), "large": (20, 400)}
+
+# (method, url name) -> most queries one request may run.
+BUDGETS = {
+    ("GET", "index"): 0,
+    ("GET", "calendar"): 0,
+    ("GET", "metrics"): 0,
+    ("GET", "profile-list"): 0,
+    ("GET", "profile-file"): 0,
+    ("GET", "config"): 1,
+    ("GET", "board"): 8,
+    ("GET", "board-stream"): 0,
+    ("GET", "load-list"): 4,
+    ("POST", "load-list"): 17,
+    ("GET", "load-detail"): 1,
+    ("PATCH", "load-detail"): 13,
+    ("DELETE", "load-detail"): 7,
+    ("GET", "group-list"): 4,
+    ("POST", "group-list"): 4,
+    ("GET", "group-detail"): 3,
+    ("PATCH", "group-detail"): 5,
+    ("DELETE", "group-detail"): 11,
+    ("GET", "shift-list"): 1,
+    ("POST", "shift-list"): 1,
+    ("GET", "shift-detail"): 1,
+    ("PATCH", "shift-detail"): 2,
+    ("DELETE", "shift-detail"): 4,
+}
+
+
+@pytest.fixture(params=list(DATASETS))
+def dataset(request, monkeypatch):
+    shifts, loads = DATASETS[request.param]
+    # Roll everything back so the tests leave the database untouched.
+    with transaction.atomic():
+        call_command(
+            "generate_warehouse_data",
+            backend="orm",
+            shifts=shifts,
+            loads=loads,
+            seed=3,
+            until="2026-02-01",
+            stdout=StringIO(),
+        )
+        repo = OrmRepository()
+        monkeypatch.setattr(views, "repo", repo)
+        monkeypatch.setattr(views, "service", LoadService(repo))
+        yield _targets()
+        transaction.set_rollback(True)
+
+
+def _targets():
+    open_shift = Shift.objects.get(status=ShiftStatusChoices.OPEN)
+    closed_shift = Shift.objects.filter(status=ShiftStatusChoices.CLOSED).first()
+    group = LoadGroup.objects.filter(shift=open_shift).first()
+    load = Load.objects.filter(shift=open_shift, group=group).first()
+    spare = Load.objects.filter(shift=closed_shift).first()
+    return {
+        "shift_id": str(open_shift.id),
+        "closed_shift_id": str(closed_shift.id),
+        "group_id": str(group.id),
+        "load_id": str(load.id),
+        "spare_load_id": str(spare.id),
+    }
+
+
+def _requests(t):
+    """(method, url name) -> (path, JSON body) against dataset targets ``t``."""
+    shift_query = f"?shift_id={t['shift_id']}"
+    return {
+        ("GET", "index"): (reverse("index"), None),
+        ("GET", "calendar"): (reverse("calendar"), None),
+        ("GET", "metrics"): (reverse("metrics"), None),
+        ("GET", "profile-list"): (reverse("profile-list"), None),
+        ("GET", "profile-file"): (
+            reverse("profile-file", args=["load-list", "20260101T000000000000Z.json"]),
+            None,
+        ),
+        ("GET", "config"): (reverse("config"), None),
+        ("GET", "board"): (reverse("board") + shift_query, None),
+        ("GET", "board-stream"): (reverse("board-stream") + shift_query, None),
+        ("GET", "load-list"): (reverse("load-list") + shift_query, None),
+        ("POST", "load-list"): (
+            reverse("load-list"),
+            {
+                "client_name": "Budget",
+                "expected_qty": 12,
+                "format": "large",
+                "pallet_count": 2,
+                "shift_id": t["shift_id"],
+                "group_id": t["group_id"],
+                "vehicle_id": "V-1",
+            },
+        ),
+        ("GET", "load-detail"): (reverse("load-detail", args=[t["load_id"]]), None),
+        ("PATCH", "load-detail"): (
+            reverse("load-detail", args=[t["load_id"]]),
+            {"loaded_qty": 1, "status": "in_process"},
+        ),
+        ("DELETE", "load-detail"): (
+            reverse("load-detail", args=[t["spare_load_id"]]),
+            None,
+        ),
+        ("GET", "group-list"): (reverse("group-list") + shift_query, None),
+        ("POST", "group-list"): (
+            reverse("group-list"),
+            {"vehicle_id": "V-2", "max_pallet_count": 18, "shift_id": t["shift_id"]},
+        ),
+        ("GET", "group-detail"): (reverse("group-detail", args=[t["group_id"]]), None),
+        ("PATCH", "group-detail"): (
+            reverse("group-detail", args=[t["group_id"]]),
+            {"max_pallet_count": 26},
+        ),
+        ("DELETE", "group-detail"): (
+            reverse("group-detail", args=[t["group_id"]]),
+            None,
+        ),
+        ("GET", "shift-list"): (
+            reverse("shift-list")
+            + "?start=2025-12-01&end=2026-02-28&include_open=true",
+            None,
+        ),
+        ("POST", "shift-list"): (
+            reverse("shift-list"),
+            {"start_at": "2026-03-01T06:00:00Z", "end_at": "2026-03-01T18:00:00Z"},
+        ),
+        ("GET", "shift-detail"): (
+            reverse("shift-detail", args=[t["closed_shift_id"]]),
+            None,
+        ),
+        ("PATCH", "shift-detail"): (
+            reverse("shift-detail", args=[t["closed_shift_id"]]),
+            {"expected_small": 5},
+        ),
+        ("DELETE", "shift-detail"): (
+            reverse("shift-detail", args=[t["closed_shift_id"]]),
+            None,
+        ),
+    }
+
+
+def test_every_route_has_a_budget():
+    names = {pattern.name for pattern in urls.urlpatterns}
+    assert names == {name for _, name in BUDGETS}
+
+
+@pytest.mark.parametrize("method, name", list(BUDGETS))
+def test_route_stays_within_query_budget(dataset, method, name):
+    path, body = _requests(dataset)[(method, name)]
+    client = Client()
+    send = getattr(client, method.lower())
+    with CaptureQueriesContext(connection) as ctx:
+        if body is None:
+            response = send(path)
+        else:
+            response = send(path, body, content_type="application/json")
+    # Forbidden profiles, the WSGI-only 501 of the stream and /metrics
+    # without prometheus_client still must not touch the database.
+    assert response.status_code < 400 or name in (
+        "profile-list",
+        "profile-file",
+        "board-stream",
+        "metrics",
+    )
+
+    budget = BUDGETS[(method, name)]
+    if len(ctx.captured_queries) > budget:
+        queries = "\n".join(
+            f"  {i}. {query['sql']}" for i, query in enumerate(ctx, start=1)
+        )
+        pytest.fail(
+            f"{method} {path} ran {len(ctx.captured_queries)} queries, "
+            f"budget {budget}:\n{queries}",
+            pytrace=False,
+        )
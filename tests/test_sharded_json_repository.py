@@ -0,0 +1,110 @@
+import json
+
+from src.domain.models import LoadFormat, LoadGroup, LoadRecord, LoadStatus
+from src.infrastructure.json_repository import JsonRepository
+from src.infrastructure.sharded_json_repository import ShardedJsonRepository
+
+
+def _load(shift_id, route_code="2601", **kwargs):
+    return LoadRecord(
+        client_name="Client",
+        expected_qty=10,
+        format=LoadFormat.SMALL,
+        route_code=route_code,
+        shift_id=shift_id,
+        **kwargs,
+    )
+
+
+def test_shift_scoped_calls_only_open_one_shard(tmp_path):
+    writer = ShardedJsonRepository(str(tmp_path / "shifts"))
+    old = _load("old-shift")
+    current = _load("current-shift")
+    loose = _load(None, route_code="2801")
+    for load in (old, current, loose):
+        writer.save_load(load)
+
+    manifest = json.loads((tmp_path / "shifts" / "manifest.json").read_text())
+    assert set(manifest["shards"]) == {"old-shift", "current-shift", "unassigned"}
+
+    reader = ShardedJsonRepository(str(tmp_path / "shifts"))
+    active = reader.list_active_loads_by_group("small", "26", shift_id="current-shift")
+    assert [l.id for l in active] == [current.id]
+    assert [l.id for l in reader.list_loads_by_shift("current-shift")] == [current.id]
+    assert set(reader._shards) == {"current-shift"}
+
+    assert reader.get_load(old.id).shift_id == "old-shift"
+    assert {l.id for l in reader.list_all()} == {old.id, current.id, loose.id}
+
+
+def test_group_status_syncs_within_shard(tmp_path):
+    repo = ShardedJsonRepository(str(tmp_path / "shifts"))
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10, shift_id="s1")
+    repo.save_group(group)
+    load = _load("s1", group_id=group.id)
+    repo.save_load(load)
+
+    load.status = LoadStatus.IN_PROCESS
+    repo.save_load(load)
+    assert repo.get_group(group.id).status == LoadStatus.IN_PROCESS
+    assert [l.id for l in repo.list_loads_by_group(group.id)] == [load.id]
+
+    assert repo.delete_group(group.id)
+    assert repo.get_load(load.id).group_id is None
+
+
+def test_import_single_file(tmp_path):
+    source = JsonRepository(str(tmp_path / "loads.json"))
+    loads = [_load("a"), _load("a", route_code="2801"), _load("b"), _load(None)]
+    for load in loads:
+        source.save_load(load)
+    source.save_group(LoadGroup(vehicle_id="V1", max_pallet_count=4, shift_id="b"))
+
+    repo = ShardedJsonRepository(str(tmp_path / "shifts"))
+    counts = repo.import_single_file(str(tmp_path / "loads.json"))
+
+    assert counts == {"a": 2, "b": 1, "unassigned": 1}
+    assert {l.id for l in repo.list_all()} == {l.id for l in loads}
+    assert len(repo.list_groups_by_shift("b")) == 1
+
+
+def test_point_lookups_open_only_the_indexed_shard(tmp_path):
+    writer = ShardedJsonRepository(str(tmp_path / "shifts"))
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10, shift_id="s1")
+    writer.save_group(group)
+    home = _load("s1", group_id=group.id)
+    away = _load("s2", group_id=group.id)
+    for load in (home, away, _load("s3")):
+        writer.save_load(load)
+
+    # Ids are indexed per shard; the manifest only lists the shards.
+    manifest = json.loads((tmp_path / "shifts" / "manifest.json").read_text())
+    assert set(manifest) == {"version", "store_id", "shards"}
+
+    reader = ShardedJsonRepository(str(tmp_path / "shifts"))
+    assert reader.get_load(away.id).shift_id == "s2"
+    assert reader.get_load("missing") is None
+    assert set(reader._shards) == {"s2"}
+
+    reader = ShardedJsonRepository(str(tmp_path / "shifts"))
+    assert reader.delete_group(group.id)
+    assert set(reader._shards) == {"s1", "s2"}
+    assert reader.get_load(away.id).group_id is None
+    assert reader.get_group(group.id) is None
+
+    # Ids appended by another writer are picked up on the next miss.
+    late = _load("s3")
+    writer.save_load(late)
+    assert reader.get_load(late.id).id == late.id
+
+
+def test_id_index_is_built_for_older_shards(tmp_path):
+    repo = ShardedJsonRepository(str(tmp_path / "shifts"))
+    load = _load("s1")
+    repo.save_load(load)
+    index_path = tmp_path / "shifts" / "s1.json.ids"
+    index_path.unlink()
+
+    reader = ShardedJsonRepository(str(tmp_path / "shifts"))
+    assert reader.get_load(load.id).id == load.id
+    assert index_path.read_text() == f"+L {load.id}\n"
@@ -0,0 +1,107 @@
+from src.domain.models import LoadFormat, LoadGroup, LoadRecord, LoadStatus
+from src.infrastructure.sqlite_repository import SqliteRepository
+
+
+def _load(route_code, shift_id="s1", **kwargs):
+    return LoadRecord(
+        client_name="Client",
+        expected_qty=10,
+        format=LoadFormat.SMALL,
+        route_code=route_code,
+        shift_id=shift_id,
+        **kwargs,
+    )
+
+
+def test_round_trip_and_indexed_filters(tmp_path):
+    repo = SqliteRepository(str(tmp_path / "loads.sqlite3"))
+    active = _load("2601", missing_refs=["4x 123"], is_na=True)
+    other_route = _load("2301")
+    done = _load("2602", status=LoadStatus.COMPLETE, loaded_qty=10)
+    unassigned = _load("2603", shift_id=None)
+    for load in (active, other_route, done, unassigned):
+        repo.save_load(load)
+
+    assert repo.get_load(active.id) == active
+    matches = repo.list_active_loads_by_group("small", "26", shift_id="s1")
+    assert [l.id for l in matches] == [active.id]
+    none_shift = repo.list_active_loads_by_group("small", "26", shift_id=None)
+    assert [l.id for l in none_shift] == [unassigned.id]
+    assert len(repo.list_loads_by_shift("s1")) == 3
+
+    plan = repo._conn().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM loads WHERE shift_id IS ? "
+        "AND status != ? AND format = ? AND route_code >= ? AND route_code < ?",
+        ("s1", "complete", "small", "26", "27"),
+    )
+    assert "loads_shift_status_format_route" in " ".join(r[-1] for r in plan)
+
+
+def test_group_status_follows_loads(tmp_path):
+    repo = SqliteRepository(str(tmp_path / "loads.sqlite3"))
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10, shift_id="s1")
+    repo.save_group(group)
+    load = _load("2601", group_id=group.id, status=LoadStatus.IN_PROCESS)
+    repo.save_load(load)
+    assert repo.get_group(group.id).status == LoadStatus.IN_PROCESS
+
+    assert repo.delete_group(group.id)
+    assert repo.get_load(load.id).group_id is None
+    assert repo.delete_load(load.id)
+    assert not repo.delete_load(load.id)
+
+
+def test_shift_totals_follow_writes(tmp_path):
+    path = str(tmp_path / "loads.sqlite3")
+    repo = SqliteRepository(path)
+    small = _load("2601", loaded_qty=4)
+    large = LoadRecord(
+        client_name="Big", expected_qty=6, format=LoadFormat.LARGE, shift_id="s1"
+    )
+    repo.save_load(small)
+    repo.save_load(large)
+
+    small.loaded_qty = 9
+    repo.save_load(small)
+    totals = repo.get_shift_totals("s1")
+    assert (totals.expected_small, totals.loaded_small) == (10, 9)
+    assert (totals.expected_large, totals.load_count) == (6, 2)
+
+    small.shift_id = "s2"
+    repo.save_load(small)
+    repo.delete_load(large.id)
+    assert repo.get_shift_totals("s1").load_count == 0
+    assert repo.get_shift_totals("s2").loaded_small == 9
+
+    repo._conn().execute("DELETE FROM shift_totals")
+    repo.rebuild_shift_totals()
+    assert repo.get_shift_totals("s2").loaded_small == 9
+
+
+def test_query_loads_pages_with_a_cursor(tmp_path):
+    from src.application.queries import LoadQuery
+
+    repo = SqliteRepository(str(tmp_path / "loads.sqlite3"))
+    loads = [_load(f"26{i:02d}", load_order=o) for i, o in enumerate("PFMFM")]
+    for load in loads:
+        repo.save_load(load)
+
+    first, cursor = repo.query_loads(LoadQuery(order="load_order", limit=3))
+    rest, last = repo.query_loads(LoadQuery(order="load_order", limit=3, after=cursor))
+    assert last is None
+    assert [l.load_order for l in first + rest] == ["F", "F", "M", "M", "P"]
+    assert repo.query_loads(LoadQuery(route_prefix="2603"))[0][0].id == loads[3].id
+
+
+def test_data_version_tracks_writes_per_shift(tmp_path):
+    repo = SqliteRepository(str(tmp_path / "loads.sqlite3"))
+    load = _load("2601")
+    repo.save_load(load)
+    before = repo.get_data_version("s1"), repo.get_data_version()
+
+    repo.save_load(_load("2602", shift_id="s2"))
+    assert repo.get_data_version("s1") == before[0]
+    assert repo.get_data_version() > before[1]
+
+    repo.delete_load(load.id)
+    assert repo.get_data_version("s1") > before[0]
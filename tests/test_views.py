@@ -1,11 +1,17 @@
+import asyncio
+import gzip
 import json
 
-from django.test import RequestFactory
+import pytest
+from asgiref.sync import async_to_sync
+
+from django.test import AsyncClient, Client, RequestFactory, override_settings
 
 from src.application.services import LoadService
-from src.domain.models import LoadFormat
+from src.domain.models import LoadFormat, LoadGroup, LoadRecord
 from src.infrastructure.json_repository import JsonRepository
-from src.warehouse_ui import views
+from src.warehouse_ui import metrics, traffic, views
+from src.warehouse_ui.instrumentation import InstrumentedRepository
 
 
 def _post_load(factory, payload):
@@ -46,3 +52,423 @@ def test_route_conflict_reports_domain_error(tmp_path):
     data = json.loads(second_resp.content)
     assert data.get("code") == "ROUTE_CONFLICT"
     assert "already running route" in data.get("error", "").lower()
+
+
+def test_load_list_is_paginated_with_a_cursor_header(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    for route in ("2601", "2301", "2801"):
+        payload = {"client_name": route, "expected_qty": 5, "format": "small"}
+        assert _post_load(factory, {**payload, "route_code": route}).status_code == 201
+
+    list_view = views.LoadListCreateView.as_view()
+    first = list_view(factory.get("/api/loads/", {"limit": 2}))
+    assert len(json.loads(first.content)) == 2
+    cursor = first["X-Next-Cursor"]
+
+    rest = list_view(factory.get("/api/loads/", {"limit": 2, "after": cursor}))
+    assert len(json.loads(rest.content)) == 1
+    assert not rest.has_header("X-Next-Cursor")
+
+    bad = list_view(factory.get("/api/loads/", {"after": "not-a-cursor"}))
+    assert bad.status_code == 400
+
+
+def test_unchanged_polls_get_304(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    list_view = views.LoadListCreateView.as_view()
+
+    first = list_view(factory.get("/api/loads/"))
+    etag = first["ETag"]
+    again = list_view(factory.get("/api/loads/", HTTP_IF_NONE_MATCH=etag))
+    assert again.status_code == 304
+
+    payload = {"client_name": "A", "expected_qty": 5, "format": "small"}
+    _post_load(factory, {**payload, "route_code": "2601"})
+    changed = list_view(factory.get("/api/loads/", HTTP_IF_NONE_MATCH=etag))
+    assert changed.status_code == 200 and changed["ETag"] != etag
+
+
+def test_reset_store_does_not_reuse_cached_payloads(tmp_path):
+    factory = RequestFactory()
+    list_view = views.LoadListCreateView.as_view()
+    payload = {"expected_qty": 5, "format": "small", "route_code": "2601"}
+    etags = []
+    for name in ("Before reset", "After reset"):
+        # Same path and version each time; only the store differs.
+        (tmp_path / "loads.json").unlink(missing_ok=True)
+        repo = JsonRepository(str(tmp_path / "loads.json"))
+        views.repo = repo
+        views.service = LoadService(repo)
+        _post_load(factory, {**payload, "client_name": name})
+        response = list_view(factory.get("/api/loads/"))
+        assert [l["client_name"] for l in json.loads(response.content)] == [name]
+        etags.append(response["ETag"])
+    assert etags[0] != etags[1]
+
+
+def test_since_returns_changes_and_tombstones(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    list_view = views.LoadListCreateView.as_view()
+    payload = {"client_name": "A", "expected_qty": 5, "format": "small"}
+    kept = json.loads(_post_load(factory, {**payload, "route_code": "2601"}).content)
+    gone = json.loads(_post_load(factory, {**payload, "route_code": "2301"}).content)
+
+    cursor = list_view(factory.get("/api/loads/"))["X-Change-Cursor"]
+    repo.delete_load(gone["id"])
+    stored = repo.get_load(kept["id"])
+    stored.loaded_qty = 2
+    repo.save_load(stored)
+
+    delta = json.loads(list_view(factory.get("/api/loads/", {"since": cursor})).content)
+    assert [l["id"] for l in delta["changes"]] == [kept["id"]]
+    assert delta["deleted"] == [gone["id"]]
+    assert delta["reset"] is False
+
+    again = list_view(factory.get("/api/loads/", {"since": delta["cursor"]}))
+    assert json.loads(again.content)["changes"] == []
+
+
+def test_board_stream_pushes_committed_writes(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    payload = {"client_name": "A", "expected_qty": 5, "format": "small"}
+
+    async def scenario():
+        client = AsyncClient()
+        response = await client.get("/api/stream/")
+        assert response["Content-Type"] == "text/event-stream"
+        events = aiter(response.streaming_content)
+        ready = await anext(events)
+        created = await client.post(
+            "/api/loads/",
+            json.dumps({**payload, "route_code": "2601"}),
+            content_type="application/json",
+        )
+        # The write wakes the stream long before its next poll would.
+        pushed = await asyncio.wait_for(anext(events), 5)
+        await events.aclose()
+        return ready, json.loads(created.content), pushed
+
+    with override_settings(BOARD_STREAM_POLL_SECONDS=60):
+        ready, created, pushed = asyncio.run(scenario())
+
+    assert b"event: ready" in ready
+    event, data = pushed.decode().split("\n")[:2]
+    assert event == "event: loads"
+    change = json.loads(data.removeprefix("data: "))
+    assert [l["id"] for l in change["changes"]] == [created["id"]]
+
+
+def test_board_streams_share_one_poller_for_other_workers_writes(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    # Another worker: same file, its own repository, no notification.
+    other_worker = JsonRepository(str(tmp_path / "loads.json"))
+
+    async def scenario():
+        client = AsyncClient()
+        streams = []
+        for _ in range(2):
+            response = await client.get("/api/stream/")
+            streams.append(aiter(response.streaming_content))
+            await anext(streams[-1])
+        assert len(views._stream_watcher._watches) == 1
+
+        load = LoadRecord(client_name="A", expected_qty=5, format=LoadFormat.SMALL)
+        other_worker.save_load(load)
+        pushed = [await asyncio.wait_for(anext(s), 5) for s in streams]
+        for stream in streams:
+            await stream.aclose()
+        return load, pushed
+
+    with override_settings(BOARD_STREAM_POLL_SECONDS=0.05):
+        load, pushed = asyncio.run(scenario())
+
+    for chunk in pushed:
+        event, data = chunk.decode().split("\n")[:2]
+        assert event == "event: loads"
+        assert [
+            l["id"] for l in json.loads(data.removeprefix("data: "))["changes"]
+        ] == [load.id]
+
+
+def test_board_stream_needs_asgi():
+    assert Client().get("/api/stream/").status_code == 501
+
+
+def test_board_returns_loads_and_group_members_in_one_response(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=26, shift_id="s1")
+    repo.save_group(group)
+    payload = {"client_name": "A", "expected_qty": 5, "shift_id": "s1"}
+    large = {**payload, "format": "large", "pallet_count": 2}
+    member = _post_load(factory, {**large, "group_id": group.id})
+    loose = _post_load(factory, {**payload, "format": "small", "route_code": "2601"})
+    _post_load(factory, {**payload, "format": "small", "shift_id": "s2"})
+
+    board_view = views.BoardView.as_view()
+    response = board_view(factory.get("/api/board/", {"shift_id": "s1"}))
+    board = json.loads(response.content)
+    member_id = json.loads(member.content)["id"]
+    assert {l["id"] for l in board["loads"]} == {
+        member_id,
+        json.loads(loose.content)["id"],
+    }
+    assert [g["load_ids"] for g in board["groups"]] == [[member_id]]
+    assert set(board["config"]) == {"warehouse_time_zone", "active_shift_id"}
+    assert response["X-Change-Cursor"]
+
+    etag = response["ETag"]
+    again = board_view(
+        factory.get("/api/board/", {"shift_id": "s1"}, HTTP_IF_NONE_MATCH=etag)
+    )
+    assert again.status_code == 304
+
+
+def test_board_reads_are_cached_until_the_next_write(tmp_path, monkeypatch):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    list_view = views.LoadListCreateView.as_view()
+    payload = {"client_name": "A", "expected_qty": 5, "format": "small"}
+    _post_load(factory, {**payload, "route_code": "2601"})
+
+    queries = []
+    query_loads = repo.query_loads
+    monkeypatch.setattr(
+        repo, "query_loads", lambda q: queries.append(q) or query_loads(q)
+    )
+    board_cache = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    with override_settings(CACHES={"default": board_cache, "board": board_cache}):
+        first = list_view(factory.get("/api/loads/"))
+        second = list_view(factory.get("/api/loads/"))
+        assert len(queries) == 1
+        assert second.content == first.content
+        assert second["X-Change-Cursor"] == first["X-Change-Cursor"]
+
+        _post_load(factory, {**payload, "route_code": "2301"})
+        third = list_view(factory.get("/api/loads/"))
+        assert len(queries) == 2
+        assert len(json.loads(third.content)) == 2
+
+
+def test_group_detail_is_cached_under_the_groups_shift(tmp_path, monkeypatch):
+    from src.infrastructure.sharded_json_repository import ShardedJsonRepository
+
+    writer = ShardedJsonRepository(str(tmp_path / "shifts"))
+    group = LoadGroup(vehicle_id="V1", max_pallet_count=10, shift_id="s1")
+    writer.save_group(group)
+    member = LoadRecord(
+        client_name="A",
+        expected_qty=5,
+        format=LoadFormat.LARGE,
+        pallet_count=1,
+        group_id=group.id,
+        shift_id="s1",
+    )
+    writer.save_load(member)
+    writer.save_load(
+        LoadRecord(
+            client_name="B", expected_qty=5, format=LoadFormat.SMALL, shift_id="s2"
+        )
+    )
+
+    repo = ShardedJsonRepository(str(tmp_path / "shifts"))
+    monkeypatch.setattr(views, "repo", repo)
+    detail = views.GroupDetailView.as_view()
+    path = f"/api/groups/{group.id}/"
+    first = detail(RequestFactory().get(path), group_id=group.id)
+    assert first.status_code == 200
+    assert set(repo._shards) == {"s1"}
+
+    member.loaded_qty = 3
+    writer.save_load(member)
+    with override_settings(ASYNC_READ_VIEWS=True):
+        response = async_to_sync(views.GroupDetailView.as_view())(
+            RequestFactory().get(path), group_id=group.id
+        )
+    assert json.loads(response.content)["loads"][0]["loaded_qty"] == 3
+    assert set(repo._shards) == {"s1"}
+
+
+def test_large_api_responses_are_compressed(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    payload = {"expected_qty": 5, "format": "large", "pallet_count": 1}
+    for i in range(20):
+        _post_load(factory, {**payload, "client_name": f"Client {i}"})
+
+    client = Client()
+    plain = client.get("/api/loads/")
+    assert not plain.has_header("Content-Encoding")
+    gzipped = client.get("/api/loads/", headers={"Accept-Encoding": "gzip"})
+    assert gzipped["Content-Encoding"] == "gzip"
+    assert gzip.decompress(gzipped.content) == plain.content
+    assert gzipped["Vary"].endswith("Accept-Encoding")
+
+
+def test_async_read_views_match_the_sync_ones(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    factory = RequestFactory()
+    payload = {"client_name": "A", "expected_qty": 5, "format": "small"}
+    _post_load(factory, {**payload, "route_code": "2601"})
+    sync_list = views.LoadListCreateView.as_view()(factory.get("/api/loads/"))
+    sync_config = views.ConfigView.as_view()(factory.get("/api/config/"))
+
+    with override_settings(ASYNC_READ_VIEWS=True):
+        list_view = async_to_sync(views.LoadListCreateView.as_view())
+        listed = list_view(factory.get("/api/loads/"))
+        assert listed.content == sync_list.content
+        assert listed["ETag"] == sync_list["ETag"]
+        etag = sync_list["ETag"]
+        unchanged = list_view(factory.get("/api/loads/", HTTP_IF_NONE_MATCH=etag))
+        assert unchanged.status_code == 304
+
+        # Writes keep their sync handler, run off the event loop.
+        created = list_view(
+            factory.post(
+                "/api/loads/",
+                json.dumps({**payload, "route_code": "2301"}),
+                content_type="application/json",
+            )
+        )
+        assert created.status_code == 201
+        assert len(json.loads(list_view(factory.get("/api/loads/")).content)) == 2
+
+        config = async_to_sync(views.ConfigView.as_view())(factory.get("/api/config/"))
+        assert config.content == sync_config.content
+
+
+def test_sampled_requests_report_server_timing(tmp_path, caplog):
+    repo = InstrumentedRepository(JsonRepository(str(tmp_path / "loads.json")))
+    views.repo = repo
+    views.service = LoadService(repo)
+
+    with override_settings(REQUEST_TIMING_SAMPLE_RATE=1):
+        with caplog.at_level("INFO", logger="src.warehouse_ui.instrumentation"):
+            response = Client().get("/api/loads/")
+    timing = response["Server-Timing"]
+    assert "repo;dur=" in timing and '"0 calls"' not in timing
+    assert "serialize;dur=" in timing and "total;dur=" in timing
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["view"] == "load-list" and record["repo_count"] >= 2
+
+    with override_settings(REQUEST_TIMING_SAMPLE_RATE=0):
+        assert not Client().get("/api/loads/").has_header("Server-Timing")
+
+
+@pytest.mark.skipif(metrics.enabled(), reason="prometheus_client is installed")
+def test_metrics_endpoint_needs_prometheus_client():
+    assert Client().get("/metrics").status_code == 501
+
+
+def test_metrics_endpoint_exposes_view_and_repository_latency(tmp_path):
+    pytest.importorskip("prometheus_client")
+    repo = InstrumentedRepository(JsonRepository(str(tmp_path / "loads.json")))
+    views.repo = repo
+    views.service = LoadService(repo)
+    Client().get("/api/loads/")
+
+    body = Client().get("/metrics").content.decode()
+    assert 'warehouse_http_request_duration_seconds_count{method="GET"' in body
+    assert 'backend="JsonRepository",operation="query_loads"' in body
+
+
+def test_profile_token_captures_request_and_lists_it(tmp_path):
+    repo = JsonRepository(str(tmp_path / "loads.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    client = Client()
+
+    with override_settings(PROFILING_TOKEN="secret", PROFILES_DIR=str(tmp_path / "p")):
+        assert client.get("/api/loads/").status_code == 200
+        assert client.get("/profiles/").status_code == 403
+        client.get("/api/loads/", HTTP_X_PROFILE_TOKEN="wrong")
+        # A query the board cache has not seen, so the listing really runs.
+        client.get("/api/loads/", {"limit": 5}, HTTP_X_PROFILE_TOKEN="secret")
+
+        listing = client.get("/profiles/", HTTP_X_PROFILE_TOKEN="secret").json()
+        assert len(listing["profiles"]) == 1
+        profile = listing["profiles"][0]
+        assert profile["view"] == "load-list"
+        assert profile["path"] == "/api/loads/?limit=5"
+
+        stacks = client.get(profile["collapsed"], HTTP_X_PROFILE_TOKEN="secret")
+        text = b"".join(stacks.streaming_content).decode()
+        assert "query_loads (json_repository.py:" in text
+        escape = client.get(
+            "/profiles/load-list/..%2Fsecret.pstats", HTTP_X_PROFILE_TOKEN="secret"
+        )
+        assert escape.status_code == 404
+        for view in ("..", "../p", "load-list/.."):
+            listed = client.get(
+                "/profiles/", {"view": view}, HTTP_X_PROFILE_TOKEN="secret"
+            )
+            assert listed.status_code == 404
+        narrowed = client.get(
+            "/profiles/", {"view": "load-list"}, HTTP_X_PROFILE_TOKEN="secret"
+        )
+        assert len(narrowed.json()["profiles"]) == 1
+
+
+def test_recorded_traffic_replays_against_a_fresh_repository(tmp_path):
+    capture = tmp_path / "traffic.jsonl"
+    repo = JsonRepository(str(tmp_path / "recorded.json"))
+    views.repo = repo
+    views.service = LoadService(repo)
+    client = Client()
+
+    with override_settings(TRAFFIC_CAPTURE_PATH=str(capture)):
+        created = client.post(
+            "/api/loads/",
+            {
+                "client_name": "A",
+                "expected_qty": 5,
+                "format": "large",
+                "pallet_count": 1,
+                "token": "x",
+            },
+            content_type="application/json",
+        ).json()
+        client.patch(
+            f"/api/loads/{created['id']}/",
+            {"loaded_qty": 2},
+            content_type="application/json",
+        )
+        client.get("/api/loads/?limit=10")
+
+    traffic.flush()
+    entries = traffic.read_capture(str(capture))
+    assert [e["method"] for e in entries] == ["POST", "PATCH", "GET"]
+    assert entries[0]["created_id"] == created["id"]
+    assert entries[0]["body"]["token"] == "[redacted]"
+
+    fresh = JsonRepository(str(tmp_path / "replayed.json"))
+    views.repo = fresh
+    views.service = LoadService(fresh)
+    report = traffic.replay(entries, concurrency=2)
+
+    assert report["requests"] == 3
+    assert report["endpoints"]["PATCH load-detail"]["statuses"] == {200: 1}
+    (replayed,) = fresh.list_all()
+    assert replayed.id != created["id"]
+    assert replayed.loaded_qty == 2